@@ -0,0 +1,54 @@
+'''
+Benchmark of entering a table into db-fiddle's Text to DDL modal with one injected script, against typing it with send_keys, for tables of growing size.
+Each table is appended to a fresh db-fiddle tab, nothing is saved to db-fiddle.com.
+Needs chromedriver and a network connection.
+Run with: python benchmarks/bench_inject.py CHROMEDRIVER_PATH [ROWS ...]
+'''
+import os
+import sys
+import time
+
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sister_dir = os.path.join(parent_dir, 'leetcode_sql_unlocked/')
+sys.path.insert(0, sister_dir)
+from src.web_handler import WebHandler
+
+class LegacyWebHandler(WebHandler):
+    '''
+    Every table typed with send_keys, kept here as the baseline
+    '''
+    def inject_text(self, element, text):
+        return False
+
+    def inject_code_mirror(self, selector, text):
+        return False
+
+def get_table_text(n_rows):
+    lines = ['| id | name     | salary |', '|----|----------|--------|']
+    lines.extend('| {} | name_{} | {} |'.format(i, i, i * 100) for i in range(1, n_rows + 1))
+    return '\n'.join(lines)
+
+def time_table_input(web_handler_class, driver_path, table_text):
+    web_handler = web_handler_class(driver_path, headless=True)
+    try:
+        web_handler.open_db_win()
+        web_handler.db_fiddle_select_engine(0)
+        start = time.perf_counter()
+        web_handler.db_fiddle_table_input('t', table_text)
+        web_handler.db_fiddle_query_input('t')
+        return time.perf_counter() - start
+    finally:
+        web_handler.close_all()
+
+def main(driver_path, rows=(10, 100, 1000)):
+    print('{:<8}{:>14}{:>14}'.format('rows', 'typed ms', 'injected ms'))
+    for n_rows in rows:
+        table_text = get_table_text(n_rows)
+        typed = time_table_input(LegacyWebHandler, driver_path, table_text)
+        injected = time_table_input(WebHandler, driver_path, table_text)
+        print('{:<8}{:>14.0f}{:>14.0f}'.format(n_rows, typed * 1000, injected * 1000))
+
+if __name__ == '__main__':
+    if len(sys.argv) < 2:
+        sys.exit(__doc__)
+    main(sys.argv[1], [int(n) for n in sys.argv[2:]] or (10, 100, 1000))
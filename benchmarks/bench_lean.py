@@ -0,0 +1,68 @@
+'''
+Benchmark of the headless preload driver in lean mode against a full one: time to open a question, and the memory of the whole headless chrome process tree afterwards.
+Opens a saved fiddle with its leetcode.jp problem, through db-fiddle's editor being ready. A saved fiddle is used so no new fiddles are created on db-fiddle.com.
+Memory is the summed RSS of chromedriver's child processes read from /proc, so only reported on Linux.
+Needs chromedriver and a network connection.
+Run with: python benchmarks/bench_lean.py CHROMEDRIVER_PATH SAVED_FIDDLE_URL [Q_NUM] [RUNS]
+'''
+import os
+import sys
+import time
+import statistics
+
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sister_dir = os.path.join(parent_dir, 'leetcode_sql_unlocked/')
+sys.path.insert(0, sister_dir)
+from src.web_handler import WebHandler
+
+def get_tree_rss(root_pid):
+    '''
+    Bytes of RSS of every process under root_pid, or None without /proc
+    '''
+    if not os.path.isdir('/proc'):
+        return None
+    children = {}
+    for pid in os.listdir('/proc'):
+        if not pid.isdigit():
+            continue
+        try:
+            with open('/proc/{}/stat'.format(pid)) as f:
+                #the command name is in parentheses and can have spaces
+                ppid = int(f.read().rsplit(')', 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        children.setdefault(ppid, []).append(int(pid))
+    total = 0
+    pids = list(children.get(root_pid, []))
+    while pids:
+        pid = pids.pop()
+        pids.extend(children.get(pid, []))
+        try:
+            with open('/proc/{}/statm'.format(pid)) as f:
+                total += int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+        except (OSError, IndexError, ValueError):
+            pass
+    return total
+
+def run(driver_path, fiddle_url, q_num, is_lean):
+    #browserless parse off, so the leetcode.jp tab is loaded too
+    web_handler = WebHandler(driver_path, headless=True, is_browserless_parse=False, is_lean=is_lean)
+    try:
+        start = time.perf_counter()
+        web_handler.open_question(q_num, 0, False, fiddle_url)
+        elapsed = time.perf_counter() - start
+        return elapsed, get_tree_rss(web_handler.driver.wrapped_driver.service.process.pid)
+    finally:
+        web_handler.close_all()
+
+def main(driver_path, fiddle_url, q_num=176, runs=3):
+    print('{:<10}{:>14}{:>14}'.format('driver', 'median ms', 'rss MB'))
+    for name, is_lean in (('full', False), ('lean', True)):
+        results = [run(driver_path, fiddle_url, q_num, is_lean) for _ in range(runs)]
+        rss = [r[1] for r in results if r[1] is not None]
+        print('{:<10}{:>14.0f}{:>14}'.format(name, statistics.median(r[0] for r in results) * 1000, '{:.0f}'.format(statistics.median(rss) / 1024 / 1024) if rss else 'n/a'))
+
+if __name__ == '__main__':
+    if len(sys.argv) < 3:
+        sys.exit(__doc__)
+    main(sys.argv[1], sys.argv[2], int(sys.argv[3]) if len(sys.argv) > 3 else 176, int(sys.argv[4]) if len(sys.argv) > 4 else 3)
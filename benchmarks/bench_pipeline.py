@@ -0,0 +1,56 @@
+'''
+Benchmark of building a new fiddle with the leetcode.jp tables parsed while db-fiddle boots, against parsing them once db-fiddle is ready.
+Prints when each phase finished, in ms since the tabs started loading, for the median run of each.
+Each run saves a new fiddle on db-fiddle.com. Needs chromedriver and a network connection.
+Run with: python benchmarks/bench_pipeline.py CHROMEDRIVER_PATH [Q_NUM] [RUNS]
+'''
+import os
+import sys
+import time
+from collections import OrderedDict
+
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sister_dir = os.path.join(parent_dir, 'leetcode_sql_unlocked/')
+sys.path.insert(0, sister_dir)
+from src.web_handler import WebHandler
+
+class LegacyWebHandler(WebHandler):
+    '''
+    Every step waited on in turn, kept here as the baseline
+    '''
+    def create_fiddle(self, q_num, db_engine):
+        self.phase_times = OrderedDict()
+        start = time.perf_counter()
+        self.open_leetcode_win(q_num)
+        self.open_db_win()
+        self.phase_times['navigate'] = time.perf_counter() - start
+        self.db_fiddle_select_engine(db_engine)
+        self.phase_times['fiddle_ready'] = time.perf_counter() - start
+        table_names, tables_text = self.parse_leetcode_tables(q_num)
+        self.phase_times['parse'] = time.perf_counter() - start
+        for i, table_text in enumerate(tables_text):
+            self.db_fiddle_table_input(table_names[i], table_text)
+        self.db_fiddle_query_input(table_names[0])
+        self.phase_times['tables'] = time.perf_counter() - start
+        db_start_url = self.db_fiddle_save()
+        self.phase_times['save'] = time.perf_counter() - start
+        return db_start_url
+
+def run(web_handler_class, driver_path, q_num):
+    web_handler = web_handler_class(driver_path, headless=True, is_browserless_parse=True)
+    try:
+        web_handler.open_question(q_num, 0, False)
+        return web_handler.phase_times['save'], web_handler.get_phase_msg()
+    finally:
+        web_handler.close_all()
+
+def main(driver_path, q_num=176, runs=3):
+    for name, web_handler_class in (('sequential', LegacyWebHandler), ('parallel', WebHandler)):
+        results = sorted(run(web_handler_class, driver_path, q_num) for _ in range(runs))
+        total, phase_msg = results[len(results) // 2]
+        print('{:<12}{:>8.0f} ms    {}'.format(name, total * 1000, phase_msg))
+
+if __name__ == '__main__':
+    if len(sys.argv) < 2:
+        sys.exit(__doc__)
+    main(sys.argv[1], int(sys.argv[2]) if len(sys.argv) > 2 else 176, int(sys.argv[3]) if len(sys.argv) > 3 else 3)
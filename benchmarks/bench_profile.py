@@ -0,0 +1,44 @@
+'''
+Benchmark of open_question with a throwaway chrome profile against a persistent one whose cache was filled by an earlier session.
+Each run starts a new browser, like a new session, and opens a saved fiddle with its leetcode.jp problem, through db-fiddle's editor being ready. A saved fiddle is used so no new fiddles are created on db-fiddle.com.
+Needs chromedriver and a network connection.
+Run with: python benchmarks/bench_profile.py CHROMEDRIVER_PATH SAVED_FIDDLE_URL [Q_NUM] [RUNS]
+'''
+import os
+import sys
+import time
+import tempfile
+import statistics
+
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sister_dir = os.path.join(parent_dir, 'leetcode_sql_unlocked/')
+sys.path.insert(0, sister_dir)
+from src.web_handler import WebHandler
+from src.profiles import ChromeProfiles
+
+def time_open_question(driver_path, fiddle_url, q_num, profiles=None):
+    #browserless parse off, so the leetcode.jp tab is loaded too
+    web_handler = WebHandler(driver_path, headless=True, is_browserless_parse=False, profiles=profiles)
+    try:
+        start = time.perf_counter()
+        web_handler.open_question(q_num, 0, False, fiddle_url)
+        return time.perf_counter() - start
+    finally:
+        web_handler.close_all()
+
+def main(driver_path, fiddle_url, q_num=176, runs=3):
+    with tempfile.TemporaryDirectory() as profiles_dir:
+        profiles = ChromeProfiles(profiles_dir)
+        #the earlier session that fills the cache
+        time_open_question(driver_path, fiddle_url, q_num, profiles)
+        cold = [time_open_question(driver_path, fiddle_url, q_num) for _ in range(runs)]
+        warm = [time_open_question(driver_path, fiddle_url, q_num, profiles) for _ in range(runs)]
+        print('{:<10}{:>14}{:>14}'.format('profile', 'median ms', 'min ms'))
+        for name, times in (('cold', cold), ('warm', warm)):
+            print('{:<10}{:>14.0f}{:>14.0f}'.format(name, statistics.median(times) * 1000, min(times) * 1000))
+        print('profile size after {} warm runs: {:.1f} MB'.format(runs, profiles.cleanup() / 1024 / 1024))
+
+if __name__ == '__main__':
+    if len(sys.argv) < 3:
+        sys.exit(__doc__)
+    main(sys.argv[1], sys.argv[2], int(sys.argv[3]) if len(sys.argv) > 3 else 176, int(sys.argv[4]) if len(sys.argv) > 4 else 3)
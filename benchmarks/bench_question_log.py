@@ -0,0 +1,88 @@
+'''
+Benchmark of the sqlite backed QuestionLog against the pprint/literal_eval log files it replaced.
+Builds a question list and question state of N questions, then reports startup time (reading every log) and the cost of one question switch (update_q_state).
+The sqlite log coalesces updates, so the number of transactions it wrote for the whole burst of updates is reported too.
+Run with: python benchmarks/bench_question_log.py [QUESTIONS]
+'''
+import os
+import ast
+import sys
+import time
+import pprint
+import tempfile
+
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sister_dir = os.path.join(parent_dir, 'leetcode_sql_unlocked/')
+sys.path.insert(0, sister_dir)
+from src.log import QuestionLog
+
+class LegacyQuestionLog:
+    '''
+    The pprint file backed question log from before the sqlite database, kept here as the baseline
+    '''
+    def __init__(self, q_elements_path, q_state_path, q_public_urls_path):
+        self.q_state_path = q_state_path
+        self.q_elements = self.read_dict(q_elements_path)
+        self.q_state = self.read_dict(q_state_path)
+        self.q_public_urls = self.read_dict(q_public_urls_path)
+
+    def read_dict(self, path):
+        with open(path, "r") as f:
+            return ast.literal_eval(f.read())
+
+    def write_dict(self, path, dict):
+        with open(path, 'w') as f:
+            pprint.pprint(dict, f)
+
+    def update_q_state(self, q_num, url):
+        self.q_state['current'] = q_num
+        self.q_state['url'][q_num] = url
+        self.write_dict(self.q_state_path, self.q_state)
+
+def write_logs(tmp_dir, n_questions):
+    levels = ('easy', 'medium', 'hard')
+    paths = [os.path.join(tmp_dir, name) for name in ('q_elements.log', 'q_state.log', 'q_public_urls.log')]
+    q_elements = {q_num: {'level': levels[q_num % 3], 'name': '{}: Question Number {}, {}'.format(q_num, q_num, levels[q_num % 3])} for q_num in range(n_questions)}
+    q_state = {'current': 0, 'url': {q_num: 'https://www.db-fiddle.com/f/{:0>22}/3'.format(q_num) for q_num in range(0, n_questions, 2)}}
+    q_public_urls = {q_num: 'https://www.db-fiddle.com/f/{:0>22}/0'.format(q_num) for q_num in range(n_questions)}
+    for path, log in zip(paths, (q_elements, q_state, q_public_urls)):
+        with open(path, 'w') as f:
+            pprint.pprint(log, f)
+    return paths
+
+def time_it(func, repeat):
+    start = time.perf_counter()
+    for i in range(repeat):
+        func(i)
+    return (time.perf_counter() - start) / repeat
+
+def main(n_questions=2000, repeat=20):
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        paths = write_logs(tmp_dir, n_questions)
+        #the one time migration
+        start = time.perf_counter()
+        QuestionLog(*paths).close()
+        migration_time = time.perf_counter() - start
+
+        legacy_startup = time_it(lambda i: LegacyQuestionLog(*paths), repeat)
+        def sqlite_open(i):
+            QuestionLog(*paths).close()
+        sqlite_startup = time_it(sqlite_open, repeat)
+
+        legacy_log = LegacyQuestionLog(*paths)
+        sqlite_log = QuestionLog(*paths)
+        url = 'https://www.db-fiddle.com/f/updated/1'
+        legacy_update = time_it(lambda i: legacy_log.update_q_state(i, url), repeat * 5)
+        sqlite_update = time_it(lambda i: sqlite_log.update_q_state(i, url), repeat * 5)
+        start = time.perf_counter()
+        sqlite_log.close()
+        close_time = time.perf_counter() - start
+
+    print('{} questions, one time migration {:.2f} ms'.format(n_questions, migration_time * 1000))
+    print('{:<24}{:>14}{:>14}'.format('', 'legacy ms', 'sqlite ms'))
+    print('{:<24}{:>14.2f}{:>14.2f}'.format('startup', legacy_startup * 1000, sqlite_startup * 1000))
+    print('{:<24}{:>14.2f}{:>14.2f}'.format('update_q_state', legacy_update * 1000, sqlite_update * 1000))
+    print('{} updates: legacy wrote the file {} times, sqlite wrote {} transaction(s), flushed in {:.2f} ms on close'.format(repeat * 5, repeat * 5, sqlite_log.flush_count, close_time * 1000))
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
@@ -0,0 +1,123 @@
+'''
+Benchmark of the indexed QuestionNodes against the linked list it replaced, on a synthetic catalog.
+Checks both return the same nodes for next, next by level, and the next n by level from every question, then reports the time of each.
+Run with: python benchmarks/bench_questions.py [QUESTIONS]
+'''
+import os
+import sys
+import time
+import random
+
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sister_dir = os.path.join(parent_dir, 'leetcode_sql_unlocked/')
+sys.path.insert(0, sister_dir)
+from src.questions import QuestionNodes
+
+LEVELS = ('easy', 'medium', 'hard')
+
+class LegacyQuestionNode:
+    def __init__(self, number, name, level, next=None, next_same_lvl=None):
+        self.number = number
+        self.name = name
+        self.level = level
+        self.next = next
+        self.next_same_lvl = next_same_lvl
+
+class LegacyQuestionNodes:
+    '''
+    The linked list QuestionNodes from before the per level indices, kept here as the baseline
+    '''
+    def __init__(self, question_elements, curr_log_num):
+        self.question_nodes = {}
+        self.head = None
+        prev_q = None
+        prev_by_level = {}
+        head_by_level = {}
+        for q_num in question_elements.keys():
+            q = LegacyQuestionNode(q_num, question_elements[q_num]['name'], question_elements[q_num]['level'])
+            self.question_nodes[q_num] = q
+            if not self.head:
+                self.head = q
+            if prev_q:
+                prev_q.next = q
+            prev_q = q
+            if q.level in prev_by_level:
+                prev_by_level[q.level].next_same_lvl = q
+            else:
+                head_by_level[q.level] = q
+            prev_by_level[q.level] = q
+        q.next = self.head
+        for level, q in prev_by_level.items():
+            q.next_same_lvl = head_by_level[level]
+        self.current = self.question_nodes[curr_log_num]
+
+    def get_next_node(self, node, level=None):
+        if level is None:
+            return node.next
+        elif node.level == level:
+            return node.next_same_lvl
+        else:
+            curr = node.next
+            while curr.level != level:
+                curr = curr.next
+            return curr
+
+    def select_question_by_number(self, number):
+        self.current = self.question_nodes[number]
+
+    def get_current(self):
+        return self.current
+
+    def get_next_n_nodes(self, n, level=None):
+        nodes = []
+        curr = self.current
+        head = None
+        for i in range(n):
+            curr = self.get_next_node(curr, level)
+            if head is not None and head.number == curr.number:
+                break
+            nodes.append(curr)
+            if i == 0:
+                head = curr
+        return nodes
+
+def get_catalog(n_questions):
+    random.seed(n_questions)
+    #hard questions are rare, so next hard has the longest walk
+    levels = random.choices(LEVELS, weights=(45, 45, 10), k=n_questions)
+    return {q_num: {'level': level, 'name': '{}: Question {}, {}'.format(q_num, q_num, level)} for q_num, level in enumerate(levels, 1)}
+
+def run_all(question_nodes, q_nums, func):
+    start = time.perf_counter()
+    results = []
+    for q_num in q_nums:
+        question_nodes.select_question_by_number(q_num)
+        results.append(func(question_nodes))
+    return time.perf_counter() - start, results
+
+def main(n_questions=10000, n_next=50):
+    q_elements = get_catalog(n_questions)
+    q_nums = list(q_elements.keys())
+    start = time.perf_counter()
+    legacy = LegacyQuestionNodes(q_elements, 1)
+    legacy_build = time.perf_counter() - start
+    start = time.perf_counter()
+    indexed = QuestionNodes(q_elements, 1)
+    indexed_build = time.perf_counter() - start
+
+    cases = [('next', lambda nodes: nodes.get_next_node(nodes.get_current()).number)]
+    for level in LEVELS:
+        cases.append(('next ' + level, lambda nodes, level=level: nodes.get_next_node(nodes.get_current(), level).number))
+        cases.append(('next {} {}'.format(n_next, level), lambda nodes, level=level: [q.number for q in nodes.get_next_n_nodes(n_next, level)]))
+
+    print('{} questions, {} easy, {} medium, {} hard'.format(n_questions, *[sum(e['level'] == level for e in q_elements.values()) for level in LEVELS]))
+    print('{:<24}{:>14}{:>14}'.format('from every question', 'legacy ms', 'indexed ms'))
+    print('{:<24}{:>14.2f}{:>14.2f}'.format('build', legacy_build * 1000, indexed_build * 1000))
+    for name, func in cases:
+        legacy_time, legacy_results = run_all(legacy, q_nums, func)
+        indexed_time, indexed_results = run_all(indexed, q_nums, func)
+        assert legacy_results == indexed_results, name
+        print('{:<24}{:>14.2f}{:>14.2f}'.format(name, legacy_time * 1000, indexed_time * 1000))
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10000)
@@ -0,0 +1,65 @@
+'''
+Benchmark of time to first prompt, from a fresh python process to the prompt's question name, with a saved question list so no network is needed.
+The browser is started lazily, so selenium should not even be imported by then. With a chromedriver path, the eager start up it replaced, waiting on chrome before the prompt, is timed too.
+Needs src/config.py, created by setup.py.
+Run with: python benchmarks/bench_startup.py [RUNS] [CHROMEDRIVER_PATH]
+'''
+import os
+import sys
+import json
+import time
+import tempfile
+import statistics
+import subprocess
+
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sister_dir = os.path.join(parent_dir, 'leetcode_sql_unlocked/')
+sys.path.insert(0, sister_dir)
+
+LEVELS = ('easy', 'medium', 'hard')
+
+def create_logs(log_dir, n_questions=300):
+    from src.log import QuestionLog
+    q_public_urls_path = os.path.join(log_dir, 'q_public_urls.log')
+    with open(q_public_urls_path, 'w') as f:
+        f.write('{}')
+    question_log = QuestionLog(os.path.join(log_dir, 'q_elements.log'), os.path.join(log_dir, 'q_state.log'), q_public_urls_path)
+    question_log.merge_q_elements({q_num: {'level': LEVELS[q_num % 3], 'name': '{}: Question {}, {}'.format(q_num, q_num, LEVELS[q_num % 3])} for q_num in range(175, 175 + n_questions)})
+    question_log.close()
+
+def child(log_dir, driver_path, is_eager):
+    '''
+    Run in its own process, so every import is cold
+    '''
+    start = time.perf_counter()
+    from src.leetcode import Leetcode
+    imported = time.perf_counter()
+    lc = Leetcode(driver_path, os.path.join(log_dir, 'q_elements.log'), os.path.join(log_dir, 'q_state.log'), os.path.join(log_dir, 'q_public_urls.log'), headless=True)
+    if is_eager:
+        lc.web_handler
+    lc.get_current_q().name
+    prompt = time.perf_counter()
+    is_selenium_imported = 'selenium' in sys.modules
+    lc.exit_option()
+    print(json.dumps({'import': imported - start, 'prompt': prompt - start, 'selenium': is_selenium_imported}))
+
+def run(log_dir, driver_path, is_eager):
+    out = subprocess.run([sys.executable, os.path.abspath(__file__), '--child', log_dir, driver_path, str(int(is_eager))], stdout=subprocess.PIPE, check=True, universal_newlines=True).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+def main(runs=5, driver_path=None):
+    with tempfile.TemporaryDirectory() as log_dir:
+        create_logs(log_dir)
+        cases = [('lazy', False)]
+        if driver_path is not None:
+            cases.append(('eager', True))
+        print('{:<10}{:>14}{:>14}{:>12}'.format('median', 'import ms', 'prompt ms', 'selenium'))
+        for name, is_eager in cases:
+            results = [run(log_dir, driver_path or 'chromedriver', is_eager) for _ in range(runs)]
+            print('{:<10}{:>14.1f}{:>14.1f}{:>12}'.format(name, statistics.median(r['import'] for r in results) * 1000, statistics.median(r['prompt'] for r in results) * 1000, str(any(r['selenium'] for r in results))))
+
+if __name__ == '__main__':
+    if len(sys.argv) > 1 and sys.argv[1] == '--child':
+        child(sys.argv[2], sys.argv[3], sys.argv[4] == '1')
+    else:
+        main(int(sys.argv[1]) if len(sys.argv) > 1 else 5, sys.argv[2] if len(sys.argv) > 2 else None)
@@ -0,0 +1,224 @@
+'''
+Micro-benchmark of TableParser.iter_tables() against the seperate_tables1/2/3 implementation it replaced.
+Builds large sample tables in each border style, checks both implementations produce identical tables, then reports parse time and peak allocations.
+Run with: python benchmarks/bench_table_parser.py [ROWS]
+'''
+import os
+import re
+import sys
+import time
+import random
+import itertools
+import tracemalloc
+
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sister_dir = os.path.join(parent_dir, 'leetcode_sql_unlocked/')
+sys.path.insert(0, sister_dir)
+from src.table_parser import TableParser
+
+class LegacyTableParser:
+    '''
+    The table seperation from before iter_tables(), kept here as the baseline
+    '''
+    def parse_table_lines(self, tables_pre):
+        table_lines = []
+        for table_pre in tables_pre:
+            matches = re.findall(r'\+--*.*[\+\|]|\|.*\|', table_pre)
+            if len(matches) > 0:
+                table_lines.append(matches)
+        return table_lines
+
+    def get_table_type(self, table_lines):
+        cond1 = '+-' in table_lines[0][0]
+        table_lines_combined = list(itertools.chain.from_iterable(table_lines))
+        count = len([line for line in table_lines_combined if '+-' in line])
+        cond2 = count % 3 == 0
+        if cond1 and cond2:
+            return 'Table1'
+        elif not cond1:
+            return 'Table2'
+        elif cond1:
+            return 'Table3'
+
+    def add_filler_col1(self, index, line, is_final=False):
+        if index == 0:
+            concat = '---------+'
+        elif index == 1:
+            concat = ' ignore  |'
+        elif index == 2:
+            concat = '---------+'
+        elif is_final:
+            concat = '---------+'
+        else:
+            concat = '  _      |'
+        return line + concat
+
+    def add_filler_col2(self, index, line):
+        if index == 0:
+            concat = ' ignore|'
+        elif index == 1:
+            concat = '-------|'
+        else:
+            concat = '   _   |'
+        return line + concat
+
+    def add_filler_col3(self, index, line):
+        if index == 0:
+            concat = '---------+'
+        elif index == 1:
+            concat = ' ignore  |'
+        elif index == 2:
+            concat = '---------+'
+        else:
+            concat = '  _      |'
+        return line + concat
+
+    def update_date_format(self, line):
+        pattern = re.compile(r'(\d{1,2})/(\d{1,2})/(\d{4})')
+        return re.sub(pattern, r'\g<3>-\g<1>-\g<2>', line)
+
+    def replace_invalid_char_header(self, line):
+        pattern = re.compile(r'[^\w\s\|\+\-]+')
+        def repl(m):
+            return '_' * len(m.group())
+        return re.sub(pattern, repl, line)
+
+    def seperate_tables1(self, table_lines):
+        tables_text, current_table = [], []
+        plus_ct = line_i = 0
+        is_single_col = False
+        for table_line in table_lines:
+            for line in table_line:
+                if line_i == 0:
+                    if line.count('+') == 2:
+                        is_single_col = True
+                if line_i == 1:
+                    line = self.replace_invalid_char_header(line)
+                if '+-' in line:
+                    plus_ct += 1
+                if line.count('/') >= 2:
+                    line = self.update_date_format(line)
+                if is_single_col:
+                    line = self.add_filler_col1(line_i, line, plus_ct == 3)
+                current_table.append(line)
+                line_i += 1
+                if plus_ct == 3:
+                    tables_text.append('\n'.join(current_table))
+                    current_table = []
+                    is_single_col = False
+                    plus_ct = line_i = 0
+        return tables_text
+
+    def seperate_tables2(self, table_lines):
+        tables_text, current_table = [], []
+        for table_line in table_lines:
+            is_single_col = False
+            if table_line[0].count('|') == 2:
+                is_single_col = True
+            for line_i, line in enumerate(table_line):
+                if line_i == 0:
+                    line = self.replace_invalid_char_header(line)
+                if is_single_col:
+                    line = self.add_filler_col2(line_i, line)
+                if line.count('/') >= 2:
+                    line = self.update_date_format(line)
+                current_table.append(line)
+            tables_text.append('\n'.join(current_table))
+            current_table = []
+        return tables_text
+
+    def seperate_tables3(self, table_lines):
+        tables_text, current_table = [], []
+        for table_line in table_lines:
+            is_single_col = False
+            if table_line[0].count('+') == 2:
+                is_single_col = True
+            for line_i, line in enumerate(table_line):
+                if line_i == 0:
+                    line = self.replace_invalid_char_header(line)
+                if is_single_col:
+                    line = self.add_filler_col3(line_i, line)
+                if line.count('/') >= 2:
+                    line = self.update_date_format(line)
+                current_table.append(line)
+            tables_text.append('\n'.join(current_table))
+            current_table = []
+        return tables_text
+
+    def seperate(self, tables_pre):
+        table_lines = self.parse_table_lines(tables_pre)
+        table_type = self.get_table_type(table_lines)
+        if table_type == 'Table1':
+            return self.seperate_tables1(table_lines)
+        elif table_type == 'Table2':
+            return self.seperate_tables2(table_lines)
+        return self.seperate_tables3(table_lines)
+
+def make_rows(n_rows, n_cols, rand):
+    rows = []
+    for _ in range(n_rows):
+        row = []
+        for col in range(n_cols):
+            if col % 3 == 2:
+                row.append('{}/{}/20{}'.format(rand.randint(1, 12), rand.randint(1, 28), rand.randint(10, 20)))
+            elif col % 3 == 1:
+                row.append(rand.choice(['Joe', 'Henry', 'Sam', 'Max', 'null']))
+            else:
+                row.append(str(rand.randint(0, 99999)))
+        rows.append(row)
+    return rows
+
+def plus_table(name, n_rows, n_cols, rand, is_bottom=True):
+    #the legacy Table3 parser never cleaned the header, fine for #619's plain 'num' header
+    header = ['col_{}'.format(i) if i or not is_bottom else 'id (pk)' for i in range(n_cols)]
+    rows = make_rows(n_rows, n_cols, rand)
+    widths = [max(len(header[i]), max((len(r[i]) for r in rows), default=0)) for i in range(n_cols)]
+    border = '+' + '+'.join('-' * (w + 2) for w in widths) + '+'
+    fmt = lambda cells: '| ' + ' | '.join(c.ljust(w) for c, w in zip(cells, widths)) + ' |'
+    lines = ['{} table:'.format(name), border, fmt(header), border] + [fmt(r) for r in rows]
+    if is_bottom:
+        lines.append(border)
+    return '\n'.join(lines)
+
+def pipe_table(n_rows, n_cols, rand):
+    header = ['col_{}'.format(i) if i else 'id (pk)' for i in range(n_cols)]
+    rows = make_rows(n_rows, n_cols, rand)
+    fmt = lambda cells: '| ' + ' | '.join(cells) + ' |'
+    sep = '|' + '|'.join('-' * 8 for _ in range(n_cols)) + '|'
+    return '\n'.join([fmt(header), sep] + [fmt(r) for r in rows])
+
+def sample_pages(n_rows):
+    rand = random.Random(0)
+    return {
+        #newer questions, several +--- tables in one <pre>
+        'plus': ['\n\n'.join(plus_table('T{}'.format(i), n_rows, 1 + i % 5, rand) for i in range(4)) + '\nsome explanation'],
+        #older questions, one |--- table per <pre>
+        'pipe': [pipe_table(n_rows, 1 + i % 5, rand) for i in range(4)],
+        #like #619, +--- tables missing their bottom border
+        'plus_no_bottom': [plus_table('T{}'.format(i), n_rows, 1 + i % 2, rand, is_bottom=False) for i in range(2)],
+    }
+
+def bench(func, tables_pre, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(tables_pre)
+        best = min(best, time.perf_counter() - start)
+    tracemalloc.start()
+    func(tables_pre)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return best, peak
+
+def main(n_rows=5000, repeat=5):
+    legacy = LegacyTableParser()
+    print('{:<16}{:>14}{:>14}{:>16}{:>16}'.format('sample', 'legacy ms', 'new ms', 'legacy peak KB', 'new peak KB'))
+    for name, tables_pre in sample_pages(n_rows).items():
+        new = lambda pres: list(TableParser(None).iter_tables(pres))
+        assert legacy.seperate(tables_pre) == new(tables_pre), 'iter_tables output differs for ' + name
+        legacy_time, legacy_peak = bench(legacy.seperate, tables_pre, repeat)
+        new_time, new_peak = bench(new, tables_pre, repeat)
+        print('{:<16}{:>14.2f}{:>14.2f}{:>16.0f}{:>16.0f}'.format(name, legacy_time * 1000, new_time * 1000, legacy_peak / 1024, new_peak / 1024))
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5000)
@@ -0,0 +1,59 @@
+'''
+Benchmark of question switches with the long-lived problem and fiddle tabs navigated in place, against opening new windows for every question and closing them after.
+Reports WebDriver commands and time per switch, from close_question() through open_question() of the next question. Saved fiddles are opened so no new fiddles are created on db-fiddle.com.
+Needs chromedriver and a network connection.
+Run with: python benchmarks/bench_tabs.py CHROMEDRIVER_PATH SAVED_FIDDLE_URL [SWITCHES]
+'''
+import os
+import sys
+import time
+import statistics
+
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sister_dir = os.path.join(parent_dir, 'leetcode_sql_unlocked/')
+sys.path.insert(0, sister_dir)
+from src.web_handler import WebHandler
+
+Q_NUMS = (176, 177, 178, 180, 181, 182, 183, 184, 185, 196)
+
+class LegacyWebHandler(WebHandler):
+    '''
+    A new window per page, closed once the user moves on, kept here as the baseline
+    '''
+    def open_tab(self, role, url):
+        return self.open_new_win(url)
+
+    def close_question_windows(self):
+        for window in (self.leet_win, self.db_win, self.solution_win):
+            if window is not None:
+                self.close_window(window)
+        self.leet_win = self.db_win = self.solution_win = None
+
+def run(web_handler_class, driver_path, fiddle_url, n_switches):
+    #browserless parse off, so the leetcode.jp tab is loaded too
+    web_handler = web_handler_class(driver_path, headless=True, is_browserless_parse=False)
+    commands, times = [], []
+    try:
+        web_handler.open_question(Q_NUMS[0], 0, False, fiddle_url)
+        for i in range(1, n_switches + 1):
+            commands_start = web_handler.get_command_count()
+            start = time.perf_counter()
+            web_handler.close_question(is_save_before_closing=False)
+            web_handler.open_question(Q_NUMS[i % len(Q_NUMS)], 0, False, fiddle_url)
+            times.append(time.perf_counter() - start)
+            commands.append(web_handler.get_command_count() - commands_start)
+        n_windows = len(web_handler.driver.window_handles)
+    finally:
+        web_handler.close_all()
+    return commands, times, n_windows
+
+def main(driver_path, fiddle_url, n_switches=5):
+    print('{:<10}{:>14}{:>14}{:>10}'.format('tabs', 'commands', 'median ms', 'windows'))
+    for name, web_handler_class in (('legacy', LegacyWebHandler), ('reused', WebHandler)):
+        commands, times, n_windows = run(web_handler_class, driver_path, fiddle_url, n_switches)
+        print('{:<10}{:>14.1f}{:>14.0f}{:>10}'.format(name, statistics.mean(commands), statistics.median(times) * 1000, n_windows))
+
+if __name__ == '__main__':
+    if len(sys.argv) < 3:
+        sys.exit(__doc__)
+    main(sys.argv[1], sys.argv[2], int(sys.argv[3]) if len(sys.argv) > 3 else 5)
@@ -0,0 +1,22 @@
+'''
+Thin client for daemon mode. Sends one command to a daemon started with `leetcode_sql_unlocked.py --daemon`, prints what it printed, and exits.
+Only the standard library is imported, so each command costs milliseconds.
+Usage: python client.py n e
+'''
+import os
+import sys
+
+from src.daemon import send_command, get_socket_path
+
+LOG_DIR = os.path.join(os.path.dirname(os.path.realpath(__file__)), 'logs')
+
+def main():
+    try:
+        output = send_command(get_socket_path(LOG_DIR), ' '.join(sys.argv[1:]))
+    except OSError:
+        print('No daemon running, start one with: python leetcode_sql_unlocked.py --daemon')
+        sys.exit(1)
+    print(output)
+
+if __name__ == '__main__':
+    main()
@@ -2,14 +2,15 @@
 The main module that instantiates and controls the behavior and interaction of all objects, most notably objects from WebHandler, QuestionNodes, and QuestionLog.
 '''
 import os
+import sys
+import argparse
 from shutil import copyfile
 import logging
 import traceback
 from datetime import datetime
 
-from selenium.common.exceptions import NoSuchWindowException, NoSuchElementException, WebDriverException
-
 from src.leetcode import Leetcode
+from src.daemon import LeetcodeDaemon, get_socket_path
 
 DRIVER_DIR = 'drivers'
 DRIVER = 'chromedriver'
@@ -19,6 +20,12 @@ ERROR_LOG = 'error.log'
 Q_ELEMENTS_LOG = 'q_elements.log'
 Q_STATE_LOG = 'q_state.log'
 Q_PUBLIC_URLS_LOG = 'q_public_urls.log'
+PAGE_CACHE_DIR = 'page_cache'
+Q_PARSE_LOG = 'q_parse.log'
+SANDBOX_DIR = 'sandbox'
+NAV_HISTORY_LOG = 'nav_history.log'
+Q_DB = 'questions.db'
+PROFILES_DIR = 'profiles'
 
 def setup_dirs():
     try:
@@ -43,27 +50,59 @@ def get_leetcode(headless=False):
     q_public_urls_path = os.path.join(LOG_DIR, Q_PUBLIC_URLS_LOG)
     if not os.path.exists(q_public_urls_path):
         copy_public_urls(q_public_urls_path)
-    lc = Leetcode(driver_path, q_elements_path, q_state_path, q_public_urls_path, headless=headless)
+    page_cache_dir = os.path.join(LOG_DIR, PAGE_CACHE_DIR)
+    q_parse_path = os.path.join(LOG_DIR, Q_PARSE_LOG)
+    sandbox_dir = os.path.join(LOG_DIR, SANDBOX_DIR)
+    nav_history_path = os.path.join(LOG_DIR, NAV_HISTORY_LOG)
+    q_db_path = os.path.join(LOG_DIR, Q_DB)
+    profiles_dir = os.path.join(LOG_DIR, PROFILES_DIR)
+    lc = Leetcode(driver_path, q_elements_path, q_state_path, q_public_urls_path, headless=headless, page_cache_dir=page_cache_dir, q_parse_path=q_parse_path, sandbox_dir=sandbox_dir, nav_history_path=nav_history_path, q_db_path=q_db_path, profiles_dir=profiles_dir)
     return lc
 
+def get_exit_msg():
+    '''
+    Selenium is only imported once something has gone wrong, so it doesn't slow down start up
+    '''
+    from selenium.common.exceptions import NoSuchWindowException, NoSuchElementException, WebDriverException
+    exc = sys.exc_info()[1]
+    if isinstance(exc, (NoSuchWindowException, WebDriverException)):
+        return 'Lost connection with browser, exiting now'
+    elif isinstance(exc, NoSuchElementException):
+        return 'Web element not found, exiting now'
+    return 'Uncaught exc, check logs/error.log, exiting now'
+
+def parse_args():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--daemon', action='store_true', help='Keep running in the background and take commands from client.py over a unix socket, instead of from the prompt')
+    return parser.parse_args()
+
 def main():
+    args = parse_args()
+    if args.daemon:
+        setup_dirs()
+        daemon = LeetcodeDaemon(get_socket_path(LOG_DIR))
+        #before starting a browser that would go unused
+        try:
+            daemon.bind()
+        except FileExistsError as e:
+            print(e)
+            return
     lc = get_leetcode()
     logging.basicConfig(level=logging.ERROR, format='%(message)s', filename=os.path.join(LOG_DIR, ERROR_LOG))
     is_continue, tb = True, None
     try:
-        lc.start_new_question(q_num=lc.get_current_q_num())
-        while is_continue:
-            is_continue = lc.options(lc.get_user_input())
+        #opens the current question in the background, the prompt shows right away
+        lc.start()
+        if args.daemon:
+            print('Daemon listening on {}, send commands with client.py'.format(os.path.abspath(daemon.socket_path)))
+            daemon.serve_forever(lc)
+        else:
+            while is_continue:
+                is_continue = lc.options(lc.get_user_input())
 
-    except (NoSuchWindowException, WebDriverException):
-        tb = traceback.format_exc()
-        msg =  'Lost connection with browser, exiting now'
-    except NoSuchElementException:
-        tb = traceback.format_exc()
-        msg = 'Web element not found, exiting now'
     except:
         tb = traceback.format_exc()
-        msg =  'Uncaught exc, check logs/error.log, exiting now'
+        msg = get_exit_msg()
     finally:
         if tb:
             now = datetime.now().strftime("\n%Y-%m-%d %H:%M:%S ")
@@ -0,0 +1,127 @@
+'''
+Daemon mode: one long running process keeps the Leetcode object warm, along with its browsers and question list. It takes the same commands as Leetcode.options() over a local unix socket.
+The client side only needs the standard library, so sending a command costs milliseconds instead of a browser start.
+'''
+import io
+import os
+import socket
+import traceback
+from contextlib import redirect_stdout
+
+SOCKET_NAME = 'daemon.sock'
+#commands that read from the terminal can't be run for a client
+INTERACTIVE_COMMANDS = ('c', 'console')
+BUFFER_SIZE = 65536
+
+def get_socket_path(log_dir):
+    return os.path.join(log_dir, SOCKET_NAME)
+
+def read_all(conn):
+    chunks = []
+    while True:
+        chunk = conn.recv(BUFFER_SIZE)
+        if not chunk:
+            break
+        chunks.append(chunk)
+    return b''.join(chunks).decode('utf-8', errors='replace')
+
+def send_command(socket_path, command, timeout=None):
+    '''
+    Sends one command to the daemon and returns what it printed
+    Raises OSError, i.e. FileNotFoundError or ConnectionRefusedError, if no daemon is listening on socket_path
+    '''
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as conn:
+        conn.settimeout(timeout)
+        conn.connect(socket_path)
+        conn.sendall(command.encode('utf-8'))
+        conn.shutdown(socket.SHUT_WR)
+        return read_all(conn)
+
+def is_daemon_running(socket_path):
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as conn:
+        try:
+            conn.connect(socket_path)
+        except OSError:
+            return False
+    return True
+
+class LeetcodeDaemon:
+    '''
+    Serves one client at a time, so commands run in order on the main thread just like at the prompt, and Leetcode is never used by two threads at once.
+    A client sends one command and closes its end, the daemon replies with everything the command printed, followed by the current question, then closes the connection.
+    '''
+    #a client that connects but never finishes sending its command can't hold up the daemon
+    READ_TIMEOUT = 5
+
+    def __init__(self, socket_path):
+        self.socket_path = socket_path
+        self.server = None
+        self.lc = None
+
+    def bind(self):
+        '''
+        Raises FileExistsError if another daemon is already listening on socket_path. A socket file left behind by a daemon that didn't shut down cleanly is replaced
+        '''
+        if os.path.exists(self.socket_path):
+            if is_daemon_running(self.socket_path):
+                raise FileExistsError('A daemon is already running on {}'.format(self.socket_path))
+            os.remove(self.socket_path)
+        self.server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.server.bind(self.socket_path)
+        #only the user who started the daemon can send it commands
+        os.chmod(self.socket_path, 0o600)
+        self.server.listen()
+
+    def handle(self, command):
+        '''
+        Runs one command, returns what it printed and whether the daemon should keep running
+        '''
+        out = io.StringIO()
+        is_continue = True
+        with redirect_stdout(out):
+            try:
+                if self.lc.clean_user_input(command) in INTERACTIVE_COMMANDS:
+                    print('\nThe console needs a terminal, run it from the prompt instead of the daemon\n')
+                else:
+                    is_continue = self.lc.options(command)
+                if is_continue:
+                    print('\nYou are on {name}'.format(name=self.lc.get_current_q().name))
+            #one failed command should not take down the daemon
+            except Exception:
+                traceback.print_exc(file=out)
+        return out.getvalue(), is_continue
+
+    def serve_forever(self, lc):
+        '''
+        Runs lc's commands until a client sends exit
+        '''
+        self.lc = lc
+        #nobody is reading along, so there's no need to pause after printing
+        self.lc.is_pause = False
+        if self.server is None:
+            self.bind()
+        is_continue = True
+        try:
+            while is_continue:
+                conn, _ = self.server.accept()
+                with conn:
+                    conn.settimeout(self.READ_TIMEOUT)
+                    try:
+                        command = read_all(conn)
+                    except OSError:
+                        continue
+                    output, is_continue = self.handle(command)
+                    try:
+                        conn.sendall(output.encode('utf-8'))
+                    #the client went away, the command still ran
+                    except OSError:
+                        pass
+        finally:
+            self.close()
+
+    def close(self):
+        if self.server is not None:
+            self.server.close()
+            self.server = None
+            if os.path.exists(self.socket_path):
+                os.remove(self.socket_path)
@@ -18,9 +18,28 @@ class EventListener(AbstractEventListener):
         """
         driver.execute_script(animation)
 
+class CountingChrome(webdriver.Chrome):
+    '''
+    Chrome webdriver that counts every command sent to chromedriver.
+    Each command (find element, get text, execute script, etc.) is one http round trip, so the count is a direct measure of WebDriver overhead
+    '''
+    def __init__(self, *args, **kwargs):
+        self.command_count = 0
+        super().__init__(*args, **kwargs)
+
+    def execute(self, driver_command, params=None):
+        self.command_count += 1
+        return super().execute(driver_command, params)
+
 class Driver:
     #agent src: https://www.whatismybrowser.com/guides/the-latest-user-agent/edge
     __WEB_USER_AGENT            = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/85.0.4183.83 Safari/537.36 Edg/85.0.564.41"
+    #lean mode, for headless drivers that only need the DOM text and the fiddle editor
+    #third party hosts, resolved to nowhere for the whole browser
+    LEAN_BLOCKED_HOSTS          = ('*.google-analytics.com', '*.googletagmanager.com', '*.doubleclick.net', '*.googlesyndication.com', '*.googleadservices.com', 'adservice.google.com', '*.facebook.net', '*.hotjar.com', '*.carbonads.com', '*.carbonads.net', '*.buysellads.com', '*.quantserve.com', '*.scorecardresearch.com', '*.cnzz.com', '*.baidu.com')
+    #resource types no page is read for, blocked in each tab through the DevTools protocol. Stylesheets are kept, WebDriverWait needs elements to be visible
+    LEAN_BLOCKED_URLS           = ['*.png', '*.jpg', '*.jpeg', '*.gif', '*.webp', '*.svg', '*.ico', '*.woff', '*.woff2', '*.ttf', '*.otf', '*.eot', '*.mp4', '*.webm', '*.mp3']
+    LEAN_ARGUMENTS              = ('--blink-settings=imagesEnabled=false', '--disable-background-networking', '--disable-component-update', '--disable-default-apps', '--disable-sync', '--disable-translate', '--disable-notifications', '--mute-audio', '--no-first-run', '--disable-features=TranslateUI,MediaRouter,OptimizationHints,AutofillServerCommunication')
 
     def __download_driver(driver_path, system, driver_dl_index=0):
         # determine latest chromedriver version
@@ -67,7 +86,19 @@ class Driver:
         os.rmdir(extracted_dir)
         os.chmod(driver_path, 0o755)
 
-    def get_driver(path, headless=False):
+    def block_requests(driver):
+        '''
+        Lean mode request blocking for the driver's current tab, DevTools settings only last for the tab they're sent to
+        '''
+        driver = getattr(driver, 'wrapped_driver', driver)
+        driver.execute_cdp_cmd('Network.enable', {})
+        driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': Driver.LEAN_BLOCKED_URLS})
+
+    def get_driver(path, headless=False, user_data_dir=None, disk_cache_bytes=None, is_lean=False):
+        '''
+        user_data_dir: a persistent chrome profile to use instead of a throwaway one, see ChromeProfiles
+        is_lean: leave out images, fonts, ads and analytics, and the chrome features nothing here uses. Each tab also needs block_requests()
+        '''
         system = platform.system()
         if system == "Windows":
             if not path.endswith(".exe"):
@@ -85,11 +116,19 @@ class Driver:
         if headless:
             #for this program, headless should only be used for testing or to set-up all the db-fiddles before hand
             options.add_argument("--headless")
+        if is_lean:
+            for argument in Driver.LEAN_ARGUMENTS:
+                options.add_argument(argument)
+            options.add_argument('--host-resolver-rules=' + ', '.join('MAP {} 0.0.0.0'.format(host) for host in Driver.LEAN_BLOCKED_HOSTS))
+        if user_data_dir is not None:
+            options.add_argument("--user-data-dir=" + user_data_dir)
+            if disk_cache_bytes is not None:
+                options.add_argument("--disk-cache-size={}".format(disk_cache_bytes))
 
         driver_dl_index = 1
         while True:
             try:
-                driver = webdriver.Chrome(path, options=options)
+                driver = CountingChrome(path, options=options)
                 break
             #driver not up to date with Chrome browser, try different ver
             except:
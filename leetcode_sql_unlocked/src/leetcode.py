@@ -1,46 +1,156 @@
 '''
 The main module that instantiates and controls the behavior and interaction of all objects, most notably objects from WebHandler, QuestionNodes, and QuestionLog.
 '''
-import os
 import re
 import time
-from datetime import datetime
-from threading import Event
+from threading import Lock, RLock
 
 from .config import cfg
 from .help_menu import HelpMenu
 from .questions import QuestionNodes
-from .driver import Driver
-from .web_handler import WebHandler
 from .log import QuestionLog
+from .page_cache import PageCache
+from .parse_cache import ParseCache, parse_tables
+from .sandbox import SqliteSandbox, get_sandbox_path
+from .leetcode_page import get_leetcode_url, get_cached_page, fetch_page
 from .exc_thread import ExcThread
+from .preload_pool import PreloadPool
+from .rate_limiter import RateLimiter, DEFAULT_RATE_LIMITS
+from .question_list import fetch_question_elements
+from .profiles import ChromeProfiles
+from .nav_history import NavigationHistory, NEXT, NEXT_LEVEL, JUMP
 
 class Leetcode():
 
-    def __init__(self, driver_path, q_elements_path, q_state_path, q_public_urls_path, headless=False):
+    def __init__(self, driver_path, q_elements_path, q_state_path, q_public_urls_path, headless=False, page_cache_dir=None, q_parse_path=None, sandbox_dir=None, nav_history_path=None, q_db_path=None, profiles_dir=None):
         self.cfg = cfg
         self.driver_path = driver_path
-        self.web_handler = WebHandler(self.driver_path, headless)
-        self.question_log = QuestionLog(q_elements_path, q_state_path, q_public_urls_path)
-
-        def is_stale_elements(elements_path, days_till_stale=13):
-            mtime = os.path.getmtime(elements_path)
-            return (datetime.now() - datetime.fromtimestamp(mtime)).days > days_till_stale
-
-        if not os.path.exists(q_elements_path) or is_stale_elements(q_elements_path):
-            #if path exists, it must be a stale question list
-            if os.path.exists(q_elements_path):
-                print('\nQuestion list have not been updated recently. Will update from LeetCode in case there are any new problems')
-            q_elements = self.web_handler.get_question_elements()
-            self.question_log.write_dict(q_elements_path, q_elements)
-        #don't re-download elements, read from q_elements log directly
+        self.headless = headless
+        #pause after printing so the user can read it before the next prompt, off when the output goes to a daemon client
+        self.is_pause = True
+        self.sandbox_dir = sandbox_dir
+        if page_cache_dir is not None:
+            self.page_cache = PageCache(page_cache_dir, self.cfg.get('page_cache_max_bytes', 20 * 1024 * 1024), self.cfg.get('page_cache_days_till_stale', 13))
         else:
-            q_elements = self.question_log.q_elements
-        self.question_nodes = QuestionNodes(q_elements, self.question_log.q_state['current'])
+            self.page_cache = None
+        self.parse_cache = ParseCache(q_parse_path) if q_parse_path is not None else None
+        self.nav_history = NavigationHistory(nav_history_path) if nav_history_path is not None else None
+        if profiles_dir is not None and self.cfg.get('is_persistent_profile', False):
+            self.profiles = ChromeProfiles(profiles_dir, self.cfg.get('profile_max_bytes', 500 * 1024 * 1024))
+        else:
+            self.profiles = None
+        self.rate_limiter = RateLimiter(self.cfg.get('rate_limits', DEFAULT_RATE_LIMITS))
+        #the browser is started by the first command that needs it, see the web_handler property and start()
+        self.__web_handler = None
+        self.web_handler_lock = Lock()
+        self.startup_thread = None
+        #WebDriver commands per question switch in the user's browser
+        self.switch_command_counts = []
+        #seconds per question switch, and whether it was to a standby question
+        self.switch_times = []
+        #held for each use of the user's browser, the preload dispatcher thread also opens standby tabs in it
+        self.browser_lock = RLock()
+        self.is_standby = self.cfg.get('n_standby_questions', 2) > 0
+        #average js heap of a question's tabs, to fit the standby tabs in standby_max_bytes
+        self.standby_question_bytes = None
+        self.question_log = QuestionLog(q_elements_path, q_state_path, q_public_urls_path, q_db_path)
+
+        #questions found by the background refresh, added to question_nodes by apply_question_updates()
+        self.catalog_lock = Lock()
+        self.pending_q_elements = None
+        self.catalog_thread = None
+        #first run, nothing to show until the question list is downloaded
+        if not self.question_log.q_elements:
+            q_elements = self.get_question_elements(is_main_browser=True)
+            if q_elements:
+                self.question_log.merge_q_elements(q_elements)
+        #don't wait for the download, start with the saved question list and update it in the background
+        elif self.question_log.is_elements_stale():
+            print('\nQuestion list have not been updated recently. Will update from LeetCode in the background in case there are any new problems')
+            self.catalog_thread = ExcThread(target=self.refresh_question_elements, name='catalog-refresh', daemon=True)
+            self.catalog_thread.start()
+        self.question_nodes = QuestionNodes(self.question_log.q_elements, self.question_log.q_state['current'])
 
+        self.__is_preload_questions = False
         if self.cfg['is_preload']:
             self.__turn_on_preloading()
 
+    @property
+    def web_handler(self):
+        '''
+        The user's browser, created on first use so the prompt doesn't wait on importing selenium and starting chrome
+        '''
+        with self.web_handler_lock:
+            if self.__web_handler is None:
+                from .web_handler import WebHandler
+                self.__web_handler = WebHandler(self.driver_path, self.headless, self.cfg.get('is_browserless_parse', True), self.page_cache, self.parse_cache, self.rate_limiter, profiles=self.profiles)
+            return self.__web_handler
+
+    def start(self):
+        '''
+        Speculatively starts the browser and opens the current question in the background, while the user reads the prompt
+        Commands that need the browser call wait_for_startup() first, the rest run right away
+        '''
+        self.startup_thread = ExcThread(target=self.start_new_question, kwargs={'q_num': self.get_current_q_num(), 'is_startup': True}, name='browser-startup', daemon=True)
+        self.startup_thread.start()
+
+    def is_started(self):
+        return self.startup_thread is None or not self.startup_thread.is_alive()
+
+    def wait_for_startup(self):
+        '''
+        join() raises in the main thread if the browser could not be started
+        '''
+        if self.startup_thread is None:
+            return
+        if self.startup_thread.is_alive():
+            print('\nWaiting for the browser to start')
+        startup_thread, self.startup_thread = self.startup_thread, None
+        startup_thread.join()
+
+    def get_question_elements(self, is_main_browser=False):
+        '''
+        The question list is one http request, only if that fails is a browser used, the user's browser if is_main_browser, otherwise a temporary headless one
+        '''
+        from http.client import HTTPException
+        try:
+            return fetch_question_elements()
+        except (OSError, HTTPException, ValueError):
+            print('\nCould not fetch the question list over http, reading it from the browser instead')
+        if is_main_browser:
+            with self.browser_lock:
+                return self.web_handler.read_question_elements()
+        from .web_handler import WebHandler
+        web_handler = WebHandler(self.driver_path, headless=True, rate_limiter=self.rate_limiter, is_lean=True)
+        try:
+            return web_handler.read_question_elements()
+        finally:
+            web_handler.close_all()
+
+    def refresh_question_elements(self):
+        '''
+        Run in the background. Falls back to a headless browser of its own, so the main browser is never shared between threads
+        The new or changed questions are saved to the question log right away, and handed to the main thread
+        '''
+        q_elements = self.get_question_elements()
+        if not q_elements:
+            return
+        changed = self.question_log.merge_q_elements(q_elements)
+        if changed:
+            with self.catalog_lock:
+                self.pending_q_elements = {**(self.pending_q_elements or {}), **changed}
+
+    def apply_question_updates(self):
+        '''
+        Patches question_nodes with questions found by the background refresh.
+        Only called from the main thread, once the browser start up is done and while no preload is running, so question_nodes is never changed while being read
+        '''
+        with self.catalog_lock:
+            changed, self.pending_q_elements = self.pending_q_elements, None
+        if changed:
+            self.question_nodes.update_questions(changed)
+            print('\nQuestion list updated, {} new or changed question(s)'.format(len(changed)))
+
     def get_current_q(self):
         '''
         Get the current question node object
@@ -55,75 +165,91 @@ class Leetcode():
 
     def preload_finish(self):
         '''
-        Turn on stop event so that main preload method will stop creating
-        new db-fiddles.
-        Join() waits for the preload method to finish its current
-        db-fiddle, before opening a new question in main thread.
+        Turn on stop event so that the preload pool drops the questions still waiting in its queue, and cancels the ones in progress at their next WebDriver step.
+        Join() only waits for that one step, so the user's question is opened in main thread right away.
         Even if the thread is already finished, call join() for exec info.
         '''
         #tell preload thread to end
         if self.preloader.thread is not None:
             if self.preloader.thread.is_alive():
-               self.preloader.stop_event.set()
-               print('\nWrapping up current question being pre-loaded')
-            #wait for preload thread to finish its current question
+               self.preloader.cancel()
+               print('\nWrapping up current question(s) being pre-loaded')
+            #wait for preload workers to finish their current question
             self.preloader.thread.join()
-            self.preloader.stop_event.clear()
+            self.preloader.resume()
 
-    def preload_delay(self, question_index):
-        '''
-        Based on number of questions to preload, delay processing the next pre-loaded question so as not to send too much traffic at one time to external website
-        '''
-        if question_index <= 5:
-            return
-        elif question_index <= 15:
-            delay = 10
-        elif question_index <= 40:
-            delay = 30
-        else:
-            delay = 45
-        self.preloader.stop_event.wait(delay)
-
-    def preload_open_question(self, q_num):
+    def preload_open_question(self, q_num, web_handler=None):
+        if web_handler is None:
+            web_handler = self.preloader.web_handlers[0]
         if self.check_is_forkable(q_num):
             public_url = self.question_log.q_public_urls[q_num]
-            start_url = self.preloader.web_handler.open_fork(q_num, public_url)
+            start_url = web_handler.open_fork(q_num, public_url)
         else:
-            start_url = self.preloader.web_handler.open_question(q_num, self.cfg['db_engine'], self.cfg['is_check_new_save_versions'])
-        #check that the question still doesn't exist in the log before writing just the url to it
-        if start_url is not None and not self.question_log.is_q_exist(q_num):
-            self.question_log.update_q_url(q_num, start_url)
-            self.question_log.write_dict(self.question_log.q_state_path, self.question_log.q_state)
+            start_url = web_handler.open_question(q_num, self.cfg['db_engine'], self.cfg['is_check_new_save_versions'])
+        #only write just the url if the question still doesn't exist in the log, checked and written in one transaction
+        if start_url is not None:
+            self.question_log.add_q_url(q_num, start_url)
 
-    def preload_close_question(self):
-        self.preloader.web_handler.close_question(is_save_before_closing=False)
+    def preload_close_question(self, web_handler=None):
+        if web_handler is None:
+            web_handler = self.preloader.web_handlers[0]
+        web_handler.close_question(is_save_before_closing=False)
 
-    def preload_question(self, q_num):
-        self.preload_open_question(q_num)
-        self.preload_close_question()
+    def preload_question(self, web_handler, q_num):
+        '''
+        Run by each preload worker with its own headless web handler
+        Traffic to each website is paced by the shared rate limiter in WebHandler.open_new_win()
+        A cancelled question never reached db_fiddle_save(), so its tabs are closed without recording a url
+        '''
+        from .web_handler import QuestionCancelled
+        try:
+            self.preload_open_question(q_num, web_handler)
+        except QuestionCancelled:
+            web_handler.close_question_windows()
+            return
+        self.preload_close_question(web_handler)
 
-    def preload(self, n_next, n_next_same_lvl):
+    def get_questions_to_preload(self, n_next, n_next_same_lvl):
         '''
-        Headless web handler in the background to create db-fiddles for pre-loading.
-        This will try to guarantee the next n questions are pre-loaded.
-        However, if the question's db-fiddle already exists, no need to pre-load.
-        If user selects another question before all n questions can be pre-loaded, thread will be terminated after the current question being preloaded is finished
+        Ordered by priority, see rank_next_questions(), without the questions whose db-fiddle already exists
+        '''
+        return [q_num for q_num in self.rank_next_questions(n_next, n_next_same_lvl) if not self.question_log.is_q_exist(q_num) and q_num != 175]
+
+    def rank_next_questions(self, n_next, n_next_same_lvl):
         '''
+        Ordered by priority.
+        Once there is enough navigation history, the n_next + n_next_same_lvl questions the user is most likely to go to next.
+        Otherwise, questions fewer steps away from the current question come first, ties go to the next question over the next same level question
+        '''
+        if self.cfg.get('is_predictive_preload', True) and self.nav_history is not None and self.nav_history.is_predictive():
+            return self.nav_history.rank_questions(self.question_nodes, n_next + n_next_same_lvl)
         q_curr = self.get_current_q()
         next_q_nums = [q.number for q in self.question_nodes.get_next_n_nodes(n_next)]
         next_same_lvl_q_nums = [q.number for q in self.question_nodes.get_next_n_nodes(n_next_same_lvl, q_curr.level)]
-        question_nums = sorted(set(next_q_nums + next_same_lvl_q_nums))
-        question_nums = [q_num for q_num in question_nums if not self.question_log.is_q_exist(q_num) and q_num != 175]
-        #print(f'in preload, node(s) to be processed are {question_nums}')
+        priorities = {}
+        for i, q_num in enumerate(next_q_nums):
+            priorities.setdefault(q_num, (i, 0))
+        for i, q_num in enumerate(next_same_lvl_q_nums):
+            priorities[q_num] = min(priorities.get(q_num, (i, 1)), (i, 1))
+        return sorted(priorities, key=priorities.get)
 
-        for i, q_num in enumerate(question_nums):
-            # if main thread is still running
-            #and question has never been created
-            if self.preloader.stop_event.is_set():
-                return
-            self.preload_question(q_num)
-            self.preload_delay(i)
-        if len(question_nums) > 5:
+    def preload(self, n_next, n_next_same_lvl):
+        '''
+        Headless web handlers in the background create db-fiddles for pre-loading, several questions at a time, one per preload worker.
+        This will try to guarantee the next n questions are pre-loaded.
+        However, if the question's db-fiddle already exists, no need to pre-load.
+        If user selects another question before all n questions can be pre-loaded, questions still waiting in the queue are dropped, and the ones being built are cancelled
+        '''
+        question_nums = self.get_questions_to_preload(n_next, n_next_same_lvl)
+        #print(f'in preload, node(s) to be processed are {question_nums}')
+        if self.preloader.stop_event.is_set():
+            return
+        self.preloader.submit(question_nums)
+        self.preloader.wait()
+        #the new db-fiddles can be rendered in standby tabs now
+        if not self.preloader.stop_event.is_set():
+            self.refresh_standby()
+        if len(question_nums) > 5 and not self.preloader.stop_event.is_set():
             print('FYI, current batch of questions have finished preloading')
 
     def close_current_question(self):
@@ -151,7 +277,10 @@ class Leetcode():
             return True
         return False
 
-    def open_new_question(self, q_num=None):
+    def open_new_question(self, q_num=None, from_q_num=None):
+        '''
+        Returns True if the question's tabs were already open in standby
+        '''
         if q_num is None:
             q_num = self.get_current_q_num()
         #print(f'inside open_new_question, q_num is {q_num}')
@@ -160,7 +289,14 @@ class Leetcode():
         except KeyError:
             prev_save_url = None
 
-        if self.check_is_forkable(q_num):
+        start_url = None
+        if self.web_handler.has_standby(q_num, prev_save_url) and not self.cfg['is_check_new_save_versions']:
+            start_url = self.web_handler.switch_to_standby(q_num, from_q_num, self.question_log.q_state['url'].get(from_q_num))
+        is_standby = start_url is not None
+        if is_standby:
+            #the standby fiddle is the saved one, nothing to fork or check
+            start_url = prev_save_url
+        elif self.check_is_forkable(q_num):
             public_url = self.question_log.q_public_urls[q_num]
             start_url = self.web_handler.open_fork(q_num, public_url)
         else:
@@ -175,23 +311,117 @@ class Leetcode():
             #start preloading now that user selected question is loaded
             self.preloader.thread = ExcThread(target=self.preload, args=(self.cfg['n_to_preload'], self.cfg['n_same_level_to_preload']))
             self.preloader.thread.start()
+        return is_standby
 
-    def start_new_question(self, q_level=None, q_num=None):
+    def start_new_question(self, q_level=None, q_num=None, is_startup=False):
+        '''
+        is_startup: run by the browser-startup thread, while the main thread takes commands that read question_nodes
+        '''
         if self.__is_preload_questions:
             self.preload_finish()
+        #the updates wait for the first question switch on the main thread
+        if not is_startup:
+            self.apply_question_updates()
+
+        with self.browser_lock:
+            start = time.perf_counter()
+            commands_start = self.web_handler.get_command_count()
+            self.measure_standby_question_bytes()
+            self.close_current_question()
+            from_q_num = self.get_current_q_num()
+            #updates question current to the question the user chose
+            if q_num is not None:
+                self.question_nodes.select_question_by_number(q_num)
+            else:
+                self.question_nodes.select_next_question(q_level)
+            self.record_navigation(from_q_num, q_level, q_num)
+            is_standby = self.open_new_question(from_q_num=from_q_num)
+            #reopening the same question at start up isn't a switch
+            if from_q_num != self.get_current_q_num():
+                self.switch_command_counts.append(self.web_handler.get_command_count() - commands_start)
+                self.switch_times.append((time.perf_counter() - start, is_standby))
+            self.refresh_standby()
+
+    def measure_standby_question_bytes(self):
+        '''
+        Measured on the question being left, once its pages have had time to load
+        '''
+        if not self.is_standby or self.web_handler.db_win is None:
+            return
+        try:
+            question_bytes = self.web_handler.get_question_bytes()
+        #the user closed a tab, the question is re-opened as usual
+        except Exception:
+            return
+        if question_bytes:
+            if self.standby_question_bytes is None:
+                self.standby_question_bytes = question_bytes
+            else:
+                self.standby_question_bytes = (self.standby_question_bytes + question_bytes) / 2
 
-        self.close_current_question()
-        #updates question current to the question the user chose
+    def get_max_standby_questions(self):
+        max_questions = self.cfg.get('n_standby_questions', 2)
+        if self.standby_question_bytes:
+            max_questions = min(max_questions, int(self.cfg.get('standby_max_bytes', 256 * 1024 * 1024) // self.standby_question_bytes))
+        return max_questions
+
+    def refresh_standby(self):
+        '''
+        Keeps the questions the user is most likely to go to next, that already have a saved db-fiddle, rendered in standby tabs of the user's browser.
+        Run after each question switch, and by the preload dispatcher thread once its questions are built. Least recently used standby tabs are closed past n_standby_questions, or once the standby tabs would use more than standby_max_bytes
+        '''
+        if not self.is_standby:
+            return
+        from selenium.common.exceptions import WebDriverException
+        with self.browser_lock:
+            q_curr = self.get_current_q_num()
+            max_questions = self.get_max_standby_questions()
+            q_urls = self.question_log.q_state['url']
+            q_nums = [q_num for q_num in self.rank_next_questions(self.cfg['n_to_preload'], self.cfg['n_same_level_to_preload']) if q_num != q_curr and q_num in q_urls][:max_questions]
+            try:
+                #the most likely question is opened last, so it's the most recently used
+                for q_num in reversed(q_nums):
+                    if not self.web_handler.open_standby(q_num, q_urls[q_num]):
+                        break
+                self.web_handler.evict_standby(max_questions, q_nums)
+            except WebDriverException:
+                self.is_standby = False
+                print('\nCould not open standby tabs in this version of chrome, turning them off')
+
+    def get_switch_msg(self):
+        '''
+        Average WebDriver commands sent by the user's browser per question switch, each one is a round trip to chromedriver, and the average time of switches to standby questions and to the rest
+        '''
+        if not self.switch_command_counts:
+            return None
+        msg = 'Question switches took {avg:.0f} WebDriver commands on average, over {n} switch(es)'.format(avg=sum(self.switch_command_counts) / len(self.switch_command_counts), n=len(self.switch_command_counts))
+        for is_standby, kind in ((True, 'standby'), (False, 'other')):
+            times = [t for t, standby in self.switch_times if standby == is_standby]
+            if times:
+                msg += '\nSwitches to {kind} questions took {avg:.0f} ms on average, over {n} switch(es)'.format(kind=kind, avg=sum(times) / len(times) * 1000, n=len(times))
+        return msg
+
+    def record_navigation(self, from_q_num, q_level=None, q_num=None):
+        '''
+        Saves how the user got to the current question to the navigation history, and whether its db-fiddle was already built
+        '''
+        to_q_num = self.get_current_q_num()
+        #reopening the same question, i.e. at start up
+        if self.nav_history is None or from_q_num == to_q_num:
+            return
         if q_num is not None:
-            self.question_nodes.select_question_by_number(q_num)
+            action = JUMP
+        elif q_level is not None:
+            action = NEXT_LEVEL
         else:
-            self.question_nodes.select_next_question(q_level)
-        self.open_new_question()
+            action = NEXT
+        is_hit = self.question_log.is_q_exist(to_q_num) if self.__is_preload_questions else None
+        self.nav_history.record(from_q_num, action, q_level, to_q_num, is_hit)
 
-    @staticmethod
-    def print_options(expr, sleep_time=1):
+    def print_options(self, expr, sleep_time=1):
         print('\n'+ expr+ '\n')
-        time.sleep(sleep_time)
+        if self.is_pause:
+            time.sleep(sleep_time)
 
     def next_option(self, user_input):
         '''
@@ -268,15 +498,52 @@ class Leetcode():
         Main display method
         '''
         level_arg, num_to_display_arg = self.parse_display_args(user_input)
+        #the startup thread may still be opening the first question
+        is_preloading = self.__is_preload_questions and self.preloader.thread is not None and self.preloader.thread.is_alive()
+        if self.is_started() and not is_preloading:
+            self.apply_question_updates()
         print()
-        self.question_nodes.display_questions(level_arg, num_to_display_arg)
+        self.question_nodes.display_questions(level_arg, num_to_display_arg, self.is_pause)
 
     def help_option(self):
         h = HelpMenu(self.question_nodes.DEFAULT_NUM_TO_DISPLAY)
-        h.print_help()
+        h.print_help(self.is_pause)
 
     def solution_option(self):
-        self.web_handler.open_solution_win(self.get_current_q())
+        with self.browser_lock:
+            self.web_handler.open_solution_win(self.get_current_q())
+
+    def sandbox_option(self):
+        '''
+        Loads the current question's tables into a local sqlite3 database and drops the user into a console on it, no browser needed
+        '''
+        from http.client import HTTPException
+        q = self.get_current_q()
+        try:
+            #from the page cache or over http, the browser is never started or waited on for this
+            page = get_cached_page(q.number, self.page_cache)
+            if page is None:
+                self.rate_limiter.wait(get_leetcode_url(q.number))
+                page = fetch_page(q.number, self.page_cache)
+        #URLError and socket timeouts are both OSErrors
+        except (OSError, HTTPException):
+            self.print_options('Not able to fetch leetcode.jp for question {}'.format(q.number))
+            return
+        try:
+            table_names, tables_text = parse_tables(q.number, page, self.parse_cache)
+            if self.cfg.get('is_sandbox_file_backed', False) and self.sandbox_dir is not None:
+                db_path = get_sandbox_path(self.sandbox_dir, q.number)
+            else:
+                db_path = ':memory:'
+            sandbox = SqliteSandbox(table_names, tables_text, db_path)
+        #no tables to parse, i.e. #175
+        except (IndexError, ValueError):
+            self.print_options('Not able to parse tables from leetcode.jp for question {}'.format(q.number))
+            return
+        try:
+            sandbox.run_console(q.name)
+        finally:
+            sandbox.close()
 
     def __turn_off_preloading(self):
         self.preload_finish()
@@ -287,16 +554,14 @@ class Leetcode():
         if self.__is_preload_questions:
             self.__turn_off_preloading()
 
-    class Preloader:
-        def __init__(self, thread, web_handler):
-            self.thread = thread
-            self.web_handler = web_handler
-            self.stop_event = Event()
+    def __create_preload_web_handler(self):
+        from .web_handler import WebHandler
+        return WebHandler(self.driver_path, headless=True, is_browserless_parse=self.cfg.get('is_browserless_parse', True), page_cache=self.page_cache, parse_cache=self.parse_cache, rate_limiter=self.rate_limiter, cancel_event=self.preloader.stop_event, profiles=self.profiles, profile_kind='preload', is_lean=self.cfg.get('is_lean_preload', True))
 
     def __turn_on_preloading(self):
         self.__is_preload_questions = True
         if not hasattr(self, 'preloader'):
-            self.preloader = self.Preloader(thread=None, web_handler=WebHandler(self.driver_path, headless=True))
+            self.preloader = PreloadPool(self.__create_preload_web_handler, self.cfg.get('n_preload_drivers', 2), self.preload_question, self.question_log.is_q_exist)
 
     def turn_on_preloading(self):
         #possibilities, load has never been turned on
@@ -314,11 +579,27 @@ class Leetcode():
         return True
 
     def __exit(self, msg="Exiting program"):
-        self.web_handler.close_all()
+        #the preload dispatcher can still be opening standby tabs in the user's browser
         if self.__is_preload_questions:
             self.preload_finish()
-        if hasattr(self, 'preload_thread'):
-            self.preloader.web_handler.close_all()
+        #no need to start a browser just to close it
+        if self.__web_handler is not None:
+            with self.browser_lock:
+                self.__web_handler.close_all()
+        if hasattr(self, 'preloader'):
+            self.preloader.shutdown()
+        #let the refresh close its headless browser, its waits are bounded
+        if self.catalog_thread is not None:
+            try:
+                self.catalog_thread.join()
+            #the question list is just refreshed again next time
+            except Exception:
+                pass
+        self.question_log.close()
+        if self.nav_history is not None and self.nav_history.get_hit_rate_msg() is not None:
+            print('\n' + self.nav_history.get_hit_rate_msg())
+        if self.get_switch_msg() is not None:
+            print('\n' + self.get_switch_msg())
         print(msg + '\n')
         return False
 
@@ -327,6 +608,7 @@ class Leetcode():
         If the user inputs 'e' into console, we can save the state of the question to the log before closing everything
         '''
         try:
+            self.wait_for_startup()
             self.close_current_question()
         except:
             pass
@@ -352,7 +634,7 @@ class Leetcode():
         user_input = self.clean_user_input(user_input)
         #if input is numbers only, this will be treated as question # arg
         is_num_only = re.match(r'[1-9]\d{2,3}$', user_input) is not None
-        valid_start_inputs = ['h', 'n', 'q', 's', 'd', 'l', 'e']
+        valid_start_inputs = ['h', 'n', 'q', 's', 'c', 'd', 'l', 'e']
         try:
             start_input = user_input[0]
         #empty user input
@@ -361,6 +643,9 @@ class Leetcode():
             return True
 
         if start_input in valid_start_inputs or is_num_only:
+            #help, display and the sqlite console don't need the browser, so they don't wait for it to start
+            if start_input in ('n', 'q', 's', 'l') or is_num_only:
+                self.wait_for_startup()
             if start_input == 'h':
                 self.help_option()
 
@@ -376,6 +661,11 @@ class Leetcode():
                     self.question_by_number_option(user_input)
             elif start_input == 's':
                 self.solution_option()
+            elif start_input == 'c':
+                if user_input in ('c', 'console'):
+                    self.sandbox_option()
+                else:
+                    self.print_options('Invalid input')
             elif start_input == 'd':
                 self.display_questions_option(user_input)
             elif start_input == 'l':
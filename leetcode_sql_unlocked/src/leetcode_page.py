@@ -0,0 +1,231 @@
+'''
+A leetcode.jp problem page, as read by TableParser.
+DriverPage reads the text from a live selenium tab, HTMLPage reads the same text from raw html fetched over http, so no browser is needed to parse the sql tables.
+'''
+import hashlib
+from html.parser import HTMLParser
+
+LEETCODE_JP_URL = 'https://leetcode.jp'
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/85.0.4183.83 Safari/537.36 Edg/85.0.564.41"
+
+def get_leetcode_url(q_num, base_url=LEETCODE_JP_URL):
+    return '{base_url}/problemdetail.php?id={q_num}'.format(base_url=base_url, q_num=q_num)
+
+def get_content_hash(html):
+    return hashlib.sha1(html.encode('utf-8')).hexdigest()[:16]
+
+def fetch_html(url, timeout=10):
+    '''
+    Plain http GET, returns the decoded html
+    '''
+    #urllib pulls in ssl and http.client, only needed once a page is fetched, not at start up
+    from urllib.request import urlopen, Request
+    request = Request(url, headers={'User-Agent': USER_AGENT})
+    with urlopen(request, timeout=timeout) as response:
+        charset = response.headers.get_content_charset() or 'utf-8'
+        return response.read().decode(charset, errors='replace')
+
+def fetch_final_url(url, timeout=10):
+    '''
+    The url a plain http GET ends up at after following redirects, the body isn't read
+    '''
+    from urllib.request import urlopen, Request
+    request = Request(url, headers={'User-Agent': USER_AGENT})
+    with urlopen(request, timeout=timeout) as response:
+        return response.geturl()
+
+def get_cached_page(q_num, page_cache):
+    '''
+    A fresh snapshot from the page cache, or None
+    '''
+    if page_cache is None:
+        return None
+    snapshot = page_cache.get_snapshot(q_num)
+    if snapshot is None:
+        return None
+    html, content_hash = snapshot
+    return HTMLPage(html, content_hash)
+
+def fetch_page(q_num, page_cache=None):
+    '''
+    Fetches the page over http, and saves it to the page cache
+    Raises OSError or http.client.HTTPException if the fetch fails
+    '''
+    html = fetch_html(get_leetcode_url(q_num))
+    if page_cache is not None:
+        page_cache.put(q_num, html)
+    return HTMLPage(html)
+
+
+class DriverPage:
+    '''
+    Reads the page text from the selenium tab that the driver is currently switched to.
+    All of the text is read by one injected script, rather than one WebDriver round trip per <pre>, <code>, <p> and <b> element
+    '''
+    #innerText is the rendered text that element.text returns, trimmed and with non-breaking spaces as spaces the same as selenium does
+    EXTRACT_SCRIPT = '''
+        var text = function(element) {
+            return (element.innerText || '').replace(/\\u00a0/g, ' ').trim();
+        };
+        var all = function(selector, root) {
+            return Array.prototype.slice.call((root || document).querySelectorAll(selector));
+        };
+        return {
+            html: document.documentElement.outerHTML,
+            pre: all('pre').map(text),
+            code: all('code').map(text),
+            paragraphs: all('p').map(function(p) {
+                return [text(p), all('b', p).map(text)];
+            })
+        };
+    '''
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.__extracted = None
+
+    def __extract(self):
+        if self.__extracted is None:
+            self.__extracted = self.driver.execute_script(self.EXTRACT_SCRIPT)
+        return self.__extracted
+
+    def get_html(self):
+        return self.__extract()['html']
+
+    def get_content_hash(self):
+        return get_content_hash(self.get_html())
+
+    def get_pre_texts(self):
+        return list(self.__extract()['pre'])
+
+    def get_code_texts(self):
+        return list(self.__extract()['code'])
+
+    def get_paragraphs(self):
+        return [(text, list(bolded)) for text, bolded in self.__extract()['paragraphs']]
+
+
+class LeetcodeHTMLParser(HTMLParser):
+    '''
+    Collects the text of every <pre>, <code>, and <p> element, as well as the <b> elements inside each <p>.
+    Each element's text is normalized the same way selenium's element.text is, so that TableParser gets identical input from either page type
+    '''
+    __TRACKED_TAGS = ('pre', 'code', 'p', 'b')
+    #block elements that implicitly close an open <p>
+    __CLOSES_P = ('p', 'pre', 'div', 'table', 'ul', 'ol', 'dl', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'blockquote', 'hr')
+    __SKIP_TAGS = ('script', 'style')
+    #placeholder for <br>, so it isn't confused with newlines in the html source
+    LINE_BREAK = '\x00'
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.pre_texts = []
+        self.code_texts = []
+        self.paragraphs = []
+        #stack of [tag, text chunks, bolded texts] for the tracked elements currently open
+        self.__open = []
+        self.__skip_depth = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in self.__SKIP_TAGS:
+            self.__skip_depth += 1
+        elif tag == 'br':
+            self.handle_data(self.LINE_BREAK)
+        else:
+            if tag in self.__CLOSES_P and any(elem[0] == 'p' for elem in self.__open):
+                self.__close('p')
+            if tag in self.__TRACKED_TAGS:
+                self.__open.append([tag, [], []])
+
+    def handle_endtag(self, tag):
+        if tag in self.__SKIP_TAGS:
+            self.__skip_depth = max(0, self.__skip_depth - 1)
+        elif tag in self.__TRACKED_TAGS:
+            self.__close(tag)
+
+    def handle_data(self, data):
+        if self.__skip_depth:
+            return
+        for elem in self.__open:
+            elem[1].append(data)
+
+    def close(self):
+        super().close()
+        while self.__open:
+            self.__close(self.__open[-1][0])
+
+    def __close(self, tag):
+        '''
+        Closes the most recent open element of this tag, along with any unclosed elements nested inside it
+        '''
+        if not any(elem[0] == tag for elem in self.__open):
+            return
+        while True:
+            elem_tag, chunks, bolded = self.__open.pop()
+            text = ''.join(chunks)
+            if elem_tag == 'pre':
+                self.pre_texts.append(self.normalize_pre(text))
+            elif elem_tag == 'code':
+                self.code_texts.append(self.normalize_text(text))
+            elif elem_tag == 'p':
+                self.paragraphs.append((self.normalize_text(text), bolded))
+            elif elem_tag == 'b':
+                #a bolded word belongs to the innermost open paragraph
+                for elem in reversed(self.__open):
+                    if elem[0] == 'p':
+                        elem[2].append(self.normalize_text(text))
+                        break
+            if elem_tag == tag:
+                return
+
+    @staticmethod
+    def normalize_pre(text):
+        '''
+        <pre> keeps its whitespace, selenium only trims the ends
+        '''
+        return text.replace(LeetcodeHTMLParser.LINE_BREAK, '\n').replace('\xa0', ' ').strip()
+
+    @staticmethod
+    def normalize_text(text):
+        '''
+        Outside of <pre>, whitespace is collapsed, except for line breaks from <br>
+        '''
+        lines = text.replace('\xa0', ' ').split(LeetcodeHTMLParser.LINE_BREAK)
+        return '\n'.join(' '.join(line.split()) for line in lines).strip()
+
+
+class HTMLPage:
+    '''
+    Raw leetcode.jp html, parsed with html.parser rather than rendered by the browser
+    The html is only parsed the first time its text is needed, so a page whose tables are already in the parse cache is never parsed
+    '''
+    def __init__(self, html, content_hash=None):
+        self.html = html
+        self.__content_hash = content_hash
+        self.__parser = None
+
+    @classmethod
+    def fetch(cls, url):
+        return cls(fetch_html(url))
+
+    def get_content_hash(self):
+        if self.__content_hash is None:
+            self.__content_hash = get_content_hash(self.html)
+        return self.__content_hash
+
+    def __parsed(self):
+        if self.__parser is None:
+            parser = LeetcodeHTMLParser()
+            parser.feed(self.html)
+            parser.close()
+            self.__parser = parser
+        return self.__parser
+
+    def get_pre_texts(self):
+        return list(self.__parsed().pre_texts)
+
+    def get_code_texts(self):
+        return list(self.__parsed().code_texts)
+
+    def get_paragraphs(self):
+        return [(text, list(bolded)) for text, bolded in self.__parsed().paragraphs]
@@ -1,47 +1,215 @@
 import os
 import ast
-import pprint
-
+import time
+import atexit
+import sqlite3
+from threading import Thread, Event, Lock
 
 class QuestionLog:
     '''
     The question log keeps track of two things. Firstly, q_elements, which is all the question data parsed from leetcode. The question elements are saved in a log so that the question info doesn't have to be downloaded each session since questions aren't being added that often.
     Secondly, q_state, which is the state of each of the questions, specifically which question the user is currently on, and a list of all questions that user has a db-fiddle of, including the URL of the db-fiddle.
+
+    Both are stored in a sqlite database in WAL mode, one row per question, so each update only writes the rows that changed.
+    Updates from the main and preload threads are applied to q_state right away under a lock, and marked dirty.
+    A background flusher writes every dirty row in one transaction, flush_delay seconds after the first update, so there is at most one disk write per flush_delay. Pending updates are also flushed on close() and at interpreter exit.
+    The q_elements.log and q_state.log files from older versions are imported once, the first time the database is created.
+    Public urls are re-imported from q_public_urls.log whenever that file changes.
+    '''
+    __SCHEMA = '''
+        CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value);
+        CREATE TABLE IF NOT EXISTS q_elements (q_num INTEGER PRIMARY KEY, level TEXT NOT NULL, name TEXT NOT NULL);
+        CREATE TABLE IF NOT EXISTS q_urls (q_num INTEGER PRIMARY KEY, url TEXT NOT NULL);
+        CREATE TABLE IF NOT EXISTS q_public_urls (q_num INTEGER PRIMARY KEY, url TEXT NOT NULL);
     '''
 
-    def __init__(self, q_elements_path, q_state_path, q_public_urls_path):
+    def __init__(self, q_elements_path, q_state_path, q_public_urls_path, q_db_path=None, flush_delay=0.5):
         self.q_elements_path = q_elements_path
         self.q_state_path = q_state_path
         self.q_public_urls_path = q_public_urls_path
+        if q_db_path is None:
+            q_db_path = os.path.join(os.path.dirname(q_state_path), 'questions.db')
+        self.q_db_path = q_db_path
+        #guards q_state and the dirty updates
+        self.lock = Lock()
+        #guards the sqlite connection
+        self.db_lock = Lock()
+        self.flush_delay = flush_delay
+        #updates not yet written to the database, q_num: url, and meta key: value
+        self.dirty_urls = {}
+        self.dirty_meta = {}
+        #number of transactions written by flush()
+        self.flush_count = 0
 
-        self.q_elements = self.__read_dict(q_elements_path)
-        self.q_state = self.__read_dict(q_state_path)
-        self.q_public_urls = self.__read_dict(q_public_urls_path)
+        self.conn = sqlite3.connect(q_db_path, check_same_thread=False)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        #WAL is still crash safe with NORMAL, only the last commits can be lost on power failure
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        with self.conn:
+            self.conn.executescript(self.__SCHEMA)
+        if self.__get_meta('version') is None:
+            self.__migrate_logs()
+        self.__import_public_urls()
 
-        if self.q_state is None:
+        self.q_elements = {q_num: {'level': level, 'name': name} for q_num, level, name in self.conn.execute('SELECT q_num, level, name FROM q_elements ORDER BY rowid')}
+        self.q_state = {
             #If question state does not exist yet, start at question 176
-            self.q_state = {'current':176,'url':{}}
+            'current': self.__get_meta('current', 176),
+            'url': dict(self.conn.execute('SELECT q_num, url FROM q_urls ORDER BY rowid'))
+        }
+        self.q_public_urls = dict(self.conn.execute('SELECT q_num, url FROM q_public_urls'))
+
+        self.dirty_event = Event()
+        self.closed_event = Event()
+        self.flusher = Thread(target=self.__flush_loop, name='question-log-flusher', daemon=True)
+        self.flusher.start()
+        atexit.register(self.close)
 
-    def __read_dict(self, path):
+    @staticmethod
+    def read_dict(path):
+        '''
+        Reads a pprint-ed dict log file, or returns None if it doesn't exist or can't be read
+        '''
         if os.path.exists(path):
-            with open(path, "r") as f:
-                return ast.literal_eval(f.read())
+            try:
+                with open(path, "r") as f:
+                    return ast.literal_eval(f.read())
+            except (SyntaxError, ValueError):
+                print('\nCould not read {}, skipping it'.format(path))
         return None
 
-    def write_dict(self, path, dict):
-        with open(path, 'w') as f:
-            pprint.pprint(dict, f)
+    def __get_meta(self, key, default=None):
+        row = self.conn.execute('SELECT value FROM meta WHERE key = ?', (key,)).fetchone()
+        return default if row is None else row[0]
+
+    def __set_meta(self, key, value):
+        self.conn.execute('INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)', (key, value))
+
+    def __migrate_logs(self):
+        '''
+        One time import of the q_elements and q_state log files, in one transaction so an interrupted migration is redone on the next start
+        The elements log's mtime is kept so it still goes stale on the same day
+        '''
+        q_elements = self.read_dict(self.q_elements_path)
+        q_state = self.read_dict(self.q_state_path)
+        with self.conn:
+            if q_elements:
+                self.conn.executemany('INSERT OR REPLACE INTO q_elements (q_num, level, name) VALUES (?, ?, ?)', [(q_num, e['level'], e['name']) for q_num, e in q_elements.items()])
+                self.__set_meta('elements_updated', os.path.getmtime(self.q_elements_path))
+            if q_state:
+                self.conn.executemany('INSERT OR REPLACE INTO q_urls (q_num, url) VALUES (?, ?)', list(q_state.get('url', {}).items()))
+                if 'current' in q_state:
+                    self.__set_meta('current', q_state['current'])
+            self.__set_meta('version', 1)
+        if q_elements or q_state:
+            print('\nMoved question logs to {}'.format(self.q_db_path))
+
+    def __import_public_urls(self):
+        if not os.path.exists(self.q_public_urls_path):
+            return
+        mtime = os.path.getmtime(self.q_public_urls_path)
+        if self.__get_meta('public_urls_mtime') == mtime:
+            return
+        q_public_urls = self.read_dict(self.q_public_urls_path)
+        if q_public_urls is None:
+            return
+        with self.conn:
+            self.conn.execute('DELETE FROM q_public_urls')
+            self.conn.executemany('INSERT INTO q_public_urls (q_num, url) VALUES (?, ?)', list(q_public_urls.items()))
+            self.__set_meta('public_urls_mtime', mtime)
+
+    def __flush_loop(self):
+        while not self.closed_event.is_set():
+            self.dirty_event.wait()
+            #debounce, updates made in the meantime are written together
+            self.closed_event.wait(self.flush_delay)
+            self.dirty_event.clear()
+            self.flush()
+
+    def flush(self):
+        '''
+        Writes every pending update in one transaction, does nothing if there are none
+        '''
+        with self.db_lock:
+            with self.lock:
+                dirty_urls, self.dirty_urls = self.dirty_urls, {}
+                dirty_meta, self.dirty_meta = self.dirty_meta, {}
+            if (not dirty_urls and not dirty_meta) or self.conn is None:
+                return
+            with self.conn:
+                self.conn.executemany('INSERT OR REPLACE INTO q_urls (q_num, url) VALUES (?, ?)', list(dirty_urls.items()))
+                self.conn.executemany('INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)', list(dirty_meta.items()))
+            self.flush_count += 1
+
+    def close(self):
+        '''
+        Stops the flusher and writes any pending updates, safe to call more than once
+        '''
+        if self.closed_event.is_set():
+            return
+        self.closed_event.set()
+        self.dirty_event.set()
+        self.flusher.join()
+        self.flush()
+        with self.db_lock:
+            self.conn.close()
+            self.conn = None
+        atexit.unregister(self.close)
+
+    def is_elements_stale(self, days_till_stale=13):
+        updated = self.__get_meta('elements_updated')
+        if not self.q_elements or updated is None:
+            return True
+        return (time.time() - updated) / (24 * 60 * 60) > days_till_stale
+
+    def merge_q_elements(self, q_elements):
+        '''
+        Saves only the new or changed questions, questions no longer on leetcode are kept so the user's current question stays valid
+        Returns the new or changed questions
+        '''
+        changed = {q_num: element for q_num, element in q_elements.items() if self.q_elements.get(q_num) != element}
+        with self.db_lock, self.conn:
+            self.conn.executemany('INSERT OR REPLACE INTO q_elements (q_num, level, name) VALUES (?, ?, ?)', [(q_num, e['level'], e['name']) for q_num, e in changed.items()])
+            self.__set_meta('elements_updated', time.time())
+        #replaced rather than updated, so readers in other threads never see a half merged dict
+        self.q_elements = {**self.q_elements, **changed}
+        return changed
 
     def update_q_current(self, q_num):
-        self.q_state['current'] = q_num
+        with self.lock:
+            self.q_state['current'] = q_num
+            self.dirty_meta['current'] = q_num
+        self.dirty_event.set()
 
     def update_q_url(self, q_num, url):
-        self.q_state['url'][q_num] = url
+        with self.lock:
+            self.q_state['url'][q_num] = url
+            self.dirty_urls[q_num] = url
+        self.dirty_event.set()
+
+    def add_q_url(self, q_num, url):
+        '''
+        Saves the url only if the question doesn't have one yet, returns True if it was saved
+        Checked and updated under one lock, so a preload thread can't overwrite a url the main thread just saved
+        '''
+        with self.lock:
+            if q_num in self.q_state['url']:
+                return False
+            self.q_state['url'][q_num] = url
+            self.dirty_urls[q_num] = url
+        self.dirty_event.set()
+        return True
 
     def update_q_state(self, q_num, url):
-        self.update_q_current(q_num)
-        self.update_q_url(q_num, url)
-        self.write_dict(self.q_state_path, self.q_state)
+        '''
+        Current question and its url are updated together, and written in the same transaction
+        '''
+        with self.lock:
+            self.q_state['current'] = q_num
+            self.q_state['url'][q_num] = url
+            self.dirty_meta['current'] = q_num
+            self.dirty_urls[q_num] = url
+        self.dirty_event.set()
 
     def is_q_exist(self, q_num):
         return q_num in self.q_state['url'].keys()
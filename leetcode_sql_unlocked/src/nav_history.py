@@ -0,0 +1,165 @@
+import os
+import ast
+from threading import Lock
+
+#navigation actions
+NEXT = 'next'
+NEXT_LEVEL = 'next_level'
+JUMP = 'jump'
+
+LEVELS = ('easy', 'medium', 'hard')
+
+class NavigationHistory:
+    '''
+    Records how the user moves between questions: next, next by level, or a jump by question number.
+    The recent events are used to rank which questions are most likely to be selected next, so preloading builds those db-fiddles first.
+    Also counts how many question switches landed on a db-fiddle that was already built, the preload hit rate.
+    '''
+    MAX_EVENTS = 500
+    #fewer events than this, the history says too little and the default next/next same level questions are preloaded
+    MIN_EVENTS_TO_PREDICT = 5
+    #weight of each event is multiplied by this for every newer event, so recent habits count more
+    DECAY = 0.97
+    #the log is rewritten at start up once it's this many times MAX_EVENTS lines
+    COMPACT_FACTOR = 2
+
+    def __init__(self, history_path):
+        self.history_path = history_path
+        self.lock = Lock()
+        #each event is (from q_num, action, level or None, to q_num)
+        self.events = []
+        self.hits = 0
+        self.switches = 0
+        self.session_hits = 0
+        self.session_switches = 0
+        if self.__read(history_path) > self.COMPACT_FACTOR * self.MAX_EVENTS:
+            self.__compact()
+
+    def __read(self, path):
+        '''
+        The log has one line per switch, (from q_num, action, level, to q_num, is_hit), after the hit counts of the switches compacted away
+        Returns the number of lines
+        '''
+        if not os.path.exists(path):
+            return 0
+        n_lines = 0
+        with open(path, "r") as f:
+            for line in f:
+                n_lines += 1
+                try:
+                    entry = ast.literal_eval(line)
+                #a line cut short by a crash is skipped
+                except (SyntaxError, ValueError):
+                    continue
+                if isinstance(entry, dict):
+                    self.hits += entry.get('hits', 0)
+                    self.switches += entry.get('switches', 0)
+                elif isinstance(entry, tuple) and len(entry) == 5:
+                    self.__add(entry[:4], entry[4])
+        return n_lines
+
+    def __add(self, event, is_hit):
+        self.events.append(event)
+        del self.events[:-self.MAX_EVENTS]
+        if is_hit is not None:
+            self.switches += 1
+            if is_hit:
+                self.hits += 1
+
+    def __compact(self):
+        '''
+        Rewrites the log as the hit counts so far and the events still kept, the kept events' hits are already in the counts
+        '''
+        tmp_path = self.history_path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            f.write(repr({'hits': self.hits, 'switches': self.switches}) + '\n')
+            for event in self.events:
+                f.write(repr(event + (None,)) + '\n')
+        os.replace(tmp_path, self.history_path)
+
+    def record(self, from_q_num, action, level, to_q_num, is_hit=None):
+        '''
+        is_hit is None if preloading is off, then the switch doesn't count towards the hit rate
+        Only the new event is appended to the log, so a switch costs the same however long the history is
+        '''
+        event = (from_q_num, action, level, to_q_num)
+        with self.lock:
+            self.__add(event, is_hit)
+            if is_hit is not None:
+                self.session_switches += 1
+                if is_hit:
+                    self.session_hits += 1
+            with open(self.history_path, 'a') as f:
+                f.write(repr(event + (is_hit,)) + '\n')
+
+    def is_predictive(self):
+        return len(self.events) >= self.MIN_EVENTS_TO_PREDICT
+
+    def get_action_weights(self):
+        '''
+        Probability of each action, (NEXT, None), (NEXT_LEVEL, level), or (JUMP, None), with newer events weighted more
+        '''
+        with self.lock:
+            events = list(self.events)
+        #one made up next event, so there's always somewhere to go
+        weights = {(NEXT, None): 1.0}
+        weight = 1.0
+        for _, action, level, _ in reversed(events):
+            key = (action, level if action == NEXT_LEVEL else None)
+            weights[key] = weights.get(key, 0) + weight
+            weight *= self.DECAY
+        total = sum(weights.values())
+        return {key: value / total for key, value in weights.items()}
+
+    def get_jump_targets(self, q_num):
+        '''
+        How often each question was jumped to from q_num, newest jump weighted most
+        '''
+        with self.lock:
+            events = list(self.events)
+        targets = {}
+        weight = 1.0
+        for from_q_num, action, _, to_q_num in reversed(events):
+            if action == JUMP and from_q_num == q_num:
+                targets[to_q_num] = targets.get(to_q_num, 0) + weight
+            weight *= self.DECAY
+        return targets
+
+    def rank_questions(self, question_nodes, n):
+        '''
+        The n questions most likely to be selected within the next few moves from the current question, most likely first.
+        Each path of next and next by level moves is scored by multiplying the probability of each move, a question's score is its best path.
+        Questions jumped to from the current question before are scored by the jump probability, split by how often each was the target
+        '''
+        weights = self.get_action_weights()
+        moves = [(key, p) for key, p in weights.items() if key[0] != JUMP]
+        curr = question_nodes.get_current()
+        scores = {}
+        frontier = [(1.0, curr)]
+        for _ in range(n):
+            reached = {}
+            for p_path, node in frontier:
+                for (action, level), p_move in moves:
+                    next_node = question_nodes.get_next_node(node, level)
+                    score = p_path * p_move
+                    if score > reached.get(next_node.number, (0, None))[0]:
+                        reached[next_node.number] = (score, next_node)
+            for q_num, (score, _) in reached.items():
+                scores[q_num] = max(scores.get(q_num, 0), score)
+            #only the best n paths can still lead to a top n question
+            frontier = sorted(reached.values(), key=lambda item: -item[0])[:n]
+
+        jump_targets = self.get_jump_targets(curr.number)
+        total_jumps = sum(jump_targets.values())
+        for q_num, count in jump_targets.items():
+            if question_nodes.is_q_exist(q_num):
+                scores[q_num] = max(scores.get(q_num, 0), weights.get((JUMP, None), 0) * count / total_jumps)
+
+        scores.pop(curr.number, None)
+        return sorted(scores, key=lambda q_num: (-scores[q_num], q_num))[:n]
+
+    def get_hit_rate_msg(self):
+        if not self.session_switches:
+            return None
+        return 'Preload hit rate: {hits}/{switches} question switches this session landed on a db-fiddle that was already built ({rate:.0%}), {all_rate:.0%} overall'.format(
+            hits=self.session_hits, switches=self.session_switches, rate=self.session_hits / self.session_switches, all_rate=self.hits / self.switches)
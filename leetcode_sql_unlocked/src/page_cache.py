@@ -0,0 +1,126 @@
+import os
+import re
+import gzip
+from datetime import datetime
+from threading import Lock
+
+from .leetcode_page import get_content_hash
+
+class PageCache:
+    '''
+    On-disk snapshots of leetcode.jp problem pages, so a question's page only has to be downloaded once.
+    Each snapshot is gzipped html, named by question number, fetch time, and a hash of the html, i.e. 176-20201005143000-3f2a9c1b7d4e5a60.html.gz
+
+    Snapshots older than days_till_stale are ignored and re-downloaded, the same rule used for the question elements log.
+    The cache is kept under max_bytes by evicting the least recently used snapshots. A snapshot's mtime is touched every time it's read, so the oldest mtime is the least recently used.
+    '''
+    __NAME_PATTERN = re.compile(r'^(\d+)-(\d{14})-([0-9a-f]+)\.html\.gz$')
+    __TIME_FORMAT = '%Y%m%d%H%M%S'
+
+    def __init__(self, cache_dir, max_bytes=20 * 1024 * 1024, days_till_stale=13):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.days_till_stale = days_till_stale
+        self.lock = Lock()
+        if not os.path.exists(cache_dir):
+            os.makedirs(cache_dir)
+
+    def __snapshots(self):
+        '''
+        Returns (q_num, fetch time, content hash, path) of every snapshot in the cache dir
+        '''
+        snapshots = []
+        for f in os.listdir(self.cache_dir):
+            match = self.__NAME_PATTERN.match(f)
+            if match:
+                q_num, fetched, content_hash = match.groups()
+                fetched = datetime.strptime(fetched, self.__TIME_FORMAT)
+                snapshots.append((int(q_num), fetched, content_hash, os.path.join(self.cache_dir, f)))
+        return snapshots
+
+    def __question_snapshots(self, q_num):
+        return sorted((s for s in self.__snapshots() if s[0] == q_num), key=lambda s: s[1])
+
+    def is_stale(self, fetched):
+        return (datetime.now() - fetched).days > self.days_till_stale
+
+    def get_snapshot(self, q_num):
+        '''
+        Returns (html, content hash) of the newest fresh snapshot, or None if the page needs to be downloaded
+        '''
+        with self.lock:
+            snapshots = self.__question_snapshots(q_num)
+            if not snapshots or self.is_stale(snapshots[-1][1]):
+                return None
+            content_hash, path = snapshots[-1][2], snapshots[-1][3]
+            try:
+                with gzip.open(path, 'rt', encoding='utf-8') as f:
+                    html = f.read()
+            #corrupt or half written snapshot
+            except (OSError, EOFError):
+                self.__remove(path)
+                return None
+            #mark as recently used
+            os.utime(path, None)
+            return html, content_hash
+
+    def get(self, q_num):
+        snapshot = self.get_snapshot(q_num)
+        return snapshot[0] if snapshot is not None else None
+
+    def __contains__(self, q_num):
+        with self.lock:
+            snapshots = self.__question_snapshots(q_num)
+            return bool(snapshots) and not self.is_stale(snapshots[-1][1])
+
+    def put(self, q_num, html):
+        '''
+        Saves a new snapshot of the question's page, replacing any older snapshots of the same question
+        Returns the content hash of the html
+        '''
+        content_hash = get_content_hash(html)
+        fetched = datetime.now().strftime(self.__TIME_FORMAT)
+        path = os.path.join(self.cache_dir, '{q_num}-{fetched}-{content_hash}.html.gz'.format(q_num=q_num, fetched=fetched, content_hash=content_hash))
+        with self.lock:
+            old_snapshots = self.__question_snapshots(q_num)
+            #write to a temp file first so a reader never sees a half written snapshot
+            tmp_path = path + '.tmp'
+            with gzip.open(tmp_path, 'wt', encoding='utf-8') as f:
+                f.write(html)
+            os.replace(tmp_path, path)
+            for snapshot in old_snapshots:
+                if snapshot[3] != path:
+                    self.__remove(snapshot[3])
+            self.__evict(keep=path)
+        return content_hash
+
+    def __evict(self, keep=None):
+        '''
+        Removes least recently used snapshots until the cache fits in max_bytes
+        '''
+        entries = []
+        for snapshot in self.__snapshots():
+            path = snapshot[3]
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        total = sum(entry[1] for entry in entries)
+        for mtime, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            if path == keep:
+                continue
+            self.__remove(path)
+            total -= size
+
+    def evict(self):
+        with self.lock:
+            self.__evict()
+
+    def __remove(self, path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
@@ -0,0 +1,70 @@
+import os
+import ast
+import pprint
+from threading import Lock
+
+from .table_parser import TableParser, PARSER_VERSION
+
+def parse_tables(q_num, page, parse_cache=None):
+    '''
+    Returns the table names and tables text of the page
+    The parse cache is consulted first, the page is only parsed if it's new or the parser has changed since it was last parsed
+    '''
+    if parse_cache is None:
+        return TableParser(page).parse_leetcode_tables()
+
+    content_hash = page.get_content_hash()
+    cached = parse_cache.get(q_num, content_hash)
+    if cached is not None:
+        return cached
+    table_parser = TableParser(page)
+    table_names, tables_text = table_parser.parse_leetcode_tables()
+    parse_cache.put(q_num, content_hash, table_parser.table_types, table_names, tables_text)
+    return table_names, tables_text
+
+class ParseCache:
+    '''
+    Persists the output of TableParser for each question, so a page that has already been parsed doesn't need to be parsed again.
+    Each entry records the content hash of the page it was parsed from, the parser version, and the border style of each table. If the page or the parser version changes, the entry is ignored and the page is re-parsed.
+    The log is shared by the main and preload web handlers, so access is locked.
+    '''
+
+    def __init__(self, q_parse_path):
+        self.q_parse_path = q_parse_path
+        self.lock = Lock()
+        self.q_parse = self.__read_dict(q_parse_path)
+
+    def __read_dict(self, path):
+        if os.path.exists(path):
+            try:
+                with open(path, "r") as f:
+                    return ast.literal_eval(f.read())
+            #a corrupt parse log is just rebuilt
+            except (SyntaxError, ValueError):
+                pass
+        return {}
+
+    def __write_dict(self):
+        with open(self.q_parse_path, 'w') as f:
+            pprint.pprint(self.q_parse, f)
+
+    def get(self, q_num, content_hash):
+        '''
+        Returns (table names, tables text) if the question was parsed from the same page with the current parser version, else None
+        '''
+        with self.lock:
+            entry = self.q_parse.get(q_num)
+            if entry is None or entry['hash'] != content_hash or entry['version'] != PARSER_VERSION:
+                return None
+            return list(entry['names']), list(entry['tables'])
+
+    def put(self, q_num, content_hash, table_types, table_names, tables_text):
+        with self.lock:
+            self.q_parse[q_num] = {
+                'hash': content_hash,
+                'version': PARSER_VERSION,
+                'table_types': list(table_types),
+                'names': list(table_names),
+                'tables': list(tables_text)
+            }
+            self.__write_dict()
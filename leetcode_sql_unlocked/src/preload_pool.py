@@ -0,0 +1,134 @@
+import itertools
+import traceback
+from queue import PriorityQueue, Empty
+from threading import Event, Lock
+
+from .exc_thread import ExcThread
+
+class PreloadPool:
+    '''
+    A bounded pool of headless web handlers that pre-load questions in parallel.
+    Each worker thread owns one web handler (one headless chrome), and takes question numbers off a shared priority queue, most likely to be selected next first.
+    A question is never queued twice, whether it's already waiting in the queue or being worked on, and is skipped if is_done(q_num) says its db-fiddle already exists.
+    Cancelling sets stop_event, which the web handlers check between WebDriver steps, so in-progress questions stop within one step instead of running to the end.
+    '''
+
+    def __init__(self, create_web_handler, size, preload_question, is_done):
+        '''
+        create_web_handler(): returns a new headless WebHandler, called once in each worker
+        preload_question(web_handler, q_num): builds the db-fiddle for q_num, and cleans up after itself if cancelled
+        is_done(q_num): True if the question no longer needs to be pre-loaded
+        '''
+        self.create_web_handler = create_web_handler
+        self.size = max(1, size)
+        self.preload_question = preload_question
+        self.is_done = is_done
+
+        #(priority, order queued, q_num), lower priority goes first
+        self.queue = PriorityQueue()
+        self.counter = itertools.count()
+        #set to drop all queued questions and cancel the ones in progress
+        self.stop_event = Event()
+        self.lock = Lock()
+        #questions waiting in the queue or being worked on
+        self.pending = set()
+        self.web_handlers = []
+        self.workers = []
+        #set by the dispatcher thread in Leetcode.preload()
+        self.thread = None
+
+    def start(self):
+        for i in range(self.size):
+            worker = ExcThread(target=self.__work, name='preload-worker-{}'.format(i), daemon=True)
+            worker.start()
+            self.workers.append(worker)
+
+    def __work(self):
+        try:
+            web_handler = self.create_web_handler()
+        #the worker keeps taking questions off the queue without building them, so wait() never hangs
+        except Exception:
+            web_handler = None
+            print('\nCould not start a headless browser for pre-loading')
+        if web_handler is not None:
+            with self.lock:
+                self.web_handlers.append(web_handler)
+        while True:
+            _, _, q_num = self.queue.get()
+            #shutdown sentinel
+            if q_num is None:
+                self.queue.task_done()
+                return
+            try:
+                if web_handler is not None and not self.stop_event.is_set() and not self.is_done(q_num):
+                    self.preload_question(web_handler, q_num)
+            #one failed question should not take down the worker
+            except Exception:
+                print('\nCould not pre-load question {}'.format(q_num))
+                traceback.print_exc()
+            finally:
+                with self.lock:
+                    self.pending.discard(q_num)
+                self.queue.task_done()
+
+    def submit(self, q_nums):
+        '''
+        Queues the questions that aren't already queued or done, returns the questions queued
+        q_nums is ordered by priority, the first question is built first
+        '''
+        if not self.workers:
+            self.start()
+        queued = []
+        with self.lock:
+            for q_num in q_nums:
+                if q_num in self.pending or self.is_done(q_num):
+                    continue
+                self.pending.add(q_num)
+                queued.append(q_num)
+        for priority, q_num in enumerate(queued):
+            self.queue.put((priority, next(self.counter), q_num))
+        return queued
+
+    def wait(self):
+        '''
+        Blocks until every queued question is done or dropped
+        '''
+        self.queue.join()
+
+    def cancel(self):
+        '''
+        Drops every question still waiting in the queue, and cancels the questions being built at their next WebDriver step.
+        A question is only cancelled before its db-fiddle is saved, so no half made db-fiddle is left behind
+        '''
+        self.stop_event.set()
+        while True:
+            try:
+                _, _, q_num = self.queue.get_nowait()
+            except Empty:
+                break
+            if q_num is not None:
+                with self.lock:
+                    self.pending.discard(q_num)
+            self.queue.task_done()
+
+    def resume(self):
+        self.stop_event.clear()
+
+    def shutdown(self):
+        '''
+        Drops queued questions, cancels the ones in progress, and closes every headless browser
+        '''
+        self.cancel()
+        #sentinels go after any question
+        for _ in self.workers:
+            self.queue.put((float('inf'), next(self.counter), None))
+        for worker in self.workers:
+            try:
+                worker.join()
+            except Exception:
+                pass
+        self.workers = []
+        with self.lock:
+            web_handlers, self.web_handlers = self.web_handlers, []
+        for web_handler in web_handlers:
+            web_handler.close_all()
@@ -0,0 +1,148 @@
+import os
+import shutil
+from threading import Lock
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+    import msvcrt
+
+#where chrome keeps downloaded scripts, pages, and compiled code, relative to the user-data-dir. Emptied first when over the size cap, the cookies and settings are kept
+CACHE_DIRS = (os.path.join('Default', 'Cache'), os.path.join('Default', 'Code Cache'), os.path.join('Default', 'GPUCache'), os.path.join('Default', 'Service Worker', 'CacheStorage'), 'ShaderCache', 'GrShaderCache')
+
+def try_lock(f):
+    '''
+    Non-blocking exclusive lock on an open file, released by the OS if the process dies, so a crash never leaves a profile locked
+    '''
+    try:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        else:
+            msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+    except OSError:
+        return False
+    return True
+
+def get_dir_size(path):
+    total = 0
+    for root, _, files in os.walk(path):
+        for f in files:
+            try:
+                total += os.path.getsize(os.path.join(root, f))
+            #chrome removes cache files while running
+            except OSError:
+                pass
+    return total
+
+class Profile:
+    def __init__(self, name, path, lock_file):
+        self.name = name
+        self.path = path
+        self.lock_file = lock_file
+
+class ChromeProfiles:
+    '''
+    Persistent chrome user-data-dirs, so db-fiddle's js bundles, leetcode.jp and GitHub assets are in the browser's http cache from one session to the next.
+    Chrome can't share a user-data-dir between two running browsers, so every driver gets a profile of its own, i.e. main-0 for the user's browser, preload-0 and preload-1 for the preload drivers.
+    Each profile has a lock file next to it, held for as long as its driver runs. That covers other instances of this program too, like a daemon and a prompt running at the same time.
+
+    The profiles are kept under max_bytes when a driver is done with its profile. The caches of the least recently used profiles are emptied first, then whole profiles are removed. A profile's lock file is touched every time it's used, so the oldest mtime is the least recently used.
+    '''
+    #profiles of one kind, past this many every driver is already running, so the extra driver gets a throwaway profile
+    MAX_PROFILES = 8
+    __LOCK_SUFFIX = '.lock'
+
+    def __init__(self, profiles_dir, max_bytes=500 * 1024 * 1024):
+        self.profiles_dir = profiles_dir
+        self.max_bytes = max_bytes
+        self.lock = Lock()
+        if not os.path.exists(profiles_dir):
+            os.makedirs(profiles_dir)
+
+    def get_disk_cache_bytes(self):
+        '''
+        Chrome's --disk-cache-size for each profile, so a single profile can't blow through the cap between clean ups
+        '''
+        return self.max_bytes // 4
+
+    def acquire(self, kind='main'):
+        '''
+        Returns the first profile of the kind that no running driver is using, or None if they all are
+        '''
+        with self.lock:
+            for i in range(self.MAX_PROFILES):
+                name = '{kind}-{i}'.format(kind=kind, i=i)
+                lock_path = os.path.join(self.profiles_dir, name + self.__LOCK_SUFFIX)
+                lock_file = open(lock_path, 'a')
+                if not try_lock(lock_file):
+                    lock_file.close()
+                    continue
+                #mark as recently used
+                os.utime(lock_path, None)
+                path = os.path.join(self.profiles_dir, name)
+                if not os.path.exists(path):
+                    os.makedirs(path)
+                return Profile(name, os.path.abspath(path), lock_file)
+        return None
+
+    def release(self, profile):
+        '''
+        Called once the profile's driver has quit
+        '''
+        if profile is None:
+            return
+        with self.lock:
+            os.utime(profile.lock_file.name, None)
+            profile.lock_file.close()
+        self.cleanup()
+
+    def __profiles(self):
+        '''
+        Returns (last used, path, lock file) of every profile that isn't in use, least recently used first, and the total size of all profiles
+        The lock files stay locked so no driver can start on a profile while it's cleaned up, close them when done
+        '''
+        profiles = []
+        total = 0
+        for name in os.listdir(self.profiles_dir):
+            path = os.path.join(self.profiles_dir, name)
+            if not os.path.isdir(path):
+                continue
+            total += get_dir_size(path)
+            lock_path = path + self.__LOCK_SUFFIX
+            lock_file = open(lock_path, 'a')
+            if not try_lock(lock_file):
+                lock_file.close()
+                continue
+            profiles.append((os.path.getmtime(lock_path), path, lock_file))
+        return sorted(profiles, key=lambda p: p[:2]), total
+
+    def cleanup(self):
+        '''
+        Empties the caches of the least recently used profiles, and then removes whole profiles, until the profiles fit in max_bytes. Profiles in use are never touched
+        Returns the total size of the profiles afterwards
+        '''
+        with self.lock:
+            profiles, total = self.__profiles()
+            try:
+                return self.__trim(profiles, total)
+            finally:
+                for _, _, lock_file in profiles:
+                    lock_file.close()
+
+    def __trim(self, profiles, total):
+        for _, path, _ in profiles:
+            if total <= self.max_bytes:
+                return total
+            for cache_dir in CACHE_DIRS:
+                cache_path = os.path.join(path, cache_dir)
+                if os.path.isdir(cache_path):
+                    total -= get_dir_size(cache_path)
+                    shutil.rmtree(cache_path, ignore_errors=True)
+        for _, path, _ in profiles:
+            if total <= self.max_bytes:
+                return total
+            total -= get_dir_size(path)
+            #the lock file is kept, another process may be about to open it
+            shutil.rmtree(path, ignore_errors=True)
+        return total
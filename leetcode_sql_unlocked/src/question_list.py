@@ -0,0 +1,40 @@
+'''
+The leetcode.com database problem list, read from the json the problem set page itself loads, instead of scraped from the rendered table.
+'''
+import json
+
+from .leetcode_page import fetch_html
+
+LEETCODE_URL = 'https://leetcode.com'
+#difficulty level in the problem list json
+LEVELS = {1: 'easy', 2: 'medium', 3: 'hard'}
+
+def get_question_list_url(base_url=LEETCODE_URL):
+    return '{base_url}/api/problems/database/'.format(base_url=base_url)
+
+def parse_question_list(question_list):
+    '''
+    Turns the problem list json into question elements, {q_num: {'level': level, 'name': '{num}: {title}, {level}'}} ordered by question number
+    Records missing a number, title or known level are skipped
+    '''
+    question_elements = {}
+    for pair in question_list.get('stat_status_pairs', []):
+        try:
+            stat = pair['stat']
+            q_num = int(stat['frontend_question_id'])
+            title = ' '.join(stat['question__title'].split())
+            level = LEVELS[pair['difficulty']['level']]
+        except (KeyError, TypeError, ValueError):
+            continue
+        question_elements[q_num] = {'level': level, 'name': '{q_num}: {title}, {level}'.format(q_num=q_num, title=title, level=level)}
+    return {q_num: question_elements[q_num] for q_num in sorted(question_elements)}
+
+def fetch_question_elements(base_url=LEETCODE_URL, timeout=10):
+    '''
+    One http request for the whole problem list
+    Raises OSError or HTTPException if the request fails, ValueError if the response isn't the problem list json
+    '''
+    question_elements = parse_question_list(json.loads(fetch_html(get_question_list_url(base_url), timeout)))
+    if not question_elements:
+        raise ValueError('No questions found in the problem list')
+    return question_elements
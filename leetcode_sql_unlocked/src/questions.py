@@ -1,20 +1,28 @@
 import pprint
 import time
+from array import array
+from bisect import bisect_left
+from itertools import accumulate
 
 class QuestionNode:
     '''
     Each question node has a number, name, and level attribute and a pointer to the next node, as well as pointer to the next node of the same level
+    index is the node's position in QuestionNodes, ordered by question number
     '''
-    def __init__(self, number, name, level, next=None, next_same_lvl=None):
+    __slots__ = ('number', 'name', 'level', 'index', 'next', 'next_same_lvl')
+
+    def __init__(self, number, name, level, next=None, next_same_lvl=None, index=None):
         self.number = number
         self.name = name
         self.level = level
+        self.index = index
         self.next = next
         self.next_same_lvl = next_same_lvl
 
 class QuestionNodes:
     '''
-    The questions are represented as a linked list type structure. The current node is saved in a log file, so the next question can be easily accessed. However, the user also has an option of selecting by question number, meaning there's potential of jumping many nodes across, so each question node can also be accessed by its number key.
+    The questions are represented as a circular list ordered by question number. The current node is saved in a log file, so the next question can be easily accessed. However, the user also has an option of selecting by question number, meaning there's potential of jumping many nodes across, so each question node can also be accessed by its number key.
+    Every level also has its own list of nodes, and a count for each node index of how many nodes of that level come at or before it. That count is the position of the next node of that level in the level's list, so next by level is a lookup instead of a walk, and the next n nodes are slices.
     '''
     DEFAULT_NUM_TO_DISPLAY = 15
 
@@ -22,63 +30,88 @@ class QuestionNodes:
         self.__question_nodes = {}
         self.head = None
         self.tail = None
+        #every node, by index, and its question number
+        self.__nodes = []
+        self.__numbers = []
+        #level: the nodes of that level, by index
+        self.__level_nodes = {}
+        #level: for each node index, the number of nodes of that level at or before it
+        self.__level_counts = {}
         self.__current = self.create_q_nodes(question_elements, curr_log_num)
 
     def create_q_nodes(self, question_elements, curr_log_num):
-        head_easy = None
-        head_med = None
-        head_hard = None
-        prev_q = None
-        prev_q_easy = None
-        prev_q_med = None
-        prev_q_hard = None
-
-        for q_num in question_elements.keys():
-            name = question_elements[q_num]['name']
-            level = question_elements[q_num]['level']
-            q = QuestionNode(q_num, name, level)
-            self.__question_nodes[q_num] = q
-            if q_num == curr_log_num:
-                curr = q
-
-            if not self.head:
-                self.head = q
-
-            if prev_q:
-                prev_q.next = q
-            prev_q = q
-
-            if level == 'easy':
-                if prev_q_easy:
-                    prev_q_easy.next_same_lvl = q
-                else:
-                    head_easy = q
-                prev_q_easy = q
-
-            elif level == 'medium':
-                if prev_q_med:
-                    prev_q_med.next_same_lvl = q
-                else:
-                    head_med = q
-                prev_q_med = q
-
-            else:
-                if prev_q_hard:
-                    prev_q_hard.next_same_lvl = q
-                else:
-                    head_hard = q
-                prev_q_hard = q
-
-        self.tail = q
-        q.next = self.head
-        prev_q_easy.next_same_lvl = head_easy
-        prev_q_med.next_same_lvl = head_med
-        prev_q_hard.next_same_lvl = head_hard
+        self.__nodes = [QuestionNode(q_num, question_elements[q_num]['name'], question_elements[q_num]['level'], index=i) for i, q_num in enumerate(sorted(question_elements.keys()))]
+        self.__question_nodes = {q.number: q for q in self.__nodes}
+        self.__numbers = [q.number for q in self.__nodes]
+        self.__level_nodes = {}
+        for q in self.__nodes:
+            self.__level_nodes.setdefault(q.level, []).append(q)
+        self.__level_counts = {level: array('l', accumulate(q.level == level for q in self.__nodes)) for level in self.__level_nodes}
+
+        self.head = self.__nodes[0]
+        self.tail = self.__nodes[-1]
+        for i, q in enumerate(self.__nodes):
+            q.next = self.__nodes[(i + 1) % len(self.__nodes)]
+        for level_nodes in self.__level_nodes.values():
+            for i, q in enumerate(level_nodes):
+                q.next_same_lvl = level_nodes[(i + 1) % len(level_nodes)]
 
         #if for some reason, the current question in the log is an invalid question #, reset question to #176
         if not self.is_q_exist(curr_log_num):
-            curr = self.head.next
-        return curr
+            return self.head.next
+        return self.__question_nodes[curr_log_num]
+
+    def update_questions(self, question_elements):
+        '''
+        Adds new questions and renames or re-levels existing ones in place, with the same elements format as create_q_nodes.
+        Existing node objects, including the current one, are kept. Only the indices after the first change are recomputed, and only the changed levels are relinked
+        '''
+        start = len(self.__nodes)
+        changed_levels = set()
+        for q_num in sorted(question_elements.keys()):
+            name, level = question_elements[q_num]['name'], question_elements[q_num]['level']
+            q = self.__question_nodes.get(q_num)
+            if q is None:
+                i = bisect_left(self.__numbers, q_num)
+                q = QuestionNode(q_num, name, level, index=i)
+                self.__nodes.insert(i, q)
+                self.__numbers.insert(i, q_num)
+                self.__question_nodes[q_num] = q
+                start = min(start, i)
+                changed_levels.add(level)
+                continue
+            q.name = name
+            if q.level != level:
+                changed_levels.update((q.level, level))
+                q.level = level
+                start = min(start, q.index)
+        if changed_levels:
+            self.__reindex(start, changed_levels)
+
+    def __reindex(self, start, changed_levels):
+        nodes = self.__nodes
+        for i in range(start, len(nodes)):
+            nodes[i].index = i
+        for i in range(max(start - 1, 0), len(nodes)):
+            nodes[i].next = nodes[(i + 1) % len(nodes)]
+        self.head = nodes[0]
+        self.tail = nodes[-1]
+
+        for level in changed_levels:
+            level_nodes = [q for q in nodes if q.level == level]
+            if not level_nodes:
+                self.__level_nodes.pop(level, None)
+                self.__level_counts.pop(level, None)
+                continue
+            self.__level_nodes[level] = level_nodes
+            for i, q in enumerate(level_nodes):
+                q.next_same_lvl = level_nodes[(i + 1) % len(level_nodes)]
+        #counts before start are unchanged, a new level has none of its nodes before start
+        for level in self.__level_nodes:
+            counts = self.__level_counts.setdefault(level, array('l', [0]) * start)
+            del counts[start:]
+            base = counts[start - 1] if start > 0 else 0
+            counts.extend(base + count for count in accumulate(q.level == level for q in nodes[start:]))
 
     def print_q_nodes(self):
         curr = self.__current
@@ -97,11 +130,8 @@ class QuestionNodes:
             return node.next
         elif node.level == level:
             return node.next_same_lvl
-        else:
-            curr = node.next
-            while curr.level != level:
-                curr = curr.next
-            return curr
+        level_nodes = self.__level_nodes[level]
+        return level_nodes[self.__level_counts[level][node.index] % len(level_nodes)]
 
     def select_next_question(self, level=None):
         '''
@@ -120,24 +150,24 @@ class QuestionNodes:
         self.__current = self.__question_nodes[number]
 
     def get_next_n_nodes(self, n, level=None):
-        nodes = []
-        curr = self.__current
-        head = None
-        for i in range(n):
-            curr = self.get_next_node(curr, level)
-            #repeating questions
-            if head is not None and head.number == curr.number:
-                break
-            nodes.append(curr)
-            if i == 0:
-                head = curr
-        return nodes
-
-    def display_questions(self, level=None , n=None):
+        '''
+        The next n nodes after current, of any level or of the given level. Stops before a node would repeat, so the current node is last if n wraps all the way around
+        '''
+        if level is None:
+            nodes, start = self.__nodes, self.__current.index + 1
+        else:
+            nodes, start = self.__level_nodes[level], self.__level_counts[level][self.__current.index]
+        n = min(n, len(nodes))
+        start %= len(nodes)
+        next_nodes = nodes[start:start + n]
+        return next_nodes + nodes[:n - len(next_nodes)]
+
+    def display_questions(self, level=None , n=None, is_pause=True):
         if n is None:
             n = self.DEFAULT_NUM_TO_DISPLAY
         q_names = [node.name for node in self.get_next_n_nodes(n, level)]
         print('\nDisplaying next {n}{level} questions:\n'.format(n=n, level= ' '+ level if level is not None else ''))
         pprint.pprint(q_names)
-        time.sleep(2)
+        if is_pause:
+            time.sleep(2)
         return q_names
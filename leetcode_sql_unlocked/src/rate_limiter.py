@@ -0,0 +1,118 @@
+'''
+Token bucket rate limiting per host, shared by every web handler so the main and preload browsers together stay polite to each website.
+'''
+import time
+from threading import Lock
+from urllib.parse import urlparse
+
+#host: (requests per minute, burst)
+DEFAULT_RATE_LIMITS = {
+    'leetcode.jp': (20, 10),
+    'db-fiddle.com': (20, 10),
+    'github.com': (10, 3),
+}
+
+class TokenBucket:
+    '''
+    Holds up to burst tokens, refilled at rate tokens per second.
+    A request that finds the bucket empty reserves the next token anyway, and is told how long to wait for it, so waiting requests are served in order
+    '''
+    def __init__(self, rate, burst, clock=time.monotonic):
+        self.rate = rate
+        self.burst = max(1, burst)
+        self.clock = clock
+        self.tokens = self.burst
+        self.updated = clock()
+        self.lock = Lock()
+
+    def reserve(self):
+        '''
+        Takes a token, returns the seconds to wait before using it
+        '''
+        with self.lock:
+            now = self.clock()
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= 1
+            if self.tokens >= 0:
+                return 0
+            return -self.tokens / self.rate
+
+    def refund(self):
+        '''
+        Gives back a reserved token whose request was skipped, so the requests behind it don't wait for it
+        '''
+        with self.lock:
+            now = self.clock()
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate + 1)
+            self.updated = now
+
+    def try_take(self):
+        '''
+        Takes a token only if one is available now, for requests that are skipped rather than delayed
+        '''
+        with self.lock:
+            now = self.clock()
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens < 1:
+                return False
+            self.tokens -= 1
+            return True
+
+class RateLimiter:
+    '''
+    One token bucket per rate limited host, hosts without a limit are never delayed.
+    Subdomains share their host's bucket, i.e. www.db-fiddle.com uses the db-fiddle.com bucket
+    '''
+    def __init__(self, rate_limits=None, clock=time.monotonic):
+        if rate_limits is None:
+            rate_limits = DEFAULT_RATE_LIMITS
+        self.buckets = {host: TokenBucket(per_minute / 60, burst, clock) for host, (per_minute, burst) in rate_limits.items()}
+
+    def get_bucket(self, url):
+        host = urlparse(url).hostname or ''
+        for limited_host, bucket in self.buckets.items():
+            if host == limited_host or host.endswith('.' + limited_host):
+                return bucket
+        return None
+
+    def try_request(self, url):
+        '''
+        True if a request to url is allowed right now, without waiting
+        '''
+        bucket = self.get_bucket(url)
+        return bucket is None or bucket.try_take()
+
+    def try_requests(self, urls):
+        '''
+        Like try_request(), for requests that are only made together. Either every url gets its token, or none is taken
+        '''
+        taken = []
+        for url in urls:
+            bucket = self.get_bucket(url)
+            if bucket is None:
+                continue
+            if not bucket.try_take():
+                for taken_bucket in taken:
+                    taken_bucket.refund()
+                return False
+            taken.append(bucket)
+        return True
+
+    def wait(self, url, stop_event=None):
+        '''
+        Blocks until a request to url is allowed, returns the seconds waited
+        If stop_event is given, waiting ends early once it is set, the caller should then skip the request. Its token is given back
+        '''
+        bucket = self.get_bucket(url)
+        if bucket is None:
+            return 0
+        delay = bucket.reserve()
+        if delay > 0:
+            if stop_event is not None:
+                if stop_event.wait(delay):
+                    bucket.refund()
+            else:
+                time.sleep(delay)
+        return delay
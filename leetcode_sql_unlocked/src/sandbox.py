@@ -0,0 +1,105 @@
+'''
+A local sqlite3 database of a question's parsed tables, with a small console to run queries against it without a browser.
+'''
+import os
+import time
+import sqlite3
+
+from .schema import get_table_schemas, quote_identifier
+
+class SqliteSandbox:
+    '''
+    Materializes the tables parsed from a question into sqlite3, either in memory or in a file per question
+    '''
+    __MAX_ROWS_DISPLAYED = 100
+
+    def __init__(self, table_names, tables_text, db_path=':memory:'):
+        self.db_path = db_path
+        self.schemas = get_table_schemas(table_names, tables_text)
+        self.conn = sqlite3.connect(db_path)
+        self.load()
+
+    def load(self):
+        '''
+        (Re)creates every table and bulk inserts its rows in one transaction
+        '''
+        with self.conn:
+            for schema in self.schemas:
+                self.conn.execute('DROP TABLE IF EXISTS {}'.format(quote_identifier(schema.name)))
+                self.conn.execute(schema.create_table_sql())
+                if schema.rows:
+                    placeholders = ', '.join('?' * len(schema.columns))
+                    self.conn.executemany('INSERT INTO {} VALUES ({})'.format(quote_identifier(schema.name), placeholders), schema.rows)
+
+    def close(self):
+        self.conn.close()
+
+    def get_table_names(self):
+        return [schema.name for schema in self.schemas]
+
+    def get_schema_sql(self):
+        return '\n\n'.join(schema.create_table_sql() for schema in self.schemas)
+
+    def execute(self, sql):
+        '''
+        Runs sql and returns (column names, rows), column names is empty for statements that don't return rows
+        '''
+        with self.conn:
+            cursor = self.conn.execute(sql)
+            columns = [col[0] for col in cursor.description] if cursor.description else []
+            return columns, cursor.fetchall()
+
+    @staticmethod
+    def format_rows(columns, rows):
+        '''
+        Formats the query result as a +--- table, the same style as the leetcode tables
+        '''
+        cells = [['NULL' if value is None else str(value) for value in row] for row in rows]
+        widths = [max([len(col)] + [len(row[i]) for row in cells]) for i, col in enumerate(columns)]
+        border = '+' + '+'.join('-' * (width + 2) for width in widths) + '+'
+        def format_line(values):
+            return '| ' + ' | '.join(value.ljust(width) for value, width in zip(values, widths)) + ' |'
+        return '\n'.join([border, format_line(columns), border] + [format_line(row) for row in cells] + [border])
+
+    def run_console(self, q_name, input_func=input):
+        '''
+        Read-eval-print loop. A statement runs once it ends with a ';'
+        .tables lists the tables, .schema prints the CREATE TABLE statements, .exit returns to the main menu
+        '''
+        print('\nsqlite console for {q_name}\nTables: {tables}\nEnter sql ending with a ";", ".tables", ".schema", or ".exit" to go back'.format(q_name=q_name, tables=', '.join(self.get_table_names())))
+        statement = ''
+        while True:
+            try:
+                line = input_func('sqlite> ' if not statement else '   ...> ')
+            except EOFError:
+                break
+            if not statement and line.strip().lower() in ('.exit', '.quit', 'exit', 'quit'):
+                break
+            elif not statement and line.strip().lower() == '.tables':
+                print(' '.join(self.get_table_names()))
+                continue
+            elif not statement and line.strip().lower() == '.schema':
+                print(self.get_schema_sql())
+                continue
+
+            statement += line + '\n'
+            if not sqlite3.complete_statement(statement):
+                continue
+            start = time.perf_counter()
+            try:
+                columns, rows = self.execute(statement)
+            except sqlite3.Error as e:
+                print('Error: {}'.format(e))
+            else:
+                elapsed = (time.perf_counter() - start) * 1000
+                if columns:
+                    print(self.format_rows(columns, rows[:self.__MAX_ROWS_DISPLAYED]))
+                    if len(rows) > self.__MAX_ROWS_DISPLAYED:
+                        print('... {} more rows'.format(len(rows) - self.__MAX_ROWS_DISPLAYED))
+                print('{n} row(s) in {elapsed:.3f} ms'.format(n=len(rows), elapsed=elapsed))
+            statement = ''
+
+def get_sandbox_path(sandbox_dir, q_num):
+    if not os.path.exists(sandbox_dir):
+        os.makedirs(sandbox_dir)
+    return os.path.join(sandbox_dir, 'q_{}.db'.format(q_num))
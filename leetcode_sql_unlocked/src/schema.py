@@ -0,0 +1,237 @@
+'''
+Turns the ascii tables parsed by TableParser into sql: a CREATE TABLE statement with inferred column types, and a bulk INSERT of the rows.
+Written for sqlite, and for the MySQL 8 and Postgres 12 engines on db-fiddle.
+'''
+import re
+from datetime import date, datetime
+
+#inferred column types
+INTEGER = 'INTEGER'
+#integers past the range of a 4 byte INT
+BIGINT = 'BIGINT'
+DECIMAL = 'DECIMAL'
+DATE = 'DATE'
+DATETIME = 'DATETIME'
+VARCHAR = 'VARCHAR'
+
+SQLITE = 'sqlite'
+MYSQL = 'mysql'
+POSTGRES = 'postgres'
+
+#db-fiddle's db_engine options in config, see setup.py
+DB_ENGINE_DIALECTS = {0: MYSQL, 5: POSTGRES, 11: SQLITE}
+
+#how each inferred type is declared in each dialect, VARCHAR is formatted with the longest value, MySQL's DECIMAL with the precision and scale of the values
+TYPE_NAMES = {
+    SQLITE: {INTEGER: 'INTEGER', BIGINT: 'INTEGER', DECIMAL: 'REAL', DATE: 'DATE', DATETIME: 'DATETIME', VARCHAR: 'VARCHAR({})'},
+    MYSQL: {INTEGER: 'INT', BIGINT: 'BIGINT', DECIMAL: 'DECIMAL({},{})', DATE: 'DATE', DATETIME: 'DATETIME', VARCHAR: 'VARCHAR({})'},
+    POSTGRES: {INTEGER: 'INTEGER', BIGINT: 'BIGINT', DECIMAL: 'NUMERIC', DATE: 'DATE', DATETIME: 'TIMESTAMP', VARCHAR: 'VARCHAR({})'},
+}
+QUOTE_CHARS = {
+    SQLITE: '"',
+    MYSQL: '`',
+    POSTGRES: '"',
+}
+#quoted names are case sensitive in postgres, so plain names are left unquoted for the user's unquoted queries to find them
+PLAIN_IDENTIFIER_PATTERN = re.compile(r'^[A-Za-z_][A-Za-z0-9_]*$')
+POSTGRES_RESERVED = frozenset((
+    'all', 'analyse', 'analyze', 'and', 'any', 'array', 'as', 'asc', 'asymmetric', 'both', 'case', 'cast', 'check', 'collate', 'column',
+    'constraint', 'create', 'current_catalog', 'current_date', 'current_role', 'current_time', 'current_timestamp', 'current_user',
+    'default', 'deferrable', 'desc', 'distinct', 'do', 'else', 'end', 'except', 'false', 'fetch', 'for', 'foreign', 'from', 'grant',
+    'group', 'having', 'in', 'initially', 'intersect', 'into', 'lateral', 'leading', 'limit', 'localtime', 'localtimestamp', 'not',
+    'null', 'offset', 'on', 'only', 'or', 'order', 'placing', 'primary', 'references', 'returning', 'select', 'session_user', 'some',
+    'symmetric', 'table', 'then', 'to', 'trailing', 'true', 'union', 'unique', 'user', 'using', 'variadic', 'when', 'where', 'window', 'with'))
+
+NULL_VALUES = ('null', 'none', '')
+INTEGER_PATTERN = re.compile(r'^[-+]?\d+$')
+DECIMAL_PATTERN = re.compile(r'^[-+]?(\d+\.\d*|\.\d+)$')
+#i.e. zip codes and ids like 007, the zeros would be lost as numbers
+LEADING_ZERO_PATTERN = re.compile(r'^[-+]?0\d')
+INT_MAX = 2 ** 31 - 1
+#TableParser.update_date_format has already converted m/d/Y to Y-m-d, padding is optional
+DATE_PATTERN = re.compile(r'^(\d{4})-(\d{1,2})-(\d{1,2})$')
+DATETIME_PATTERN = re.compile(r'^(\d{4})-(\d{1,2})-(\d{1,2})[ T](\d{1,2}):(\d{2})(:\d{2})?$')
+#border lines, i.e. +----+----+ or |----|----|
+BORDER_PATTERN = re.compile(r'^[\s\+\|\-:]+$')
+
+def is_null(value):
+    return value.lower() in NULL_VALUES
+
+def parse_ascii_table(table_text):
+    '''
+    Returns the column names and rows of a +--- or |--- table
+    The filler column TableParser adds to single column tables for db-fiddle is dropped
+    '''
+    columns, rows = None, []
+    for line in table_text.split('\n'):
+        line = line.strip()
+        if not line or BORDER_PATTERN.match(line):
+            continue
+        cells = [cell.strip() for cell in line.strip('|').split('|')]
+        if columns is None:
+            columns = cells
+        else:
+            #pad or trim rows that don't line up with the header
+            rows.append((cells + [''] * len(columns))[:len(columns)])
+    if columns is None:
+        raise ValueError('No header line found in table')
+
+    if len(columns) == 2 and columns[1] == 'ignore' and all(row[1] == '_' for row in rows):
+        columns = columns[:1]
+        rows = [row[:1] for row in rows]
+    return columns, rows
+
+def is_number(value, pattern):
+    return pattern.match(value) is not None and LEADING_ZERO_PATTERN.match(value) is None
+
+def is_date(value):
+    '''
+    Only real dates, 2020-13-45 matches the pattern but isn't one
+    '''
+    match = DATE_PATTERN.match(value)
+    if match is None:
+        return False
+    try:
+        date(*(int(group) for group in match.groups()))
+    except ValueError:
+        return False
+    return True
+
+def is_datetime(value):
+    match = DATETIME_PATTERN.match(value)
+    if match is None:
+        return False
+    year, month, day, hour, minute, second = match.groups()
+    try:
+        datetime(int(year), int(month), int(day), int(hour), int(minute), int(second[1:]) if second else 0)
+    except ValueError:
+        return False
+    return True
+
+def infer_type(values):
+    '''
+    The narrowest type every non null value fits, columns with only null values are VARCHAR
+    Numbers with leading zeros, and dates that don't exist, are kept as VARCHAR so they reach the database as written
+    '''
+    values = [value for value in values if not is_null(value)]
+    if not values:
+        return VARCHAR
+    if all(is_number(value, INTEGER_PATTERN) for value in values):
+        return BIGINT if any(abs(int(value)) > INT_MAX for value in values) else INTEGER
+    if all(is_date(value) for value in values):
+        return DATE
+    if all(is_datetime(value) for value in values):
+        return DATETIME
+    if all(is_number(value, INTEGER_PATTERN) or is_number(value, DECIMAL_PATTERN) for value in values):
+        return DECIMAL
+    return VARCHAR
+
+def normalize_value(value, col_type):
+    '''
+    Converts a cell to the python value stored in the database, dates are zero padded so they sort correctly as text
+    '''
+    if is_null(value):
+        return None
+    if col_type in (INTEGER, BIGINT):
+        return int(value)
+    if col_type == DECIMAL:
+        return float(value)
+    if col_type == DATE:
+        year, month, day = DATE_PATTERN.match(value).groups()
+        return '{}-{:0>2}-{:0>2}'.format(year, month, day)
+    if col_type == DATETIME:
+        year, month, day, hour, minute, second = DATETIME_PATTERN.match(value).groups()
+        return '{}-{:0>2}-{:0>2} {:0>2}:{}{}'.format(year, month, day, hour, minute, second or ':00')
+    return value
+
+def get_scale(value):
+    '''
+    Digits after the decimal point of a float, as written in the table
+    '''
+    text = repr(value)
+    if 'e' in text:
+        text = '{:f}'.format(value).rstrip('0')
+    return len(text.split('.')[1]) if '.' in text else 0
+
+def quote_identifier(name, dialect=SQLITE):
+    if dialect == POSTGRES and PLAIN_IDENTIFIER_PATTERN.match(name) and name.lower() not in POSTGRES_RESERVED:
+        return name
+    quote = QUOTE_CHARS[dialect]
+    return quote + name.replace(quote, quote * 2) + quote
+
+def sql_literal(value):
+    if value is None:
+        return 'NULL'
+    if isinstance(value, (int, float)):
+        return repr(value)
+    return "'" + value.replace("'", "''") + "'"
+
+
+class TableSchema:
+    '''
+    A parsed table with inferred column types, that can be written out as CREATE TABLE and INSERT sql
+    '''
+    def __init__(self, name, columns, col_types, rows):
+        self.name = name
+        self.columns = columns
+        self.col_types = col_types
+        self.rows = rows
+
+    @classmethod
+    def from_table_text(cls, name, table_text):
+        columns, raw_rows = parse_ascii_table(table_text)
+        col_types = [infer_type([row[i] for row in raw_rows]) for i in range(len(columns))]
+        rows = [tuple(normalize_value(value, col_types[i]) for i, value in enumerate(row)) for row in raw_rows]
+        return cls(name, columns, col_types, rows)
+
+    def get_type_name(self, i, dialect=SQLITE):
+        col_type = self.col_types[i]
+        type_name = TYPE_NAMES[dialect][col_type]
+        if col_type == VARCHAR:
+            longest = max((len(row[i]) for row in self.rows if row[i] is not None), default=0)
+            type_name = type_name.format(max(longest, 1))
+        elif col_type == DECIMAL and dialect == MYSQL:
+            values = [row[i] for row in self.rows if row[i] is not None]
+            scale = max(get_scale(value) for value in values)
+            digits = max(len(str(int(abs(value)))) for value in values)
+            type_name = type_name.format(min(digits + scale, 65), min(scale, 30))
+        return type_name
+
+    def create_table_sql(self, dialect=SQLITE):
+        columns = ',\n'.join('    {} {}'.format(quote_identifier(col, dialect), self.get_type_name(i, dialect)) for i, col in enumerate(self.columns))
+        return 'CREATE TABLE {} (\n{}\n);'.format(quote_identifier(self.name, dialect), columns)
+
+    def insert_sql(self, dialect=SQLITE):
+        '''
+        All rows in one multi-row INSERT, or an empty string if the table has no rows
+        '''
+        if not self.rows:
+            return ''
+        columns = ', '.join(quote_identifier(col, dialect) for col in self.columns)
+        values = ',\n'.join('    (' + ', '.join(sql_literal(value) for value in row) + ')' for row in self.rows)
+        return 'INSERT INTO {} ({}) VALUES\n{};'.format(quote_identifier(self.name, dialect), columns, values)
+
+def get_schema_script(schemas, dialect=SQLITE):
+    '''
+    The CREATE TABLE and INSERT statements of every table in a question, to paste into db-fiddle's schema editor in one go
+    '''
+    statements = []
+    for schema in schemas:
+        statements.append(schema.create_table_sql(dialect))
+        if schema.rows:
+            statements.append(schema.insert_sql(dialect))
+    return '\n\n'.join(statements) + '\n'
+
+def get_table_schemas(table_names, tables_text):
+    '''
+    TableSchema for each table parsed from a question, duplicate table names get a number appended
+    '''
+    schemas, seen = [], set()
+    for name, table_text in zip(table_names, tables_text):
+        unique_name, i = name, 1
+        while unique_name.lower() in seen:
+            unique_name = '{}{}'.format(name, i)
+            i += 1
+        seen.add(unique_name.lower())
+        schemas.append(TableSchema.from_table_text(unique_name, table_text))
+    return schemas
@@ -0,0 +1,284 @@
+import re
+
+#bump whenever a change to TableParser changes its output, so that cached parse results are re-parsed
+PARSER_VERSION = 2
+
+#table border styles
+PLUS = 'plus'
+PIPE = 'pipe'
+
+#a line that is part of a table, either a +--- border or a | row |
+TABLE_LINE_PATTERN = re.compile(r'\+--*.*[\+\|]|\|.*\|')
+DATE_PATTERN = re.compile(r'(\d{1,2})/(\d{1,2})/(\d{4})')
+#valid characters for tables names | valid characters for table row demarcations
+INVALID_HEADER_CHAR_PATTERN = re.compile(r'[^\w\s\|\+\-]+')
+
+def reorder_date(m):
+    '''
+    m/d/Y to Y-m-d, a function is quicker than expanding a group template for every match
+    '''
+    return m.group(3) + '-' + m.group(1) + '-' + m.group(2)
+
+class TableParser:
+    '''
+    Parses the sql tables and table names out of a leetcode.jp problem page.
+    The page can either be a live selenium tab (DriverPage) or raw html fetched over http (HTMLPage), both expose the same <pre>, <code> and paragraph text
+    '''
+
+    def __init__(self, page):
+        self.page = page
+        #border style of each table, set once the page is parsed
+        self.table_types = []
+
+    def parse_table_pre(self):
+        #find sql text tables using pre element tag
+        tables_pre = list(self.page.get_pre_texts())
+
+        #use list() to make a copy so that removal of elements does not effect loop indexing
+        for table_pre in list(tables_pre):
+            #remove data type tables
+            if 'Column Name' in table_pre or 'Column' in table_pre:
+                tables_pre.remove(table_pre)
+        return tables_pre
+
+    def add_filler_col_plus(self, index, line, is_final=False):
+        '''
+        DB-fiddle does not support text to DDL for tables with 1 column. This adds a filler column for +--- tables
+        '''
+        if index == 0:
+            concat = '---------+'
+        elif index == 1:
+            concat = ' ignore  |'
+        elif index == 2:
+            concat = '---------+'
+        elif is_final:
+            concat = '---------+'
+        else:
+            concat = '  _      |'
+        return line + concat
+
+    def add_filler_col_pipe(self, index, line):
+        '''
+        DB-fiddle does not support text to DDL for tables with 1 column. This adds a filler column for |--- tables
+        '''
+        if index == 0:
+            concat = ' ignore|'
+        elif index == 1:
+            concat = '-------|'
+        else:
+            concat = '   _   |'
+        return line + concat
+
+    def update_date_format(self, line):
+        '''
+        db-fiddle likes dates formatted as Y-m-d (i.e. 2020-5-1), 2 digit padding is optional
+        '''
+        return DATE_PATTERN.sub(reorder_date, line)
+
+    def replace_invalid_char_header(self, line):
+        '''
+        for each non-valid char match, returns a space
+        The inner function adds a space for every match, rather than just one space for all matches
+        '''
+        def repl(m):
+            return '_' * len(m.group())
+        return INVALID_HEADER_CHAR_PATTERN.sub(repl, line)
+
+    def iter_tables(self, tables_pre):
+        '''
+        Streams each table out of the <pre> text, yielding a table as soon as its last line is read.
+        Any line that is not part of a table is skipped.
+        The border style is detected per table from its first line:
+            PLUS tables are from newer questions where each line is sep by +---. They end on their 3rd +--- line, or at the end of the <pre> for tables missing the bottom border, like #619
+            PIPE tables are ----| with no bottom border, so they always end at the end of the <pre>
+        The style of each yielded table is appended to self.table_types
+        Unlike the seperate_tables1/2/3 this replaced, no table runs on into the next <pre>, and the style isn't picked once for the whole page
+        '''
+        for table_pre in tables_pre:
+            lines = []
+            #finditer, so the lines of a large <pre> are never all held in a list at once
+            for match in TABLE_LINE_PATTERN.finditer(table_pre):
+                line = match.group()
+                line_i = len(lines)
+                if line_i == 0:
+                    is_plus = '+-' in line
+                    is_single_col = line.count('+' if is_plus else '|') == 2
+                    plus_ct = 0
+
+                if is_plus:
+                    #header line
+                    if line_i == 1:
+                        line = self.replace_invalid_char_header(line)
+                    if '+-' in line:
+                        plus_ct += 1
+                    if is_single_col:
+                        line = self.add_filler_col_plus(line_i, line, plus_ct == 3)
+                else:
+                    #header line
+                    if line_i == 0:
+                        line = self.replace_invalid_char_header(line)
+                    if is_single_col:
+                        line = self.add_filler_col_pipe(line_i, line)
+                if line.count('/') >= 2:
+                    line = self.update_date_format(line)
+                lines.append(line)
+
+                #marks the end of the table
+                if is_plus and plus_ct == 3:
+                    self.table_types.append(PLUS)
+                    yield '\n'.join(lines)
+                    lines = []
+            if lines:
+                self.table_types.append(PLUS if is_plus else PIPE)
+                yield '\n'.join(lines)
+
+    def remove_dups(self, l):
+        '''
+        remove dups from list while preserving order (Python 3.6+)
+        '''
+        return list(dict.fromkeys(l))
+
+    def parse_table_names_by_kword(self, tables_pre):
+        '''
+        Finds table name based on table kword in <pre> tag text only
+        The <pre> tags contain the actual tables
+        '''
+        try:
+            #the regex is looking  any words preceding the keyword tableand after a newline or start of string
+            groups = re.findall(r'(\n|^)(\w+)\stable', ''.join(tables_pre))
+            return [group[1] for group in groups]
+        except:
+            return []
+
+    def parse_table_names_by_position(self, tables_pre):
+        '''
+        Find table name by position in <pre> text only
+        The <pre> tags contain the actual tables
+        '''
+        #method 2, from <pre> tag, collects the first word above each table line
+        table_pre = '\n'.join(tables_pre)
+        try:
+            #capture words before first table
+            name_first_position = [re.match(r'([_a-zA-z]+).*\n\+-', table_pre).group(1)]
+            #capture words between 2 new lines, and next table
+            names_remaining_position = re.findall(r'\n\n(.*?)\n\+-', table_pre)
+            names_position = name_first_position + names_remaining_position
+            return [name.split()[0] for name in names_position]
+
+        except (AttributeError, IndexError):
+            return []
+
+    def parse_table_names_by_code_tag(self):
+        '''
+        Find table name by <code> tag within ENTIRE web page
+        A few early problems like #176 uses this method
+        '''
+        element_names = self.remove_dups(self.page.get_code_texts())
+        invalid_names = ['null', 'DIAB1','B', 'delete', 'median']
+        names_code = []
+        for name in element_names:
+            if re.match(r'[_a-zA-Z]+', name) and name not in invalid_names:
+                names_code.append(name)
+        return names_code
+
+    def parse_table_names_by_bold(self):
+        '''
+        Find table name by <b> tag within ENTIRE web page. This is used only for a few problems like 579,580,585,586 where the table name is next to the word table and bolded.
+        Further implenetation details:
+        For the name to be added to the list, it needs to meet multiple specifications. Firstly, the paragraph must contain a bolded word. Secondly, the paragraph must contain the word 'table'. Thirdly, the word preceding table or the word after table must match the bolded word
+
+        '''
+        names_bold = []
+        try:
+            paragraphs = self.page.get_paragraphs()
+        except:
+            paragraphs = []
+        #each paragraph is its text, and the text of each bolded word(s) in the paragraph
+        for paragraph_text, bolded in paragraphs:
+            #See if paragraph has the word table and preceding table name
+            try:
+                preceding = re.search(r'(\w+)\s[tT]able', paragraph_text).group(1)
+                #compare bolded word against the word preceding the keyword table
+                for bold in bolded:
+                    if preceding == bold:
+                        names_bold.append(bold)
+
+                #negative lookaround, looks for the word after keyword table and any whitespace, non-ascii characters
+                after = re.search(r'(?<=table)s?[\s\W]*(\w+)', paragraph_text).group(1)
+                #preceding and after need seperate for loop because if there's a table kword, there is always a preceding but not always an after
+                for bold in bolded:
+                    if after == bold:
+                        names_bold.append(bold)
+            #no keyword table in paragraph
+            except:
+                pass
+        return names_bold
+
+    def get_closest_names(self,  target_len, names_args):
+        '''
+        Returns the names list that has a length closest to the number of tables parsed
+        This will only be called when the number of table names parsed does not equal to the number of tables parsed
+        '''
+        min_diff = float('inf')
+        for names in names_args:
+            diff = abs(target_len - len(names))
+            if diff < min_diff:
+                min_diff = diff
+                names_final = names
+
+        if min_diff == 0:
+            return names_final
+        elif len(names_final) > target_len:
+            print('CAUTION: Unknown table nams- too many names parsed compared to # of tables')
+            while len(names_final) != target_len:
+                names_final.pop()
+        else:
+            i = 0
+            print('CAUTION: Unknown table names- too few names parsed compared to # of tables')
+            while len(names_final) != target_len:
+                names_final.append('Unknown{i}'.format(i=i))
+                i+=1
+        return names_final
+
+    def parse_table_names(self, tables_pre, target_len):
+        '''
+        The naming of the tables in leetcode is inconsistent. Below are first different ways to parse the table names.
+        '''
+
+        def add_result_tbl_name(names):
+            if 'Result' not in names and 'result' not in names:
+                names.append('Result')
+            return names
+
+        if target_len == 1:
+            with open("unknown.txt",'a',encoding = 'utf-8') as f:
+               f.write(f'\ntarget_len only 1, tables_pre: {tables_pre}')
+        #a list of each list of parsed names
+        all_names = []
+        parse_name_funcs = [self.parse_table_names_by_kword, self.parse_table_names_by_position, self.parse_table_names_by_code_tag, self.parse_table_names_by_bold]
+
+        for parse_names in parse_name_funcs:
+            try:
+                names = parse_names(tables_pre)
+            #some of the functions take in an arg, some don't
+            except TypeError:
+                names = parse_names()
+            names = add_result_tbl_name(self.remove_dups(names))
+            if len(names) == target_len:
+                return names
+            all_names.append(names)
+        return self.get_closest_names(target_len, all_names)
+
+    def parse_leetcode_tables(self):
+        '''
+        The main parsing function that combines everything together. The tables are always listed under the <pre> tag. Tables_pre includes alll this text, as well as extraneous text. iter_tables() skips the extraneous text and seperates out each table as an item
+        '''
+        tables_pre = self.parse_table_pre()
+        self.table_types = []
+        tables_text = list(self.iter_tables(tables_pre))
+        #no sql tables on the page, i.e. #175 only has table schemas
+        if not tables_text:
+            raise IndexError('No sql tables found in <pre> text')
+
+        table_names = self.parse_table_names(tables_pre, len(tables_text))
+        return table_names, tables_text
@@ -1,64 +1,187 @@
 import re
+import json
 import time
-import itertools
+from collections import OrderedDict
 from datetime import datetime
+from http.client import HTTPException
+from urllib.error import HTTPError
+from threading import Thread
 
 from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.common.by import By
-from selenium.common.exceptions import NoSuchElementException, NoSuchWindowException, ElementNotSelectableException, ElementNotVisibleException, WebDriverException
+from selenium.common.exceptions import NoSuchElementException, NoSuchWindowException, ElementNotSelectableException, ElementNotVisibleException, TimeoutException, WebDriverException
 
 from .driver import Driver
+from .schema import DB_ENGINE_DIALECTS, get_schema_script, get_table_schemas, quote_identifier
+from .leetcode_page import DriverPage, get_leetcode_url, get_cached_page, fetch_page, fetch_final_url
+from .parse_cache import parse_tables
+from .question_list import get_question_list_url, parse_question_list
+
+class QuestionCancelled(Exception):
+    '''
+    Raised between WebDriver steps once the web handler's cancel_event is set
+    '''
+
+class TableParse(Thread):
+    '''
+    Parses a question's leetcode.jp tables in a thread of its own, from the caches or over http, while the browser loads the tabs.
+    parse() must not send WebDriver commands, the driver is only used from the thread that owns the web handler
+    '''
+    def __init__(self, parse, q_num):
+        super().__init__(name='parse-{}'.format(q_num), daemon=True)
+        self.parse = parse
+        self.q_num = q_num
+        self.tables = None
+        self.exc = None
+        #time.perf_counter() when the parse finished
+        self.finished = None
+
+    def run(self):
+        try:
+            self.tables = self.parse(self.q_num)
+        except Exception as e:
+            self.exc = e
+        self.finished = time.perf_counter()
+
+    def get_tables(self):
+        '''
+        Waits for the parse, and re-raises its exception in the caller's thread.
+        None if the page could not be fetched, the tables then have to be parsed from the leetcode tab
+        '''
+        self.join()
+        if self.exc is not None:
+            raise self.exc
+        return self.tables
 
 class WebHandler():
     '''
     Handles all selenium.webdriver actions including:
 
-    Getting question elements from leetcode.com.
+    Getting question elements from leetcode.com's problem list json.
     All tab handling (opening, closing, switching, etc)
         -Specifically, opening leetcode.jp, db-fiddle, and solution tab
 
-    Parses leetcode.jp in TableParser() sublclass for sql table data
+    Parses leetcode.jp with TableParser for sql table data, either from the leetcode tab or from the page fetched over http
     Inputs sql data to db-fiddle.
     '''
 
     __WAIT_LONG      = 7
     __WAIT_SHORT     = 2
+    #long-lived tabs, navigated in place from question to question instead of opened and closed
+    PROBLEM_TAB      = 'problem'
+    FIDDLE_TAB       = 'fiddle'
+    SOLUTION_TAB     = 'solution'
+    #db-fiddle could otherwise hold up leaving a fiddle with unsaved changes
+    __NAVIGATE_SCRIPT = "window.onbeforeunload = null; window.location.href = arguments[0];"
+    #chrome only, the js heap of the tab's page
+    __HEAP_SCRIPT = "return window.performance && performance.memory ? performance.memory.usedJSHeapSize : null;"
+    #where db-fiddle sends a fiddle version that was never saved
+    FIDDLE_HOME = 'https://www.db-fiddle.com/'
+    #a version far past any the user saves, to learn whether db-fiddle redirects missing versions over http
+    __MISSING_VERSION = 999999
+    #'missing' once redirected home, 'saved' once the version's own schema has rendered, null until one or the other
+    __FIDDLE_VERSION_SCRIPT = '''
+        if (window.location.href === arguments[0]) {
+            return 'missing';
+        }
+        var wrapper = document.querySelector('#schema .CodeMirror');
+        if (window.location.href === arguments[1] && wrapper && wrapper.CodeMirror && wrapper.CodeMirror.getValue()) {
+            return 'saved';
+        }
+        return null;
+    '''
+    #true once the tab's page, not the one it was navigated away from, has loaded
+    __LOADED_SCRIPT = "return document.readyState === 'complete' && window.location.search === arguments[0];"
+    #sets a textarea's value the way typing would, through the native setter so ember's bindings see the change, and fires the events ember listens for
+    __SET_VALUE_SCRIPT = '''
+        var element = arguments[0];
+        var setter = Object.getOwnPropertyDescriptor(Object.getPrototypeOf(element), 'value').set;
+        setter.call(element, arguments[1]);
+        element.dispatchEvent(new Event('input', {bubbles: true}));
+        element.dispatchEvent(new Event('change', {bubbles: true}));
+        return element.value === arguments[1];
+    '''
+    #appends to a CodeMirror editor through its api, which fires CodeMirror's own change events
+    __APPEND_CODE_MIRROR_SCRIPT = '''
+        var wrapper = document.querySelector(arguments[0] + ' .CodeMirror');
+        if (!wrapper || !wrapper.CodeMirror) {
+            return false;
+        }
+        var editor = wrapper.CodeMirror;
+        editor.replaceRange(arguments[1], {line: editor.lastLine()});
+        return true;
+    '''
+    #the text of a tab showing the problem list json, null until it has loaded
+    __QUESTION_LIST_SCRIPT = "return document.body && document.body.innerText.trim() ? document.body.innerText : null;"
 
-    def __init__(self, driver_path, headless):
-        self.driver = Driver.get_driver(driver_path, headless=headless)
+    def __init__(self, driver_path, headless, is_browserless_parse=False, page_cache=None, parse_cache=None, rate_limiter=None, cancel_event=None, profiles=None, profile_kind='main', is_lean=False):
+        #a persistent chrome profile of this handler's own, held until close_all()
+        self.profiles = profiles
+        self.profile = profiles.acquire(profile_kind) if profiles is not None else None
+        try:
+            if self.profile is not None:
+                self.driver = Driver.get_driver(driver_path, headless=headless, user_data_dir=self.profile.path, disk_cache_bytes=self.profiles.get_disk_cache_bytes(), is_lean=is_lean)
+            else:
+                self.driver = Driver.get_driver(driver_path, headless=headless, is_lean=is_lean)
+        except:
+            self.release_profile()
+            raise
+        self.headless = headless
+        #block images, fonts, ads and analytics, see Driver.get_driver()
+        self.is_lean = is_lean
+        #parse leetcode.jp tables from a plain http fetch instead of the leetcode tab
+        self.is_browserless_parse = is_browserless_parse
+        #on-disk leetcode.jp snapshots and parsed tables, shared with the other web handlers
+        self.page_cache = page_cache
+        self.parse_cache = parse_cache
+        #per host request limits, shared with the other web handlers
+        self.rate_limiter = rate_limiter
+        #when set, open_question() and open_fork() stop at their next step, only used by preload web handlers
+        self.cancel_event = cancel_event
+        #WebDriver commands used reading and parsing the page in the last parse, not opening or waiting on the leetcode tab
+        self.parse_command_count = 0
+        #whether an http GET of a missing fiddle version redirects home, None until first checked
+        self.is_http_version_check = None
+        #fiddle versions probed by the last open_newest_fiddle_url() call
+        self.version_probe_count = 0
+        #phase: seconds, of the last open_question() that created a new fiddle, see get_phase_msg()
+        self.phase_times = OrderedDict()
         #references to each question tab in webdriver
         self.leet_win = None
         self.db_win = None
         self.solution_win = None
+        #tab role: window handle, kept open across questions
+        self.tabs = {}
+        #q_num: (leetcode window or None, db-fiddle window, db-fiddle url), rendered behind the user's tabs, least recently used first
+        self.standby = OrderedDict()
+        #the window chrome starts with, taken by the first tab opened so it isn't left empty
+        self.spare_wins = [self.driver.current_window_handle]
+        if is_lean:
+            #chrome is already up, and the caller never gets a handler to close it with
+            try:
+                Driver.block_requests(self.driver)
+            except:
+                self.close_all()
+                raise
 
-    def get_question_elements(self):
+    def read_question_elements(self):
         '''
-        From the leetcode website, captures question data
+        Reads leetcode.com's problem list json from a browser tab with one injected script, for when the plain http request, fetch_question_elements(), fails
         '''
-        url = 'https://leetcode.com/problemset/database/?'
-        win = self.open_new_win(url)
+        print('\nObtaining leetcode question elements from leetcode.com')
+        url = get_question_list_url()
         try:
-            print('\nObtaining leetcode question elements from leetcode.com')
-            #view all problems, not just first 50
-            WebDriverWait(self.driver, self.__WAIT_LONG).until(EC.element_to_be_clickable((By.XPATH, '//*[@id="question-app"]/div/div[2]/div[2]/div[2]/table/tbody[2]/tr/td/span[1]/select/option[4]'))).click()
-            #note that this element can only be found using selenium (not requests, or beautifulsoup)because the table is generated after the fact in js
-            element = WebDriverWait(self.driver, self.__WAIT_SHORT).until(EC.presence_of_element_located((By.CLASS_NAME, 'reactable-data')))
-
-            text =  [' '.join(line.split()) for line in element.text.split('\n')]
-            question_elements = {}
-
-            for i, line in enumerate(text):
-                if (i+1) % 3 == 0:
-                    q_num = int(text[i-2])
-                    level = line.split()[1].lower()
-                    q_name = text[i-2] + ': ' + text[i-1] + ', ' + level
-                    question_elements[q_num] = {'level':level, 'name':q_name}
-            self.close_window(win)
-            return question_elements
-        except:
-            print('\n Could not find question elements from leetcode.com')
+            self.open_tab(self.PROBLEM_TAB, url)
+            #polled until the json has loaded
+            text = WebDriverWait(self.driver, self.__WAIT_LONG).until(lambda driver: driver.execute_script(self.__QUESTION_LIST_SCRIPT))
+            question_elements = parse_question_list(json.loads(text))
+            if question_elements:
+                return question_elements
+        except (WebDriverException, ValueError):
+            pass
+        print('\n Could not find question elements from leetcode.com')
 
     def close_window(self, window):
         try:
@@ -69,10 +192,12 @@ class WebHandler():
             pass
 
     def close_question_windows(self):
-        windows =  (self.leet_win, self.db_win, self.solution_win)
-        for window in windows:
-            if window is not None:
-                self.close_window(window)
+        '''
+        The problem and fiddle tabs are left open for the next question to navigate in place, only the solution tab, opened on request, is closed
+        '''
+        if self.solution_win is not None:
+            self.close_window(self.solution_win)
+            self.tabs.pop(self.SOLUTION_TAB, None)
         self.leet_win = self.db_win = self.solution_win = None
 
     def close_all(self):
@@ -81,6 +206,16 @@ class WebHandler():
         #driver already quit
         except:
             print('\nCannot close driver, driver has already closed')
+        self.release_profile()
+
+    def release_profile(self):
+        if self.profile is not None:
+            profile, self.profile = self.profile, None
+            self.profiles.release(profile)
+
+    def check_cancelled(self):
+        if self.cancel_event is not None and self.cancel_event.is_set():
+            raise QuestionCancelled
 
     def get_last_window(self):
         return self.driver.window_handles[-1]
@@ -93,11 +228,14 @@ class WebHandler():
 
     def open_new_win(self, url):
         '''
-        Open a new tab for specified url
+        Open a new tab for specified url, after waiting for the rate limiter if the host is limited
         Note that driver.current_window_handle attribute is not updated when executing this
         '''
+        self.wait_to_request(url)
         # need to always reset to an active window before opening new window b/c if opening from an inactive window, a non such window exception is triggered
         self.reset_curr_window()
+        if self.is_lean:
+            return self.__open_lean_win(url)
         js_url = '\'' + url + '\''
         script = "window.open({js_url})".format(js_url=js_url)
         try:
@@ -109,6 +247,158 @@ class WebHandler():
         self.reset_curr_window()
         return self.get_last_window()
 
+    def wait_to_request(self, url):
+        if self.rate_limiter is not None:
+            self.rate_limiter.wait(url, self.cancel_event)
+        self.check_cancelled()
+
+    def open_tab(self, role, url):
+        '''
+        Shows url in the role's tab. An open tab is navigated in place, so switching questions doesn't spawn and close a renderer per page
+        Like open_new_win(), doesn't wait for the page to load
+        '''
+        win = self.tabs.get(role)
+        if win is None and self.spare_wins:
+            win = self.spare_wins.pop()
+        if win is not None:
+            self.wait_to_request(url)
+            try:
+                self.driver.switch_to.window(win)
+                self.driver.execute_script(self.__NAVIGATE_SCRIPT, url)
+                self.tabs[role] = win
+                return win
+            #closed by the user
+            except NoSuchWindowException:
+                pass
+        self.tabs[role] = self.open_new_win(url)
+        return self.tabs[role]
+
+    def execute_cdp_cmd(self, cmd, params):
+        return getattr(self.driver, 'wrapped_driver', self.driver).execute_cdp_cmd(cmd, params)
+
+    @staticmethod
+    def get_target_id(win):
+        '''
+        chromedriver's window handles are DevTools target ids, older versions prefix them with CDwindow-
+        '''
+        return win[len('CDwindow-'):] if win.startswith('CDwindow-') else win
+
+    def open_background_win(self, url):
+        '''
+        Opens url in a tab behind the user's, without switching to it, so the user's tab keeps its focus and the driver keeps its current window
+        Raises WebDriverException if chrome doesn't support it
+        '''
+        #like __open_lean_win(), a lean tab is opened blank so its requests are blocked before the page starts loading
+        target_id = self.execute_cdp_cmd('Target.createTarget', {'url': 'about:blank' if self.is_lean else url, 'background': True})['targetId']
+        win = next((win for win in self.driver.window_handles if self.get_target_id(win) == target_id), target_id)
+        if self.is_lean:
+            self.__block_background_win(win, url)
+        return win
+
+    def __block_background_win(self, win, url):
+        '''
+        DevTools settings are sent to the current tab, so the driver switches to the blank tab and back
+        '''
+        curr_win = self.driver.current_window_handle
+        self.driver.switch_to.window(win)
+        try:
+            Driver.block_requests(self.driver)
+            self.driver.execute_script("window.location.href = arguments[0];", url)
+        finally:
+            self.driver.switch_to.window(curr_win)
+
+    def close_background_win(self, win):
+        try:
+            self.execute_cdp_cmd('Target.closeTarget', {'targetId': self.get_target_id(win)})
+        #already closed
+        except WebDriverException:
+            pass
+
+    def get_question_bytes(self):
+        '''
+        JS heap of the current question's tabs, the memory a standby pair is expected to take
+        '''
+        total = 0
+        for win in (self.leet_win, self.db_win):
+            if win is not None:
+                self.driver.switch_to.window(win)
+                total += self.driver.execute_script(self.__HEAP_SCRIPT) or 0
+        return total
+
+    def open_standby(self, q_num, db_url):
+        '''
+        Renders the question's problem and saved fiddle in background tabs, so switching to it later is just a switch of window handles
+        Returns False, without opening anything, if the rate limiter has no request to spare right now, the question is tried again at the next refresh
+        '''
+        if q_num in self.standby and self.standby[q_num][2] == db_url:
+            self.standby.move_to_end(q_num)
+            return True
+        self.evict_standby_question(q_num)
+        #like open_leetcode_win(), a headless handler that parses over http doesn't need the leetcode tab
+        leet_url = None if self.headless and self.is_browserless_parse else self.get_leetcode_url(q_num)
+        if self.rate_limiter is not None and not self.rate_limiter.try_requests([url for url in (leet_url, db_url) if url is not None]):
+            return False
+        leet_win = self.open_background_win(leet_url) if leet_url is not None else None
+        self.standby[q_num] = (leet_win, self.open_background_win(db_url), db_url)
+        return True
+
+    def evict_standby_question(self, q_num):
+        if q_num in self.standby:
+            for win in self.standby.pop(q_num)[:2]:
+                if win is not None:
+                    self.close_background_win(win)
+
+    def evict_standby(self, max_questions, keep=()):
+        '''
+        Closes the least recently used standby pairs until at most max_questions are left, pairs of questions not in keep go first
+        '''
+        while len(self.standby) > max_questions:
+            q_num = next((q_num for q_num in self.standby if q_num not in keep), next(iter(self.standby)))
+            self.evict_standby_question(q_num)
+
+    def has_standby(self, q_num, db_url):
+        return q_num in self.standby and self.standby[q_num][2] == db_url
+
+    def switch_to_standby(self, q_num, from_q_num=None, from_db_url=None):
+        '''
+        The question's standby tabs become the problem and fiddle tabs. The tabs being left become from_q_num's standby pair, in case the user comes back to it
+        Returns the db-fiddle url, or None if the user closed a standby tab, the question should then be opened as usual
+        '''
+        leet_win, db_win, db_url = self.standby.pop(q_num)
+        wins = self.driver.window_handles
+        if db_win not in wins or (leet_win is not None and leet_win not in wins):
+            for win in (leet_win, db_win):
+                if win in wins:
+                    self.close_background_win(win)
+            return None
+        old_leet_win, old_db_win = self.tabs.get(self.PROBLEM_TAB), self.tabs.get(self.FIDDLE_TAB)
+        if from_q_num is not None and old_db_win is not None and self.is_valid_save_url(from_db_url):
+            self.evict_standby_question(from_q_num)
+            self.standby[from_q_num] = (old_leet_win, old_db_win, from_db_url)
+        else:
+            for win in (old_leet_win, old_db_win):
+                if win is not None:
+                    self.close_background_win(win)
+        self.tabs[self.FIDDLE_TAB] = self.db_win = db_win
+        self.leet_win = leet_win
+        if leet_win is not None:
+            self.tabs[self.PROBLEM_TAB] = leet_win
+        else:
+            self.tabs.pop(self.PROBLEM_TAB, None)
+        self.click_query_table()
+        self.switch_to_leetcode_win()
+        return db_url
+
+    def __open_lean_win(self, url):
+        '''
+        The tab is opened blank, so its requests are blocked before the page starts loading
+        '''
+        self.driver.execute_script("window.open('about:blank')")
+        self.reset_curr_window()
+        Driver.block_requests(self.driver)
+        self.driver.execute_script("window.location.href = arguments[0];", url)
+        return self.get_last_window()
+
     def is_valid_save_url(self, url):
         '''
         Check if url is a saved db-fiddle. It needs to start with https://db-fiddle, and end with a /0-9
@@ -122,34 +412,98 @@ class WebHandler():
 
     def open_newest_fiddle_url(self, url):
         '''
-        Gets the newest version of the fiddle url
-        Each saved fiddle url ends with a version #, and increments up each time its saved again
-        If the fiddle url redirects to db-fiddle.com that means the previous version was the last version saved
-        Note: I tried using requests module to check if url is valid, but even when the url is redirected, the request.is_redirect flag is still False
+        Gets the newest version of the fiddle url, and opens it in the fiddle tab
+        Each saved fiddle url ends with a version #, and increments up each time its saved again. Versions are saved in order, so a version exists if and only if it's at most the newest one.
+        The newest version is found with a galloping search from url's version, then a binary search, O(log n) probes for n versions saved since
         '''
-        url_index = int(url[-1])
-        base_url = url[:-1]
-        window_handles = []
+        base_url, version = re.match(r'^(.*/)(\d+)$', url).groups()
+        self.version_probe_count = 0
+        newest_url = base_url + str(self.find_newest_fiddle_version(base_url, int(version)))
+        self.open_db_win(newest_url)
+        return newest_url
 
-        while url != 'https://www.db-fiddle.com/':
-            window_handles.append(self.open_new_win(base_url + str(url_index)))
-            time.sleep(self.__WAIT_SHORT)
-            url = self.driver.current_url
-            url_index += 1
+    def find_newest_fiddle_version(self, base_url, known_version):
+        '''
+        known_version is known to be saved
+        '''
+        newest, step = known_version, 1
+        while self.is_fiddle_version_saved(base_url + str(newest + step)):
+            newest += step
+            step *= 2
+        #newest is saved, missing is not
+        missing = newest + step
+        while missing - newest > 1:
+            middle = (newest + missing) // 2
+            if self.is_fiddle_version_saved(base_url + str(middle)):
+                newest = middle
+            else:
+                missing = middle
+        return newest
 
-        # window_handles[-1] is always an invalid link that redirects to 'db-fiddle.com'
-        self.db_win = window_handles[-2]
+    def is_fiddle_version_saved(self, url):
+        '''
+        An unsaved version redirects to db-fiddle.com. Checked with a plain http GET if db-fiddle redirects over http, otherwise in the fiddle tab
+        '''
+        self.version_probe_count += 1
+        is_saved = self.is_fiddle_version_saved_over_http(url)
+        if is_saved is None:
+            is_saved = self.is_fiddle_version_saved_in_tab(url)
+        return is_saved
 
-        for window in window_handles:
-            if window != self.db_win:
-                self.close_window(window)
-        return base_url + str(url_index - 2)
+    def get_final_url(self, url):
+        '''
+        None if the fetch failed, HTTPError is raised for error statuses
+        '''
+        self.wait_to_request(url)
+        try:
+            return fetch_final_url(url)
+        except HTTPError:
+            raise
+        #URLError and socket timeouts are both OSErrors
+        except (OSError, HTTPException):
+            return None
+
+    def is_fiddle_version_saved_over_http(self, url):
+        '''
+        Returns None if http can't tell, i.e. the fetch failed, or db-fiddle only redirects missing versions from its scripts
+        '''
+        if self.is_http_version_check is None:
+            missing_url = re.sub(r'\d+$', str(self.__MISSING_VERSION), url)
+            try:
+                final_url = self.get_final_url(missing_url)
+                #checked again with the next probe
+                if final_url is None:
+                    return None
+                self.is_http_version_check = final_url == self.FIDDLE_HOME
+            except HTTPError as e:
+                self.is_http_version_check = e.code == 404
+        if not self.is_http_version_check:
+            return None
+        try:
+            final_url = self.get_final_url(url)
+        except HTTPError as e:
+            return False if e.code == 404 else None
+        if final_url is None:
+            return None
+        return final_url != self.FIDDLE_HOME
+
+    def is_fiddle_version_saved_in_tab(self, url):
+        '''
+        The fiddle tab is navigated to each version in turn, and polled until it either redirects home or renders the version's schema
+        '''
+        self.open_db_win(url)
+        try:
+            state = WebDriverWait(self.driver, self.__WAIT_LONG).until(lambda driver: driver.execute_script(self.__FIDDLE_VERSION_SCRIPT, self.FIDDLE_HOME, url))
+        #neither, the older versions are safer to open than a version that might not exist
+        except TimeoutException:
+            return False
+        return state == 'saved'
 
     def open_solution_win(self, question):
         q_num = '\'' + str(question.number).zfill(4) + '\''
         try:
             url = 'https://github.com/kamyu104/LeetCode-Solutions#sql'
-            self.solution_win = self.open_new_win(url)
+            self.solution_win = self.open_tab(self.SOLUTION_TAB, url)
             #find question from github page
             WebDriverWait(self.driver, 3).until(EC.element_to_be_clickable((By.XPATH,("//*[contains(text(),{q_num})]/following-sibling::td/following-sibling::td".format(q_num=q_num))))).click()
             #find solution text, and scroll to it
@@ -162,363 +516,126 @@ class WebHandler():
             self.driver.get(base_url+ search_term)
 
     def get_leetcode_url(self, q_num):
-        return 'https://leetcode.jp/problemdetail.php?id={q_num}'.format(q_num=q_num)
+        return get_leetcode_url(q_num)
+
+    def is_page_cached(self, q_num):
+        return self.page_cache is not None and q_num in self.page_cache
 
     def open_leetcode_win(self, q_num):
         '''
         select the leetcode jp problem to go to
+        A headless handler has no use for the leetcode tab if it can parse from the page cache or over http, so it is skipped
         '''
-        self.leet_win = self.open_new_win(self.get_leetcode_url(q_num))
-
-    class TableParser:
-        __WAIT_LONG      = 7
-        __WAIT_SHORT     = 2
-
-        def __init__(self, driver):
-            self.driver = driver
-
-        def parse_table_pre(self):
-            #find sql text tables using pre element tag
-            elements_pre = self.driver.find_elements_by_css_selector("pre")
-            tables_pre = [element.text for element in elements_pre]
-
-            #use list() to make a copy so that removal of elements does not effect loop indexing
-            for table_pre in list(tables_pre):
-                #remove data type tables
-                if 'Column Name' in table_pre or 'Column' in table_pre:
-                    tables_pre.remove(table_pre)
-            return tables_pre
-
-        def parse_table_lines(self, tables_pre):
-            '''
-            tables_pre will contain some extra non-table lines
-            This will remove any line that is not part of a table.
-            The returned list will still need to be cleaned because the tables aren't seperated out
-            '''
-            table_lines = []
-            for table_pre in tables_pre:
-                matches = re.findall(r'\+--*.*[\+\|]|\|.*\|', table_pre)
-                if len(matches) > 0:
-                    table_lines.append(matches)
-            return table_lines
-
-        def get_table_type(self, table_lines):
-            '''
-            Table 1 are from newer questions where each line is sep by +---
-            Table 2 are ----|
-            Table 3 are like table 1, but they don't end with a 3rd +----
-            '''
-            cond1 = '+-' in table_lines[0][0]
-            table_lines_combined = list(itertools.chain.from_iterable(table_lines))
-            count = len([line for line in table_lines_combined if '+-' in line])
-            cond2 = count % 3 == 0
-            if cond1 and cond2:
-                return 'Table1'
-            elif not cond1:
-                return 'Table2'
-            elif cond1:
-                return 'Table3'
-
-        def add_filler_col1(self, index, line, is_final=False):
-            '''
-            DB-fiddle does not support text to DDL for tables with 1 column. This adds a filler column for type 1 tables
-            '''
-            if index == 0:
-                concat = '---------+'
-            elif index == 1:
-                concat = ' ignore  |'
-            elif index == 2:
-                concat = '---------+'
-            elif is_final:
-                concat = '---------+'
-            else:
-                concat = '  _      |'
-            return line + concat
-
-        def add_filler_col2(self, index, line):
-            '''
-            DB-fiddle does not support text to DDL for tables with 1 column. This adds a filler column for type 2 tables
-            '''
-            if index == 0:
-                concat = ' ignore|'
-            elif index == 1:
-                concat = '-------|'
-            else:
-                concat = '   _   |'
-            return line + concat
-
-        def add_filler_col3(self, index, line):
-            '''
-            DB-fiddle does not support text to DDL for tables with 1 column. This adds a filler column for type 2 tables
-            '''
-            if index == 0:
-                concat = '---------+'
-            elif index == 1:
-                concat = ' ignore  |'
-            elif index == 2:
-                concat = '---------+'
-            else:
-                concat = '  _      |'
-            return line + concat
-
-
-        def update_date_format(self, line):
-            '''
-            db-fiddle likes dates formatted as Y-m-d (i.e. 2020-5-1), 2 digit padding is optional
-            '''
-            pattern = re.compile(r'(\d{1,2})/(\d{1,2})/(\d{4})')
-            return re.sub(pattern, r'\g<3>-\g<1>-\g<2>', line)
-
-        def replace_invalid_char_header(self, line):
-            '''
-            for each non-valid char match, returns a space
-            The inner function adds a space for every match, rather than just one space for all matches
-            '''
-            #valid characters for tables names | valid characters for table row demarcations
-            pattern = re.compile(r'[^\w\s\|\+\-]+')
-            def repl(m):
-                return '_' * len(m.group())
-            sub = re.sub(pattern, repl, line)
-            return sub
-
-        def seperate_tables1(self, table_lines):
-            '''
-            Seperate each table of table type 1 (they contain '+' in the text) into its own item in tables_text
-            '''
-            tables_text, current_table = [], []
-            plus_ct = line_i = 0
-            is_single_col = False
-            for table_line in table_lines:
-                for line in table_line:
-                    if line_i == 0:
-                        if line.count('+') == 2:
-                            is_single_col = True
-                    #if header line
-                    if line_i == 1:
-                        line = self.replace_invalid_char_header(line)
-                    if '+-' in line:
-                        plus_ct += 1
-                    if line.count('/') >= 2:
-                        line = self.update_date_format(line)
-                    if is_single_col:
-                        line = self.add_filler_col1(line_i, line, plus_ct == 3)
-                    current_table.append(line)
-                    line_i += 1
-                    #marks the end of the table
-                    if plus_ct == 3:
-                        tables_text.append('\n'.join(current_table))
-                        current_table = []
-                        is_single_col = False
-                        plus_ct = line_i = 0
-            return tables_text
-
-        def seperate_tables2(self, table_lines):
-            '''
-            Seperate each table of table type 2 (they contain '|' in the first line) into its own item in tables_text list
-            '''
-            tables_text, current_table = [], []
-            for table_line in table_lines:
-                is_single_col = False
-                if table_line[0].count('|') == 2:
-                    is_single_col = True
-                for line_i, line in enumerate(table_line):
-                    if line_i == 0:
-                        line = self.replace_invalid_char_header(line)
-                    if is_single_col:
-                        line = self.add_filler_col2(line_i, line)
-                    if line.count('/') >= 2:
-                        line = self.update_date_format(line)
-                    current_table.append(line)
-                tables_text.append('\n'.join(current_table))
-                current_table = []
-            return tables_text
-
-        def seperate_tables3(self, table_lines):
-            '''
-            Seperate each table of table type 3. Type 3 tables contain '+-' like type 1 tables, but they don't end with a '+-'. The only problem like this is 619
-            '''
-            tables_text, current_table = [], []
-            for table_line in table_lines:
-                is_single_col = False
-                if table_line[0].count('+') == 2:
-                    is_single_col = True
-                for line_i, line in enumerate(table_line):
-                    if line_i == 0:
-                        line = self.replace_invalid_char_header(line)
-                    if is_single_col:
-                        line = self.add_filler_col3(line_i, line)
-                    if line.count('/') >= 2:
-                        line = self.update_date_format(line)
-                    current_table.append(line)
-                tables_text.append('\n'.join(current_table))
-                current_table = []
-            return tables_text
-
-        def remove_dups(self, l):
-            '''
-            remove dups from list while preserving order (Python 3.6+)
-            '''
-            return list(dict.fromkeys(l))
-
-        def parse_table_names_by_kword(self, tables_pre):
-            '''
-            Finds table name based on table kword in <pre> tag text only
-            The <pre> tags contain the actual tables
-            '''
-            try:
-                #the regex is looking  any words preceding the keyword tableand after a newline or start of string
-                groups = re.findall(r'(\n|^)(\w+)\stable', ''.join(tables_pre))
-                return [group[1] for group in groups]
-            except:
-                return []
-
-        def parse_table_names_by_position(self, tables_pre):
-            '''
-            Find table name by position in <pre> text only
-            The <pre> tags contain the actual tables
-            '''
-            #method 2, from <pre> tag, collects the first word above each table line
-            table_pre = '\n'.join(tables_pre)
-            try:
-                #capture words before first table
-                name_first_position = [re.match(r'([_a-zA-z]+).*\n\+-', table_pre).group(1)]
-                #capture words between 2 new lines, and next table
-                names_remaining_position = re.findall(r'\n\n(.*?)\n\+-', table_pre)
-                names_position = name_first_position + names_remaining_position
-                return [name.split()[0] for name in names_position]
-
-            except (AttributeError, IndexError):
-                return []
-
-        def parse_table_names_by_code_tag(self):
-            '''
-            Find table name by <code> tag within ENTIRE web page
-            A few early problems like #176 uses this method
-            '''
-            elements = self.driver.find_elements_by_css_selector("code")
-            element_names = self.remove_dups([element.text for element in elements])
-            invalid_names = ['null', 'DIAB1','B', 'delete', 'median']
-            names_code = []
-            for name in element_names:
-                if re.match(r'[_a-zA-Z]+', name) and name not in invalid_names:
-                    names_code.append(name)
-            return names_code
-
-        def parse_table_names_by_bold(self):
-            '''
-            Find table name by <b> tag within ENTIRE web page. This is used only for a few problems like 579,580,585,586 where the table name is next to the word table and bolded.
-            Further implenetation details:
-            For the name to be added to the list, it needs to meet multiple specifications. Firstly, the paragraph must contain a bolded word. Secondly, the paragraph must contain the word 'table'. Thirdly, the word preceding table or the word after table must match the bolded word
-
-            '''
-            names_bold = []
+        if self.headless and (self.is_browserless_parse or self.is_page_cached(q_num)):
+            return
+        self.leet_win = self.open_tab(self.PROBLEM_TAB, self.get_leetcode_url(q_num))
+
+    def switch_to_leetcode_win(self):
+        if self.leet_win is not None:
+            self.driver.switch_to.window(self.leet_win)
+
+    def get_leetcode_page(self, q_num):
+        '''
+        Returns the leetcode.jp page for TableParser.
+        A fresh snapshot from the page cache is used first.
+        Otherwise if browserless parsing is on, the page is fetched over http and parsed by html.parser, falling back to the leetcode tab if the fetch fails
+        New pages are saved to the page cache either way
+        '''
+        page = self.get_browserless_page(q_num)
+        if page is None:
+            page = self.get_tab_page(q_num)
+        return page
+
+    def get_browserless_page(self, q_num):
+        '''
+        The page from the page cache or over http, or None if the leetcode tab is needed. Sends no WebDriver commands
+        '''
+        page = get_cached_page(q_num, self.page_cache)
+        if page is None and self.is_browserless_parse:
+            url = self.get_leetcode_url(q_num)
+            if self.rate_limiter is not None:
+                self.rate_limiter.wait(url, self.cancel_event)
+            self.check_cancelled()
             try:
-                paragrahs = self.driver.find_elements_by_css_selector("p")
-            except:
-                pass
-            for paragraph in paragrahs:
-                #try to find bolded word(s) in paragraph
-                try:
-                    bolded = paragraph.find_elements_by_css_selector("b")
-                    #See if paragraph has the word table and preceding table name
-                    try:
-                        preceding = re.search(r'(\w+)\s[tT]able', paragraph.text).group(1)
-                        #compare bolded word against the word preceding the keyword table
-                        for bold in bolded:
-                            if preceding == bold.text:
-                                names_bold.append(bold.text)
-
-                        #negative lookaround, looks for the word after keyword table and any whitespace, non-ascii characters
-                        after = re.search(r'(?<=table)s?[\s\W]*(\w+)', paragraph.text).group(1)
-                        #preceding and after need seperate for loop because if there's a table kword, there is always a preceding but not always an after
-                        for bold in bolded:
-                            if after == bold.text:
-                                names_bold.append(bold.text)
-                    #no keyword table in paragraph
-                    except:
-                        pass
-                #no bolded word in paragraph
-                except:
-                    pass
-            return names_bold
-
-        def get_closest_names(self,  target_len, names_args):
-            '''
-            Returns the names list that has a length closest to the number of tables parsed
-            This will only be called when the number of table names parsed does not equal to the number of tables parsed
-            '''
-            min_diff = float('inf')
-            for names in names_args:
-                diff = abs(target_len - len(names))
-                if diff < min_diff:
-                    min_diff = diff
-                    names_final = names
-
-            if min_diff == 0:
-                return names_final
-            elif len(names_final) > target_len:
-                print('CAUTION: Unknown table nams- too many names parsed compared to # of tables')
-                while len(names_final) != target_len:
-                    names_final.pop()
-            else:
-                i = 0
-                print('CAUTION: Unknown table names- too few names parsed compared to # of tables')
-                while len(names_final) != target_len:
-                    names_final.append('Unknown{i}'.format(i=i))
-                    i+=1
-            return names_final
-
-        def parse_table_names(self, tables_pre, target_len):
-            '''
-            The naming of the tables in leetcode is inconsistent. Below are first different ways to parse the table names.
-            '''
-
-            def add_result_tbl_name(names):
-                if 'Result' not in names and 'result' not in names:
-                    names.append('Result')
-                return names
-
-            if target_len == 1:
-                with open("unknown.txt",'a',encoding = 'utf-8') as f:
-                   f.write(f'\ntarget_len only 1, tables_pre: {tables_pre}')
-            #a list of each list of parsed names
-            all_names = []
-            parse_name_funcs = [self.parse_table_names_by_kword, self.parse_table_names_by_position, self.parse_table_names_by_code_tag, self.parse_table_names_by_bold]
-
-            for parse_names in parse_name_funcs:
-                try:
-                    names = parse_names(tables_pre)
-                #some of the functions take in an arg, some don't
-                except TypeError:
-                    names = parse_names()
-                names = add_result_tbl_name(self.remove_dups(names))
-                if len(names) == target_len:
-                    return names
-                all_names.append(names)
-            return self.get_closest_names(target_len, all_names)
-
-        def parse_leetcode_tables(self, leet_win):
-            '''
-            The main parsing function that combines everything together. The tables are always listed under the <pre> tag. Tables_pre includes alll this text. However, it also includes extraneous text. Table_lines removes the extraneous text. Lastly, each of the tables are seperated as an item
-            '''
-            self.driver.switch_to.window(leet_win)
-            tables_pre = self.parse_table_pre()
-            table_lines = self.parse_table_lines(tables_pre)
-
-            table_type = self.get_table_type(table_lines)
-            #seperate tables based on type
-            if table_type == 'Table1':
-                tables_text = self.seperate_tables1(table_lines)
-            elif table_type == 'Table2':
-                tables_text = self.seperate_tables2(table_lines)
-            elif table_type == 'Table3':
-                tables_text = self.seperate_tables3(table_lines)
-
-            table_names = self.parse_table_names(tables_pre, len(tables_text))
-            return table_names, tables_text
+                page = fetch_page(q_num, self.page_cache)
+            #URLError and socket timeouts are both OSErrors
+            except (OSError, HTTPException):
+                print('\nCould not fetch leetcode.jp over http, parsing from the browser instead')
+        return page
+
+    def get_tab_page(self, q_num):
+        '''
+        The page from the leetcode tab, opened if it isn't yet, e.g. by a headless handler that meant to parse over http
+        Its text is only read once parsed, see __parse_page()
+        '''
+        if self.leet_win is None:
+            self.leet_win = self.open_tab(self.PROBLEM_TAB, self.get_leetcode_url(q_num))
+        self.driver.switch_to.window(self.leet_win)
+        #the tab was only just navigated, nothing else waits for it to load
+        try:
+            WebDriverWait(self.driver, self.__WAIT_LONG).until(lambda driver: driver.execute_script(self.__LOADED_SCRIPT, '?id={}'.format(q_num)))
+        except WebDriverException:
+            pass
+        return DriverPage(self.driver)
+
+    def get_command_count(self):
+        '''
+        Total WebDriver commands sent by this handler's driver
+        '''
+        return getattr(self.driver, 'command_count', 0)
+
+    def parse_leetcode_tables(self, q_num):
+        '''
+        Returns the table names and tables text of the question.
+        The number of WebDriver commands the parse took is kept in parse_command_count
+        '''
+        return self.__count_parse(q_num, self.get_leetcode_page(q_num))
+
+    def start_table_parse(self, q_num):
+        '''
+        Starts parsing the question's tables alongside the page loads, if they can be parsed without the browser.
+        Returns the TableParse thread, or None if the leetcode tab is needed
+        '''
+        if not (self.is_browserless_parse or self.is_page_cached(q_num)):
+            return None
+        table_parse = TableParse(self.__parse_browserless, q_num)
+        table_parse.start()
+        return table_parse
+
+    def __parse_browserless(self, q_num):
+        '''
+        None if the leetcode tab is needed
+        '''
+        page = self.get_browserless_page(q_num)
+        if page is None:
+            return None
+        return self.__parse_page(q_num, page)
+
+    def parse_tab_tables(self, q_num):
+        '''
+        Like parse_leetcode_tables(), for when the page cache and http have already been tried
+        '''
+        return self.__count_parse(q_num, self.get_tab_page(q_num))
+
+    def __count_parse(self, q_num, page):
+        '''
+        WebDriver commands are counted from reading the page's text through the parse, not opening the tab or waiting for it to load
+        Only for parses in the thread that owns the driver, a TableParse thread's count would take in the commands sent meanwhile
+        '''
+        commands_start = self.get_command_count()
+        try:
+            return self.__parse_page(q_num, page)
+        finally:
+            self.parse_command_count = self.get_command_count() - commands_start
+
+    def __parse_page(self, q_num, page):
+        #the tab's text is read in one command, and shared by the page cache and the parser
+        if isinstance(page, DriverPage) and self.page_cache is not None:
+            self.page_cache.put(q_num, page.get_html())
+        return parse_tables(q_num, page, self.parse_cache)
 
     def open_db_win(self, url='https://www.db-fiddle.com/'):
-        self.db_win = self.open_new_win(url)
+        self.db_win = self.open_tab(self.FIDDLE_TAB, url)
 
     def db_fiddle_select_engine(self, db_engine):
         self.driver.switch_to.window(self.db_win)
@@ -539,13 +656,54 @@ class WebHandler():
         except:
             pass
 
+    def inject_text(self, element, text):
+        '''
+        Sets a textarea's text in one WebDriver command, where send_keys sends one keystroke at a time.
+        Returns False if the text didn't take, the caller then falls back to send_keys
+        '''
+        try:
+            return bool(self.driver.execute_script(self.__SET_VALUE_SCRIPT, element, text))
+        except WebDriverException:
+            return False
+
+    def inject_code_mirror(self, selector, text):
+        '''
+        Appends text to the CodeMirror editor under the css selector in one WebDriver command
+        Returns False if there's no CodeMirror editor to append to
+        '''
+        try:
+            return bool(self.driver.execute_script(self.__APPEND_CODE_MIRROR_SCRIPT, selector, text))
+        except WebDriverException:
+            return False
+
     def db_fiddle_query_input(self, table_name):
         self.driver.switch_to.window(self.db_win)
+        query = 'SELECT * FROM {table_name}'.format(table_name=table_name)
+        if self.inject_code_mirror('#query', query):
+            return
         self.click_query_table()
         textbox = WebDriverWait(self.driver, self.__WAIT_SHORT).until(EC.presence_of_element_located((By.XPATH, '//*[@id="query"]/div[2]/div[1]/textarea')))
-        query = 'SELECT * FROM {table_name}'.format(table_name=table_name)
         textbox.send_keys(query)
 
+    def db_fiddle_schema_input(self, table_names, tables_text, db_engine):
+        '''
+        Pastes the CREATE TABLE and INSERT statements of every table into the schema editor at once, generated locally for the selected engine
+        Returns the first table's name as the pasted schema names it, for the starter query, since duplicate names are renamed and names can need quoting
+        Returns None if the engine isn't one of the config options, the tables couldn't be turned into sql, or there's no editor to paste into
+        '''
+        #db-fiddle's own Text to DDL handles any other engine
+        if db_engine not in DB_ENGINE_DIALECTS:
+            return None
+        dialect = DB_ENGINE_DIALECTS[db_engine]
+        try:
+            schemas = get_table_schemas(table_names, tables_text)
+        except ValueError:
+            return None
+        self.driver.switch_to.window(self.db_win)
+        if not self.inject_code_mirror('#schema', get_schema_script(schemas, dialect)):
+            return None
+        return quote_identifier(schemas[0].name, dialect)
+
     def db_fiddle_table_input(self, table_name, table_text):
         self.driver.switch_to.window(self.db_win)
         fluent_wait = WebDriverWait(self.driver, self.__WAIT_SHORT, poll_frequency=.5, ignored_exceptions=[ElementNotVisibleException, ElementNotSelectableException])
@@ -554,7 +712,9 @@ class WebHandler():
         table_name_input.send_keys(table_name)
 
         table_input = fluent_wait.until(EC.presence_of_element_located((By.XPATH, "//div[@id='textToDDLModal']//*[starts-with(@class,'modal-body')]//*[starts-with(@id,'ember')]/textarea")))
-        table_input.send_keys(table_text)
+        #typing a large table key by key is most of the time it takes to build a fiddle
+        if not self.inject_text(table_input, table_text):
+            table_input.send_keys(table_text)
         append_button = WebDriverWait(self.driver, self.__WAIT_SHORT).until(EC.element_to_be_clickable((By.XPATH, "//div[@id='textToDDLModal']//*[starts-with(@class,'modal-body')]/button[2]")))
         append_button.click()
 
@@ -595,21 +755,25 @@ class WebHandler():
         return end_url
 
     def open_fork(self, q_num, db_public_url):
+        '''
+        Can be cancelled up until the public fiddle is forked
+        '''
         self.open_leetcode_win(q_num)
         self.open_db_win(db_public_url)
+        self.check_cancelled()
         forked_url = self.db_fiddle_fork()
         self.click_query_table()
-        self.driver.switch_to.window(self.leet_win)
+        self.switch_to_leetcode_win()
         return forked_url
 
     def open_question(self, q_num, db_engine, is_check_new_save_versions, db_prev_url=None):
         '''
         Opens the leetcode.jp problem, and a db-fiddle of that problem
+        If cancel_event is set, QuestionCancelled is raised between steps, up until the new db-fiddle is saved
         '''
-        self.open_leetcode_win(q_num)
-
         #a db fiddle has already been created
         if db_prev_url is not None and self.is_valid_save_url(db_prev_url):
+            self.open_leetcode_win(q_num)
             if is_check_new_save_versions:
                 db_start_url = self.open_newest_fiddle_url(db_prev_url)
             else:
@@ -618,19 +782,64 @@ class WebHandler():
 
         #no db-fiddle has been created yet
         else:
-            self.open_db_win()
-            self.db_fiddle_select_engine(db_engine)
-            try:
-                #parse the sql tables from leetcode.jp
-                table_names, tables_text = self.TableParser(self.driver).parse_leetcode_tables(self.leet_win)
-            #couldn't find sql tables to parse
-            except (NoSuchElementException, IndexError) as e:
+            db_start_url = self.create_fiddle(q_num, db_engine)
+            if db_start_url is None:
                 return None
-            #dump parsed tables onto db fiddle
+        self.click_query_table()
+        self.switch_to_leetcode_win()
+        return db_start_url
+
+    def create_fiddle(self, q_num, db_engine):
+        '''
+        Both tabs start loading together, and the tables are parsed while db-fiddle's scripts boot, in a thread if no browser is needed, otherwise from the leetcode tab before waiting on db-fiddle.
+        So the tables are ready about when db-fiddle is, instead of being parsed after it.
+        Returns the saved fiddle url, or None if there are no tables to parse
+        '''
+        self.phase_times = OrderedDict()
+        start = time.perf_counter()
+        table_parse = self.start_table_parse(q_num)
+        self.open_leetcode_win(q_num)
+        self.open_db_win()
+        self.phase_times['navigate'] = time.perf_counter() - start
+        try:
+            tables = None
+            if table_parse is None:
+                tables = self.parse_leetcode_tables(q_num)
+                self.phase_times['parse'] = time.perf_counter() - start
+            self.check_cancelled()
+            self.db_fiddle_select_engine(db_engine)
+            self.phase_times['fiddle_ready'] = time.perf_counter() - start
+            if table_parse is not None:
+                #the thread parses without the browser
+                self.parse_command_count = 0
+                tables = table_parse.get_tables()
+                self.phase_times['parse'] = table_parse.finished - start
+                #the http fetch failed, so only the leetcode tab is left. It's opened now if this handler skipped it
+                if tables is None:
+                    tables = self.parse_tab_tables(q_num)
+                    self.phase_times['parse'] = time.perf_counter() - start
+        #couldn't find sql tables to parse
+        except (NoSuchElementException, IndexError) as e:
+            return None
+        table_names, tables_text = tables
+        self.check_cancelled()
+        #dump parsed tables onto db fiddle, one Text to DDL modal per table if the schema can't be pasted
+        query_table = self.db_fiddle_schema_input(table_names, tables_text, db_engine)
+        if query_table is None:
             for i, table_text in enumerate(tables_text):
+                self.check_cancelled()
                 self.db_fiddle_table_input(table_names[i], table_text)
-            self.db_fiddle_query_input(table_names[0])
-            db_start_url = self.db_fiddle_save()
-        self.click_query_table()
-        self.driver.switch_to.window(self.leet_win)
+            query_table = table_names[0]
+        self.db_fiddle_query_input(query_table)
+        self.phase_times['tables'] = time.perf_counter() - start
+        #last chance to cancel, nothing has been saved to db-fiddle.com yet
+        self.check_cancelled()
+        db_start_url = self.db_fiddle_save()
+        self.phase_times['save'] = time.perf_counter() - start
         return db_start_url
+
+    def get_phase_msg(self):
+        '''
+        When each phase of the last new fiddle finished, in ms since its tabs started loading. Phases that overlap, parse and fiddle_ready, can finish in either order
+        '''
+        return ', '.join('{}: {:.0f} ms'.format(phase, seconds * 1000) for phase, seconds in self.phase_times.items())
@@ -32,7 +32,19 @@ cfg = dict(
     is_fork_public_url = True,
     is_preload = True,
     n_to_preload = 1,
-    n_same_level_to_preload = 1
+    n_same_level_to_preload = 1,
+    n_preload_drivers = 2,
+    is_lean_preload = True,
+    is_predictive_preload = True,
+    n_standby_questions = 2,
+    standby_max_bytes = 256 * 1024 * 1024,
+    rate_limits = {'leetcode.jp': (20, 10), 'db-fiddle.com': (20, 10), 'github.com': (10, 3)},
+    is_browserless_parse = True,
+    page_cache_max_bytes = 20 * 1024 * 1024,
+    page_cache_days_till_stale = 13,
+    is_sandbox_file_backed = False,
+    is_persistent_profile = False,
+    profile_max_bytes = 500 * 1024 * 1024
 )
 """
 
@@ -0,0 +1,101 @@
+'''
+Unit tests for daemon mode, sending commands over the unix socket to a daemon running a stand-in for Leetcode, no browser needed.
+'''
+import os
+import time
+import tempfile
+import unittest
+import threading
+
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sister_dir = os.path.join(parent_dir, 'leetcode_sql_unlocked/')
+os.sys.path.insert(0, sister_dir)
+from src.daemon import LeetcodeDaemon, send_command, get_socket_path, is_daemon_running
+
+class Question:
+    name = '176: Second Highest Salary, easy'
+
+class FakeLeetcode:
+    '''
+    Prints and returns like Leetcode.options()
+    '''
+    def __init__(self):
+        self.is_pause = True
+        self.commands = []
+
+    @staticmethod
+    def clean_user_input(user_input):
+        return ' '.join(user_input.split()).lower()
+
+    def get_current_q(self):
+        return Question()
+
+    def options(self, user_input):
+        self.commands.append(user_input)
+        if user_input == 'boom':
+            raise ValueError('boom')
+        if user_input == 'e':
+            print('Exiting program')
+            return False
+        print('ran ' + user_input)
+        return True
+
+class TestDaemon(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.socket_path = get_socket_path(self.tmp_dir.name)
+        self.lc = FakeLeetcode()
+        self.daemon = LeetcodeDaemon(self.socket_path)
+        self.daemon.bind()
+        self.thread = threading.Thread(target=self.daemon.serve_forever, args=(self.lc,), daemon=True)
+        self.thread.start()
+
+    def tearDown(self):
+        if self.thread.is_alive():
+            send_command(self.socket_path, 'e', timeout=5)
+        self.thread.join(5)
+        self.tmp_dir.cleanup()
+
+    def test_commands(self):
+        output = send_command(self.socket_path, 'd e 5', timeout=5)
+        self.assertIn('ran d e 5', output)
+        self.assertIn('You are on 176: Second Highest Salary, easy', output)
+        self.assertFalse(self.lc.is_pause)
+        #the console needs a terminal, it never reaches options()
+        self.assertIn('needs a terminal', send_command(self.socket_path, 'console', timeout=5))
+        #a failed command is reported, and the daemon keeps running
+        self.assertIn('ValueError: boom', send_command(self.socket_path, 'boom', timeout=5))
+        self.assertIn('ran n', send_command(self.socket_path, 'n', timeout=5))
+        self.assertEqual(self.lc.commands, ['d e 5', 'boom', 'n'])
+
+    def test_exit(self):
+        self.assertIn('Exiting program', send_command(self.socket_path, 'e', timeout=5))
+        self.thread.join(5)
+        self.assertFalse(self.thread.is_alive())
+        self.assertFalse(os.path.exists(self.socket_path))
+        with self.assertRaises(OSError):
+            send_command(self.socket_path, 'n', timeout=5)
+
+    def test_one_daemon(self):
+        with self.assertRaises(FileExistsError):
+            LeetcodeDaemon(self.socket_path).bind()
+        self.assertIn('ran h', send_command(self.socket_path, 'h', timeout=5))
+
+    def test_stale_socket(self):
+        send_command(self.socket_path, 'e', timeout=5)
+        self.thread.join(5)
+        #left behind by a daemon that was killed
+        open(self.socket_path, 'w').close()
+        self.assertFalse(is_daemon_running(self.socket_path))
+        self.daemon = LeetcodeDaemon(self.socket_path)
+        self.daemon.bind()
+        self.thread = threading.Thread(target=self.daemon.serve_forever, args=(self.lc,), daemon=True)
+        self.thread.start()
+        start = time.perf_counter()
+        self.assertIn('ran n', send_command(self.socket_path, 'n', timeout=5))
+        #no browser or question list to wait on
+        self.assertLess(time.perf_counter() - start, 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+'''
+Unit tests for finding the newest saved version of a fiddle, with a galloping then binary search over the version numbers.
+db-fiddle is stood in for by a fake http fetch, and a fake fiddle tab when http can't tell, no browser or network needed.
+'''
+import math
+import os
+import unittest
+from unittest.mock import patch
+
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sister_dir = os.path.join(parent_dir, 'leetcode_sql_unlocked/')
+os.sys.path.insert(0, sister_dir)
+from src.web_handler import WebHandler
+from test.test_web_handler_tabs import FakeDriver
+
+BASE_URL = 'https://www.db-fiddle.com/f/abc/'
+
+class FiddleTabDriver(FakeDriver):
+    '''
+    A tab on a missing version shows db-fiddle.com, a saved version shows its schema
+    '''
+    def __init__(self, newest):
+        super().__init__()
+        self.newest = newest
+
+    def execute_script(self, script, *args):
+        if 'CodeMirror.getValue' in script:
+            self.command_count += 1
+            url = self.urls[self.current_window_handle]
+            return 'saved' if int(url.rsplit('/', 1)[1]) <= self.newest else 'missing'
+        return super().execute_script(script, *args)
+
+def get_fetch_final_url(newest, is_redirected=True):
+    '''
+    db-fiddle over http, missing versions redirect home only if is_redirected
+    '''
+    def fetch_final_url(url, timeout=10):
+        if is_redirected and int(url.rsplit('/', 1)[1]) > newest:
+            return WebHandler.FIDDLE_HOME
+        return url
+    return fetch_final_url
+
+class TestFiddleVersions(unittest.TestCase):
+
+    def get_web_handler(self, newest):
+        self.driver = FiddleTabDriver(newest)
+        with patch('src.web_handler.Driver.get_driver', return_value=self.driver):
+            return WebHandler('chromedriver', headless=True)
+
+    def test_over_http(self):
+        for known, newest in ((0, 0), (0, 1), (3, 20), (0, 100)):
+            web_handler = self.get_web_handler(newest)
+            with patch('src.web_handler.fetch_final_url', side_effect=get_fetch_final_url(newest)) as fetch:
+                self.assertEqual(web_handler.open_newest_fiddle_url(BASE_URL + str(known)), BASE_URL + str(newest))
+            #log n probes, plus the one that checks db-fiddle redirects over http
+            self.assertLessEqual(web_handler.version_probe_count, 2 * math.ceil(math.log2(newest - known + 2)))
+            self.assertEqual(fetch.call_count, web_handler.version_probe_count + 1)
+            #only the newest version is opened
+            self.assertEqual(self.driver.urls, {'win-0': BASE_URL + str(newest)})
+
+    def test_in_tab(self):
+        web_handler = self.get_web_handler(20)
+        with patch('src.web_handler.fetch_final_url', side_effect=get_fetch_final_url(20, is_redirected=False)):
+            self.assertEqual(web_handler.open_newest_fiddle_url(BASE_URL + '3'), BASE_URL + '20')
+        self.assertFalse(web_handler.is_http_version_check)
+        #every probe reused the fiddle tab
+        self.assertEqual(self.driver.n_opened, 0)
+        self.assertEqual(self.driver.urls, {'win-0': BASE_URL + '20'})
+
+    def test_http_failure_falls_back_to_tab(self):
+        web_handler = self.get_web_handler(5)
+        with patch('src.web_handler.fetch_final_url', side_effect=OSError):
+            self.assertEqual(web_handler.open_newest_fiddle_url(BASE_URL + '0'), BASE_URL + '5')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,93 @@
+'''
+Unit tests for starting the browser lazily, in the background while the user reads the first prompt. Commands that don't need the browser run right away, the first one that does waits for the start up.
+Assumes setup.py has already been run. Chrome is stood in for by a fake webdriver that takes until the test lets it start, no browser needed.
+'''
+import os
+import time
+import threading
+import unittest
+from unittest.mock import patch
+
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sister_dir = os.path.join(parent_dir, 'leetcode_sql_unlocked/')
+os.sys.path.insert(0, sister_dir)
+from src.leetcode import Leetcode
+from test.test_web_handler_tabs import FakeDriver
+from test.test_sandbox_option import get_leetcode
+
+class TestLazyStart(unittest.TestCase):
+
+    def setUp(self):
+        self.lc = get_leetcode(self)
+        self.driver = FakeDriver()
+        self.is_chrome_starting = threading.Event()
+        self.is_chrome_up = threading.Event()
+        self.addCleanup(self.is_chrome_up.set)
+        def get_driver(*args, **kwargs):
+            self.is_chrome_starting.set()
+            self.is_chrome_up.wait(5)
+            return self.driver
+        self.get_driver = self.start_patch(patch('src.web_handler.Driver.get_driver', side_effect=get_driver))
+        #opening a question is tested with the web handler, here only which thread uses the browser and when matters
+        self.questions = []
+        def start_new_question(lc, q_level=None, q_num=None, is_startup=False):
+            self.questions.append((threading.current_thread().name, lc.web_handler.driver))
+        self.start_patch(patch.object(Leetcode, 'start_new_question', autospec=True, side_effect=start_new_question))
+
+    def start_patch(self, patcher):
+        mock = patcher.start()
+        self.addCleanup(patcher.stop)
+        return mock
+
+    def test_browser_free_commands(self):
+        self.lc.start()
+        self.assertTrue(self.is_chrome_starting.wait(5))
+        start = time.perf_counter()
+        for user_input in ('h', 'd', 'd e 3'):
+            self.assertTrue(self.lc.options(user_input))
+        self.assertLess(time.perf_counter() - start, 1)
+        self.assertFalse(self.lc.is_started())
+        #chrome is still starting, from the start up thread only
+        self.assertEqual(self.get_driver.call_count, 1)
+        self.assertEqual(self.questions, [])
+
+    def test_first_browser_command_joins_once(self):
+        self.lc.start()
+        startup_thread = self.lc.startup_thread
+        with patch.object(startup_thread, 'join', wraps=startup_thread.join) as join:
+            self.is_chrome_up.set()
+            self.lc.options('n')
+            self.assertEqual(join.call_count, 1)
+            self.assertTrue(self.lc.is_started())
+            self.lc.options('n e')
+            self.lc.options('l off')
+            self.assertEqual(join.call_count, 1)
+        #the browser started once and was reused by every command
+        self.assertEqual(self.get_driver.call_count, 1)
+        self.assertEqual([name for name, _ in self.questions], ['browser-startup', 'MainThread', 'MainThread'])
+        self.assertTrue(all(driver is self.driver for _, driver in self.questions))
+
+class TestStartupQuestionUpdates(unittest.TestCase):
+    '''
+    The real start_new_question(), with the question's tabs left unopened
+    '''
+    def setUp(self):
+        self.lc = get_leetcode(self)
+        no_op = lambda *args, **kwargs: False
+        for patcher in (patch('src.web_handler.Driver.get_driver', return_value=FakeDriver()), patch.multiple(Leetcode, close_current_question=no_op, open_new_question=no_op, measure_standby_question_bytes=no_op, refresh_standby=no_op)):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_applied_on_main_thread(self):
+        #found by the background refresh before the start up
+        self.lc.pending_q_elements = {177: {'level': 'medium', 'name': '177: Nth Highest Salary, medium'}}
+        self.lc.start()
+        self.lc.startup_thread.join()
+        #left for the main thread, display may have been reading question_nodes
+        self.assertFalse(self.lc.question_nodes.is_q_exist(177))
+        self.lc.options('n')
+        self.assertTrue(self.lc.question_nodes.is_q_exist(177))
+        self.assertIsNone(self.lc.pending_q_elements)
+
+if __name__ == '__main__':
+    unittest.main()
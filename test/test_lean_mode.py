@@ -0,0 +1,96 @@
+'''
+Unit tests for lean mode, the chrome arguments and host rules that leave out images, fonts, ads and analytics, and the request blocking sent to every tab before its page loads.
+A stand-in for the chrome webdriver keeps track of which tabs block requests, no browser needed.
+'''
+import os
+import unittest
+from unittest.mock import patch, MagicMock
+
+from selenium.common.exceptions import WebDriverException
+
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sister_dir = os.path.join(parent_dir, 'leetcode_sql_unlocked/')
+os.sys.path.insert(0, sister_dir)
+from src.driver import Driver
+from src.web_handler import WebHandler
+from test.test_web_handler_tabs import FakeDriver
+
+class LeanDriver(FakeDriver):
+    '''
+    Keeps the blocked urls of each tab, and whether each page was loaded after they were set
+    '''
+    def __init__(self):
+        super().__init__()
+        self.blocked = {}
+        self.is_loaded_blocked = {}
+
+    def execute_cdp_cmd(self, cmd, params):
+        if cmd == 'Network.setBlockedURLs':
+            self.blocked[self.current_window_handle] = params['urls']
+        return super().execute_cdp_cmd(cmd, params)
+
+    def execute_script(self, script, *args):
+        if 'location.href' in script:
+            self.is_loaded_blocked[self.current_window_handle] = self.current_window_handle in self.blocked
+        return super().execute_script(script, *args)
+
+class TestLeanMode(unittest.TestCase):
+
+    def get_arguments(self, is_lean):
+        with patch('src.driver.CountingChrome') as chrome, patch('src.driver.EventFiringWebDriver'):
+            #an existing path, so no driver is downloaded
+            Driver.get_driver(os.path.abspath(__file__), headless=True, is_lean=is_lean)
+        return chrome.call_args[1]['options'].arguments
+
+    def test_arguments(self):
+        arguments = self.get_arguments(is_lean=True)
+        for argument in Driver.LEAN_ARGUMENTS:
+            self.assertIn(argument, arguments)
+        host_rules = next(argument for argument in arguments if argument.startswith('--host-resolver-rules='))
+        for host in Driver.LEAN_BLOCKED_HOSTS:
+            self.assertIn('MAP {} 0.0.0.0'.format(host), host_rules)
+        self.assertFalse(set(self.get_arguments(is_lean=False)) & set(Driver.LEAN_ARGUMENTS))
+
+    def test_every_tab_blocked(self):
+        driver = LeanDriver()
+        with patch('src.web_handler.Driver.get_driver', return_value=driver):
+            web_handler = WebHandler('chromedriver', headless=True, is_lean=True)
+        #the tab chrome started with
+        self.assertEqual(driver.blocked, {'win-0': Driver.LEAN_BLOCKED_URLS})
+        #a preload handler's problem and fiddle tabs, the first takes the starting tab
+        web_handler.open_tab(WebHandler.PROBLEM_TAB, web_handler.get_leetcode_url(176))
+        web_handler.open_tab(WebHandler.FIDDLE_TAB, 'https://www.db-fiddle.com/f/a/0')
+        #standby tabs, opened in the background
+        curr_win = driver.current_window_handle
+        web_handler.open_standby(177, 'https://www.db-fiddle.com/f/b/0')
+        self.assertEqual(driver.current_window_handle, curr_win)
+
+        self.assertEqual(len(driver.urls), 4)
+        for win, url in driver.urls.items():
+            self.assertEqual(driver.blocked.get(win), Driver.LEAN_BLOCKED_URLS, url)
+            #blocked before the page started loading
+            self.assertTrue(driver.is_loaded_blocked[win], url)
+        self.assertEqual(sorted(driver.urls.values()), sorted([web_handler.get_leetcode_url(176), web_handler.get_leetcode_url(177), 'https://www.db-fiddle.com/f/a/0', 'https://www.db-fiddle.com/f/b/0']))
+
+    def test_block_failed(self):
+        driver = LeanDriver()
+        driver.execute_cdp_cmd = MagicMock(side_effect=WebDriverException('no devtools'))
+        profiles = MagicMock()
+        with patch('src.web_handler.Driver.get_driver', return_value=driver):
+            with self.assertRaises(WebDriverException):
+                WebHandler('chromedriver', headless=True, is_lean=True, profiles=profiles)
+        #chrome quit, and its profile free for the next handler
+        self.assertEqual(driver.urls, {})
+        profiles.release.assert_called_once_with(profiles.acquire.return_value)
+
+    def test_not_lean(self):
+        driver = LeanDriver()
+        with patch('src.web_handler.Driver.get_driver', return_value=driver):
+            web_handler = WebHandler('chromedriver', headless=False)
+        web_handler.open_standby(177, 'https://www.db-fiddle.com/f/b/0')
+        self.assertEqual(driver.blocked, {})
+        #opened straight on the page
+        self.assertEqual(driver.is_loaded_blocked, {})
+
+if __name__ == '__main__':
+    unittest.main()
@@ -15,6 +15,7 @@ parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sister_dir = os.path.join(parent_dir, 'leetcode_sql_unlocked/')
 os.sys.path.insert(0, sister_dir)
 import leetcode_sql_unlocked
+from src.rate_limiter import DEFAULT_RATE_LIMITS
 
 class TestLeetcodeOptions(unittest.TestCase):
 
@@ -97,24 +98,23 @@ class TestLeetcodeOptions(unittest.TestCase):
         for user_input in user_inputs:
             self.options(user_input)
 
-    def test_preloading_delay(self):
-        print('\n-------------Checking preload delays lasting correct duration----')
+    def test_rate_limiter(self):
+        print('\n-------------Checking requests past the burst wait for the rate limiter----')
         self.options('load on')
+        url = 'https://www.db-fiddle.com/'
+        per_minute, burst = self.lc.cfg.get('rate_limits', DEFAULT_RATE_LIMITS)['db-fiddle.com']
+        self.lc.rate_limiter.buckets['db-fiddle.com'].tokens = burst
 
         a = datetime.now()
-        self.lc.preload_delay(10)
-        b = datetime.now()
-        self.assertTrue((b-a).total_seconds() >= 8)
-
-        a = datetime.now()
-        self.lc.preload_delay(5)
+        for _ in range(burst):
+            self.lc.rate_limiter.wait(url)
         b = datetime.now()
         self.assertTrue((b-a).total_seconds() <= 3)
 
         a = datetime.now()
-        self.lc.preload_delay(100)
+        self.lc.rate_limiter.wait(url)
         b = datetime.now()
-        self.assertTrue((b-a).total_seconds() >= 30)
+        self.assertTrue((b-a).total_seconds() >= 60 / per_minute - 1)
 
 if __name__ == '__main__':
     unittest.main()
@@ -225,24 +225,28 @@ class TestLeetcode(unittest.TestCase):
         self.assertTrue(self.in_url_keys([q_num, 534, 577]))
         self.assertTrue(self.is_current_question_match(q_num))
 
-        #while preload originally includes both 578 and 584, when turning load off, only the current preloaded question (578) should be finished
+        #while preload originally includes both 578 and 584, when turning load off, the questions being preloaded are cancelled before their db-fiddle is saved
+        #a question that was already saved is kept, and must have a valid saved url, not a half made fiddle
         user_input = '577'
         self.options(user_input)
         q_num = int(user_input)
         self.assertTrue(self.is_current_question_match(q_num))
         self.options('load off')
-        self.assertTrue(self.in_url_keys([q_num, 578]))
-        self.assertFalse(self.in_url_keys([584]))
+        self.assertTrue(self.in_url_keys([q_num]))
+        for preload_num in (578, 584):
+            if self.in_url_keys([preload_num]):
+                self.assertTrue(self.lc.web_handler.is_valid_save_url(self.get_q_state()['url'][preload_num]))
 
         #Check that after turning load off, that after user goes to 578, nothing is loaded in the background
         url_keys = self.get_q_state()['url'].keys()
         len1 = len(url_keys)
+        is_578_preloaded = self.in_url_keys([578])
         user_input = '578'
         self.options(user_input)
         q_num = int(user_input)
         self.assertTrue(self.is_current_question_match(q_num))
         len2 = len(url_keys)
-        self.assertTrue(len1 == len2)
+        self.assertTrue(len2 == len1 + (0 if is_578_preloaded else 1))
 
         #Check that after going to 579, url dictionary only increaed by one, similiar to the check above
         user_input = '579'
@@ -250,7 +254,7 @@ class TestLeetcode(unittest.TestCase):
         q_num = int(user_input)
         self.assertTrue(self.is_current_question_match(q_num))
         len3 = len(url_keys)
-        self.assertTrue(len1 == len3-1)
+        self.assertTrue(len2 == len3-1)
 
         #turn load back on, go to 586, testing if preload is only 1 problem since it happens to be both the next problem, and the next level problem
         self.options('load on')
@@ -0,0 +1,106 @@
+'''
+Unit tests for ranking preload candidates from the navigation history.
+'''
+import os
+import unittest
+import tempfile
+
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sister_dir = os.path.join(parent_dir, 'leetcode_sql_unlocked/')
+os.sys.path.insert(0, sister_dir)
+from src.nav_history import NavigationHistory, NEXT, NEXT_LEVEL, JUMP
+from src.questions import QuestionNodes
+
+LEVELS = ['easy', 'medium', 'hard', 'medium', 'easy', 'hard', 'medium']
+
+def get_question_elements(n=70):
+    return {q_num: {'level': LEVELS[q_num % len(LEVELS)], 'name': '{}: q, {}'.format(q_num, LEVELS[q_num % len(LEVELS)])} for q_num in range(1, n + 1)}
+
+class TestNavigationHistory(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.history_path = os.path.join(self.tmp_dir.name, 'nav_history.log')
+        self.history = NavigationHistory(self.history_path)
+        self.question_nodes = QuestionNodes(get_question_elements(), 1)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def move(self, history, action, level=None, q_num=None, preloaded=()):
+        from_q_num = self.question_nodes.get_current_num()
+        if action == JUMP:
+            self.question_nodes.select_question_by_number(q_num)
+        else:
+            self.question_nodes.select_next_question(level)
+        to_q_num = self.question_nodes.get_current_num()
+        history.record(from_q_num, action, level, to_q_num, to_q_num in preloaded)
+        return to_q_num
+
+    def test_persisted(self):
+        self.move(self.history, NEXT, preloaded=[2])
+        self.move(self.history, JUMP, q_num=40)
+        history = NavigationHistory(self.history_path)
+        self.assertEqual(history.events, [(1, NEXT, None, 2), (2, JUMP, None, 40)])
+        self.assertEqual((history.hits, history.switches), (1, 2))
+        #session counts start over
+        self.assertIsNone(history.get_hit_rate_msg())
+        self.assertIn('1/2', self.history.get_hit_rate_msg())
+
+    def test_appended(self):
+        self.move(self.history, NEXT, preloaded=[2])
+        with open(self.history_path) as f:
+            log = f.read()
+        self.move(self.history, JUMP, q_num=40)
+        #the earlier switch isn't rewritten
+        with open(self.history_path) as f:
+            self.assertTrue(f.read().startswith(log))
+        #a line cut short by a crash
+        with open(self.history_path, 'a') as f:
+            f.write("(40, 'ne")
+        history = NavigationHistory(self.history_path)
+        self.assertEqual(history.events, [(1, NEXT, None, 2), (2, JUMP, None, 40)])
+        self.assertEqual((history.hits, history.switches), (1, 2))
+
+    def test_compacted(self):
+        n = NavigationHistory.COMPACT_FACTOR * NavigationHistory.MAX_EVENTS + 1
+        for i in range(n):
+            self.move(self.history, NEXT, preloaded=[2] if i == 0 else ())
+        history = NavigationHistory(self.history_path)
+        with open(self.history_path) as f:
+            self.assertEqual(len(f.readlines()), NavigationHistory.MAX_EVENTS + 1)
+        self.assertEqual(history.events, self.history.events)
+        #no switch lost or counted twice
+        for history in (history, NavigationHistory(self.history_path)):
+            self.assertEqual((history.hits, history.switches), (1, n))
+
+    def test_rank_jumps(self):
+        #the user keeps jumping from 3 to 40 and going on from there
+        for _ in range(5):
+            self.question_nodes.select_question_by_number(3)
+            self.move(self.history, JUMP, q_num=40)
+            self.move(self.history, NEXT)
+        self.question_nodes.select_question_by_number(3)
+        self.assertEqual(sorted(self.history.rank_questions(self.question_nodes, 2)), [4, 40])
+
+    def test_hit_rate_beats_default(self):
+        '''
+        The user alternates next easy and next hard, replayed with the same preload budget of 2
+        '''
+        def default_rank():
+            curr = self.question_nodes.get_current()
+            return [self.question_nodes.get_next_node(curr).number, self.question_nodes.get_next_node(curr, curr.level).number]
+
+        def replay(is_predictive):
+            self.question_nodes.select_question_by_number(1)
+            history = NavigationHistory(os.path.join(self.tmp_dir.name, 'replay_{}.log'.format(is_predictive)))
+            for i in range(40):
+                preloaded = history.rank_questions(self.question_nodes, 2) if is_predictive else default_rank()
+                self.move(history, NEXT_LEVEL, 'easy' if i % 2 else 'hard', preloaded=preloaded)
+            return history.session_hits
+
+        self.assertLess(replay(False), 20)
+        self.assertGreater(replay(True), 35)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,105 @@
+'''
+Unit tests for the on-disk leetcode.jp page snapshot cache, and the parse cache of tables parsed from those pages.
+'''
+import os
+import time
+import shutil
+import tempfile
+import unittest
+
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sister_dir = os.path.join(parent_dir, 'leetcode_sql_unlocked/')
+os.sys.path.insert(0, sister_dir)
+from src.page_cache import PageCache
+from src import parse_cache
+from src.parse_cache import ParseCache
+
+class TestPageCache(unittest.TestCase):
+
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.cache_dir)
+
+    def set_last_used(self, cache, q_num, seconds_ago):
+        for f in os.listdir(cache.cache_dir):
+            if f.startswith('{}-'.format(q_num)):
+                t = time.time() - seconds_ago
+                os.utime(os.path.join(cache.cache_dir, f), (t, t))
+
+    def test_round_trip(self):
+        cache = PageCache(self.cache_dir)
+        self.assertIsNone(cache.get(176))
+        self.assertNotIn(176, cache)
+        content_hash = cache.put(176, '<pre>| a |</pre>')
+        self.assertIn(176, cache)
+        self.assertEqual(cache.get_snapshot(176), ('<pre>| a |</pre>', content_hash))
+
+        #a new snapshot replaces the old one
+        cache.put(176, '<pre>| b |</pre>')
+        self.assertEqual(cache.get(176), '<pre>| b |</pre>')
+        self.assertEqual(len(os.listdir(self.cache_dir)), 1)
+        name = os.listdir(self.cache_dir)[0]
+        self.assertRegex(name, r'^176-\d{14}-[0-9a-f]{16}\.html\.gz$')
+
+    def test_stale(self):
+        cache = PageCache(self.cache_dir, days_till_stale=-1)
+        cache.put(176, '<pre>| a |</pre>')
+        self.assertIsNone(cache.get(176))
+        self.assertNotIn(176, cache)
+
+    def test_lru_eviction(self):
+        page = '<pre>{}</pre>'.format(os.urandom(2000).hex())
+        cache = PageCache(self.cache_dir)
+        cache.put(176, page)
+        size = os.path.getsize(os.path.join(self.cache_dir, os.listdir(self.cache_dir)[0]))
+        #room for exactly two snapshots
+        cache.max_bytes = size * 2 + size // 2
+
+        cache.put(177, page.replace('<pre>', '<pre>177'))
+        self.set_last_used(cache, 176, 20)
+        self.set_last_used(cache, 177, 10)
+        #176 is read, so 177 becomes the least recently used
+        self.assertIsNotNone(cache.get(176))
+        cache.put(178, page.replace('<pre>', '<pre>178'))
+        self.assertIn(176, cache)
+        self.assertNotIn(177, cache)
+        self.assertIn(178, cache)
+
+class TestParseCache(unittest.TestCase):
+
+    def setUp(self):
+        self.log_dir = tempfile.mkdtemp()
+        self.q_parse_path = os.path.join(self.log_dir, 'q_parse.log')
+
+    def tearDown(self):
+        shutil.rmtree(self.log_dir)
+
+    def test_round_trip(self):
+        cache = ParseCache(self.q_parse_path)
+        self.assertIsNone(cache.get(176, 'abc'))
+        cache.put(176, 'abc', ['plus', 'plus'], ['Employee', 'Result'], ['| a |', '| b |'])
+        self.assertEqual(cache.get(176, 'abc'), (['Employee', 'Result'], ['| a |', '| b |']))
+
+        #persisted across sessions
+        cache = ParseCache(self.q_parse_path)
+        self.assertEqual(cache.get(176, 'abc'), (['Employee', 'Result'], ['| a |', '| b |']))
+        self.assertEqual(cache.q_parse[176]['table_types'], ['plus', 'plus'])
+
+    def test_invalidation(self):
+        cache = ParseCache(self.q_parse_path)
+        cache.put(176, 'abc', ['plus', 'plus'], ['Employee', 'Result'], ['| a |', '| b |'])
+        #page changed
+        self.assertIsNone(cache.get(176, 'def'))
+
+        #parser changed
+        version = parse_cache.PARSER_VERSION
+        parse_cache.PARSER_VERSION = version + 1
+        try:
+            self.assertIsNone(cache.get(176, 'abc'))
+        finally:
+            parse_cache.PARSER_VERSION = version
+
+if __name__ == '__main__':
+    unittest.main()
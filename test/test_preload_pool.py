@@ -0,0 +1,105 @@
+'''
+Unit tests for the preload pool, with fake web handlers standing in for headless chrome.
+'''
+import os
+import time
+import unittest
+import threading
+
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sister_dir = os.path.join(parent_dir, 'leetcode_sql_unlocked/')
+os.sys.path.insert(0, sister_dir)
+from src.preload_pool import PreloadPool
+
+class FakeWebHandler:
+    def __init__(self):
+        self.is_closed = False
+
+    def close_all(self):
+        self.is_closed = True
+
+class TestPreloadPool(unittest.TestCase):
+
+    def setUp(self):
+        self.done = set()
+        self.lock = threading.Lock()
+        self.active = 0
+        self.max_active = 0
+        self.release = threading.Event()
+        self.release.set()
+        self.started = []
+        self.cancelled = set()
+
+    def preload_question(self, web_handler, q_num):
+        with self.lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+            self.started.append(q_num)
+        self.release.wait(5)
+        time.sleep(0.05)
+        with self.lock:
+            self.active -= 1
+            #like WebHandler.check_cancelled() before saving the db-fiddle
+            if self.pool.stop_event.is_set():
+                self.cancelled.add(q_num)
+            else:
+                self.done.add(q_num)
+
+    def get_pool(self, size):
+        self.pool = PreloadPool(FakeWebHandler, size, self.preload_question, lambda q_num: q_num in self.done)
+        self.addCleanup(self.pool.shutdown)
+        return self.pool
+
+    def test_parallel(self):
+        pool = self.get_pool(3)
+        self.assertEqual(pool.submit([1, 2, 3, 4, 5, 6]), [1, 2, 3, 4, 5, 6])
+        pool.wait()
+        self.assertEqual(self.done, {1, 2, 3, 4, 5, 6})
+        self.assertEqual(self.max_active, 3)
+        web_handlers = list(pool.web_handlers)
+        pool.shutdown()
+        self.assertTrue(all(web_handler.is_closed for web_handler in web_handlers))
+
+    def test_dedup(self):
+        pool = self.get_pool(2)
+        self.done.add(1)
+        self.release.clear()
+        self.assertEqual(pool.submit([1, 2, 3]), [2, 3])
+        #already queued or being worked on
+        self.assertEqual(pool.submit([2, 3, 4]), [4])
+        self.release.set()
+        pool.wait()
+        self.assertEqual(self.done, {1, 2, 3, 4})
+
+    def test_priority(self):
+        pool = self.get_pool(1)
+        self.release.clear()
+        pool.submit([1])
+        while not self.active:
+            time.sleep(0.01)
+        #queued while the worker is busy, taken off the queue in priority order
+        pool.submit([5, 3])
+        pool.submit([4])
+        self.release.set()
+        pool.wait()
+        self.assertEqual(self.started, [1, 5, 4, 3])
+
+    def test_cancel(self):
+        pool = self.get_pool(1)
+        self.release.clear()
+        pool.submit([1, 2, 3])
+        while not self.active:
+            time.sleep(0.01)
+        pool.cancel()
+        self.release.set()
+        pool.wait()
+        #the question in progress is cancelled, the queued ones are dropped
+        self.assertEqual(self.cancelled, {1})
+        self.assertEqual(self.done, set())
+        pool.resume()
+        self.assertEqual(pool.submit([1, 2, 3]), [1, 2, 3])
+        pool.wait()
+        self.assertEqual(self.done, {1, 2, 3})
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+'''
+Unit tests for ChromeProfiles, one profile per running driver, and keeping the profiles under the size cap, no browser needed.
+'''
+import os
+import time
+import tempfile
+import unittest
+
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sister_dir = os.path.join(parent_dir, 'leetcode_sql_unlocked/')
+os.sys.path.insert(0, sister_dir)
+from src.profiles import ChromeProfiles, get_dir_size
+
+def fill_profile(profile, cache_bytes, other_bytes):
+    '''
+    Stands in for what chrome writes to a profile
+    '''
+    cache_dir = os.path.join(profile.path, 'Default', 'Cache')
+    os.makedirs(cache_dir, exist_ok=True)
+    with open(os.path.join(cache_dir, 'data_1'), 'wb') as f:
+        f.write(b'c' * cache_bytes)
+    with open(os.path.join(profile.path, 'Default', 'Cookies'), 'wb') as f:
+        f.write(b'k' * other_bytes)
+
+class TestChromeProfiles(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.profiles = ChromeProfiles(self.tmp_dir.name, max_bytes=10000)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_one_profile_per_driver(self):
+        main = self.profiles.acquire()
+        preloads = [self.profiles.acquire('preload') for _ in range(2)]
+        self.assertEqual([main.name] + [p.name for p in preloads], ['main-0', 'preload-0', 'preload-1'])
+        #i.e. another instance of the program
+        other = ChromeProfiles(self.tmp_dir.name, max_bytes=10000)
+        self.assertEqual(other.acquire().name, 'main-1')
+        self.profiles.release(main)
+        self.assertEqual(other.acquire().name, 'main-0')
+
+    def test_all_in_use(self):
+        profiles = [self.profiles.acquire() for _ in range(ChromeProfiles.MAX_PROFILES)]
+        self.assertIsNone(self.profiles.acquire())
+        self.profiles.release(profiles[3])
+        self.assertEqual(self.profiles.acquire().name, 'main-3')
+
+    def test_cleanup_caches_first(self):
+        old, new = self.profiles.acquire(), self.profiles.acquire('preload')
+        fill_profile(old, 4500, 1000)
+        fill_profile(new, 4500, 1000)
+        #new is in use, so only old's cache is emptied
+        self.profiles.release(old)
+        self.profiles.release(new)
+        self.assertEqual(get_dir_size(self.tmp_dir.name), 6500)
+        self.assertTrue(os.path.exists(os.path.join(old.path, 'Default', 'Cookies')))
+        self.assertFalse(os.path.exists(os.path.join(old.path, 'Default', 'Cache')))
+        self.assertTrue(os.path.exists(os.path.join(new.path, 'Default', 'Cache')))
+
+    def test_cleanup_whole_profiles(self):
+        old, new = self.profiles.acquire(), self.profiles.acquire('preload')
+        fill_profile(old, 1000, 6000)
+        fill_profile(new, 1000, 6000)
+        self.profiles.release(old)
+        time.sleep(0.05)
+        self.profiles.release(new)
+        self.assertLessEqual(self.profiles.cleanup(), 10000)
+        self.assertFalse(os.path.exists(old.path))
+        self.assertTrue(os.path.exists(os.path.join(new.path, 'Default', 'Cookies')))
+        #a removed profile starts out empty the next time
+        self.assertEqual(get_dir_size(self.profiles.acquire().path), 0)
+
+if __name__ == '__main__':
+    unittest.main()
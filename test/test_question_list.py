@@ -0,0 +1,100 @@
+'''
+Unit tests for reading the leetcode.com database problem list.
+A saved problem list json in test/fixtures is served from a local http server that stands in for leetcode.com, or read from a stand-in for the chrome webdriver.
+'''
+import os
+import json
+import unittest
+import threading
+from http.server import HTTPServer, BaseHTTPRequestHandler
+from unittest.mock import patch
+
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sister_dir = os.path.join(parent_dir, 'leetcode_sql_unlocked/')
+os.sys.path.insert(0, sister_dir)
+from src.question_list import get_question_list_url, parse_question_list, fetch_question_elements
+from test.test_web_handler_tabs import FakeDriver
+
+FIXTURE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'leetcode_problems_database.json')
+
+class LeetcodeStandIn(BaseHTTPRequestHandler):
+    '''
+    Serves the saved problem list for /api/problems/database/, and a login page for anything else
+    '''
+    def do_GET(self):
+        if self.path == '/api/problems/database/':
+            with open(FIXTURE_PATH, 'rb') as f:
+                body, content_type = f.read(), 'application/json'
+        else:
+            body, content_type = b'<html><body>Sign in</body></html>', 'text/html'
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+class TestQuestionList(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(self):
+        self.server = HTTPServer(('127.0.0.1', 0), LeetcodeStandIn)
+        self.base_url = 'http://127.0.0.1:{}'.format(self.server.server_port)
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+
+    @classmethod
+    def tearDownClass(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_parse(self):
+        with open(FIXTURE_PATH) as f:
+            question_elements = parse_question_list(json.load(f))
+        #ordered by number, the record without a title is skipped
+        self.assertEqual(question_elements, {
+            176: {'level': 'easy', 'name': '176: Second Highest Salary, easy'},
+            177: {'level': 'medium', 'name': '177: Nth Highest Salary, medium'},
+            185: {'level': 'hard', 'name': '185: Department Top Three Salaries, hard'},
+            1068: {'level': 'easy', 'name': '1068: Product Sales Analysis I, easy'}})
+        self.assertEqual(list(question_elements), [176, 177, 185, 1068])
+
+    def test_fetch(self):
+        self.assertEqual(get_question_list_url(self.base_url), self.base_url + '/api/problems/database/')
+        question_elements = fetch_question_elements(self.base_url)
+        self.assertEqual(len(question_elements), 4)
+        self.assertEqual(question_elements[185]['level'], 'hard')
+
+    def test_not_question_list(self):
+        #i.e. redirected to a login page
+        with self.assertRaises(ValueError):
+            fetch_question_elements(self.base_url + '/accounts/login')
+
+class QuestionListDriver(FakeDriver):
+    '''
+    Every tab shows the saved problem list
+    '''
+    def execute_script(self, script, *args):
+        if 'innerText' in script:
+            self.command_count += 1
+            with open(FIXTURE_PATH) as f:
+                return f.read()
+        return super().execute_script(script, *args)
+
+class TestQuestionListFallback(unittest.TestCase):
+
+    def test_fetched_once(self):
+        #needs src/config.py, created by setup.py
+        from test.test_sandbox_option import get_leetcode
+        lc = get_leetcode(self)
+        for is_main_browser in (False, True):
+            with patch('src.question_list.fetch_html', side_effect=OSError) as fetch_html, patch('src.web_handler.Driver.get_driver', return_value=QuestionListDriver()):
+                question_elements = lc.get_question_elements(is_main_browser=is_main_browser)
+            self.assertEqual(len(question_elements), 4)
+            #the browser only reads the tab, it doesn't try http again
+            self.assertEqual(fetch_html.call_count, 1)
+
+if __name__ == '__main__':
+    unittest.main()
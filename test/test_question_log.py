@@ -0,0 +1,119 @@
+'''
+Unit tests for the sqlite backed question log, including the import of the old pprint log files.
+'''
+import os
+import time
+import pprint
+import sqlite3
+import unittest
+import tempfile
+import threading
+
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sister_dir = os.path.join(parent_dir, 'leetcode_sql_unlocked/')
+os.sys.path.insert(0, sister_dir)
+from src.log import QuestionLog
+
+def write_log(path, dict):
+    with open(path, 'w') as f:
+        pprint.pprint(dict, f)
+
+class TestQuestionLog(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.paths = [os.path.join(self.tmp_dir.name, name) for name in ('q_elements.log', 'q_state.log', 'q_public_urls.log')]
+        self.q_elements = {175: {'level': 'easy', 'name': '175: Combine Two Tables, easy'}, 176: {'level': 'easy', 'name': '176: Second Highest Salary, easy'}}
+        write_log(self.paths[2], {176: 'https://www.db-fiddle.com/f/32YsRKnUjtyy1qmYYbUAbn/0'})
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def open_log(self):
+        question_log = QuestionLog(*self.paths)
+        self.addCleanup(question_log.close)
+        return question_log
+
+    def test_new_log(self):
+        question_log = self.open_log()
+        self.assertEqual(question_log.q_state, {'current': 176, 'url': {}})
+        self.assertTrue(question_log.is_elements_stale())
+        self.assertTrue(question_log.is_q_public_exist(176))
+        self.assertEqual(question_log.merge_q_elements(self.q_elements), self.q_elements)
+        self.assertFalse(question_log.is_elements_stale())
+
+    def test_merge_elements(self):
+        question_log = self.open_log()
+        question_log.merge_q_elements(self.q_elements)
+        q_elements = {176: {'level': 'medium', 'name': '176: Second Highest Salary, medium'}, 177: {'level': 'medium', 'name': '177: Nth Highest Salary, medium'}}
+        #175 is no longer listed, but is kept
+        self.assertEqual(question_log.merge_q_elements({**q_elements, 175: self.q_elements[175]}), q_elements)
+        question_log.close()
+        self.assertEqual(self.open_log().q_elements, {**self.q_elements, **q_elements})
+
+    def test_migration(self):
+        write_log(self.paths[0], self.q_elements)
+        write_log(self.paths[1], {'current': 175, 'url': {175: 'https://www.db-fiddle.com/f/a/1'}})
+        #a month old question list is still stale after the import
+        os.utime(self.paths[0], (time.time() - 30 * 24 * 60 * 60,) * 2)
+        question_log = self.open_log()
+        self.assertEqual(question_log.q_elements, self.q_elements)
+        self.assertEqual(question_log.q_state, {'current': 175, 'url': {175: 'https://www.db-fiddle.com/f/a/1'}})
+        self.assertTrue(question_log.is_elements_stale())
+        question_log.update_q_state(176, 'https://www.db-fiddle.com/f/b/1')
+        question_log.close()
+
+        #the old log files are only imported once
+        write_log(self.paths[1], {'current': 175, 'url': {}})
+        question_log = self.open_log()
+        self.assertEqual(question_log.q_state, {'current': 176, 'url': {175: 'https://www.db-fiddle.com/f/a/1', 176: 'https://www.db-fiddle.com/f/b/1'}})
+
+    def test_public_urls_reimported(self):
+        self.open_log().close()
+        write_log(self.paths[2], {177: 'https://www.db-fiddle.com/f/c/0'})
+        os.utime(self.paths[2], (time.time() + 10,) * 2)
+        self.assertEqual(self.open_log().q_public_urls, {177: 'https://www.db-fiddle.com/f/c/0'})
+
+    def test_concurrent_updates(self):
+        question_log = self.open_log()
+        def update(start):
+            for q_num in range(start, start + 50):
+                question_log.update_q_url(q_num, 'https://www.db-fiddle.com/f/{}/0'.format(q_num))
+        threads = [threading.Thread(target=update, args=(start,)) for start in range(0, 200, 50)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        #a preloaded url never overwrites one already saved
+        self.assertFalse(question_log.add_q_url(0, 'https://www.db-fiddle.com/f/preload/0'))
+        self.assertTrue(question_log.add_q_url(500, 'https://www.db-fiddle.com/f/preload/0'))
+        question_log.close()
+        urls = self.open_log().q_state['url']
+        self.assertEqual(len(urls), 201)
+        self.assertEqual(urls[0], 'https://www.db-fiddle.com/f/0/0')
+
+    def test_coalesced_writes(self):
+        question_log = QuestionLog(*self.paths, flush_delay=0.3)
+        self.addCleanup(question_log.close)
+        def update(start):
+            for q_num in range(start, start + 25):
+                question_log.update_q_state(q_num, 'https://www.db-fiddle.com/f/{}/0'.format(q_num))
+        threads = [threading.Thread(target=update, args=(start,)) for start in range(0, 100, 25)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        time.sleep(0.6)
+        #all 100 updates landed inside one debounce window
+        self.assertEqual(question_log.flush_count, 1)
+        conn = sqlite3.connect(question_log.q_db_path)
+        self.assertEqual(conn.execute('SELECT COUNT(*) FROM q_urls').fetchone()[0], 100)
+        conn.close()
+
+        question_log.update_q_current(7)
+        question_log.close()
+        self.assertEqual(question_log.flush_count, 2)
+        self.assertEqual(self.open_log().q_state['current'], 7)
+
+if __name__ == '__main__':
+    unittest.main()
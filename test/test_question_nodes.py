@@ -0,0 +1,75 @@
+'''
+Unit tests for moving through QuestionNodes, next, next by level, and the next n questions, including wrapping around the end of the list.
+'''
+import os
+import unittest
+
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sister_dir = os.path.join(parent_dir, 'leetcode_sql_unlocked/')
+os.sys.path.insert(0, sister_dir)
+from src.questions import QuestionNodes
+
+#out of order, like the leetcode question list
+LEVELS = {181: 'easy', 175: 'easy', 176: 'easy', 177: 'medium', 178: 'medium', 180: 'medium', 185: 'hard', 182: 'easy', 184: 'medium'}
+
+class TestQuestionNodes(unittest.TestCase):
+
+    def setUp(self):
+        q_elements = {q_num: {'level': level, 'name': '{}: q, {}'.format(q_num, level)} for q_num, level in LEVELS.items()}
+        self.question_nodes = QuestionNodes(q_elements, 177)
+
+    def next_nums(self, n, level=None):
+        return [q.number for q in self.question_nodes.get_next_n_nodes(n, level)]
+
+    def test_order(self):
+        self.assertEqual((self.question_nodes.head.number, self.question_nodes.tail.number), (175, 185))
+        self.assertEqual(sorted(self.question_nodes._QuestionNodes__question_nodes.keys()), sorted(LEVELS))
+        self.assertEqual(self.question_nodes.get_current_num(), 177)
+        #invalid current question goes to the second question
+        self.assertEqual(QuestionNodes({175: {'level': 'easy', 'name': ''}, 176: {'level': 'easy', 'name': ''}}, 1).get_current_num(), 176)
+
+    def test_next(self):
+        self.question_nodes.select_next_question()
+        self.assertEqual(self.question_nodes.get_current_num(), 178)
+        self.question_nodes.select_next_question('hard')
+        self.assertEqual(self.question_nodes.get_current_num(), 185)
+        #wraps around
+        self.question_nodes.select_next_question()
+        self.assertEqual(self.question_nodes.get_current_num(), 175)
+        self.question_nodes.select_next_question('medium')
+        self.assertEqual(self.question_nodes.get_current_num(), 177)
+        self.assertEqual(self.question_nodes.get_current().next_same_lvl.number, 178)
+
+    def test_next_n(self):
+        self.assertEqual(self.next_nums(3), [178, 180, 181])
+        self.assertEqual(self.next_nums(3, 'easy'), [181, 182, 175])
+        self.assertEqual(self.next_nums(0, 'easy'), [])
+        #stops before repeating, the current question is last
+        self.assertEqual(self.next_nums(20, 'medium'), [178, 180, 184, 177])
+        self.assertEqual(self.next_nums(20, 'hard'), [185])
+        self.assertEqual(len(self.next_nums(20)), len(LEVELS))
+
+    def test_update_questions(self):
+        curr = self.question_nodes.get_current()
+        changes = {179: {'level': 'hard', 'name': '179: new, hard'}, 186: {'level': 'easy', 'name': '186: new, easy'}, 180: {'level': 'hard', 'name': '180: q, hard'}, 177: {'level': 'medium', 'name': 'renamed'}}
+        self.question_nodes.update_questions(changes)
+        #patched in place
+        self.assertIs(self.question_nodes.get_current(), curr)
+        self.assertEqual(curr.name, 'renamed')
+        self.assertEqual(self.question_nodes.tail.number, 186)
+        self.assertEqual(self.next_nums(3), [178, 179, 180])
+        self.assertEqual(self.next_nums(4, 'hard'), [179, 180, 185])
+        self.assertEqual(self.next_nums(3, 'medium'), [178, 184, 177])
+
+        #same as building from scratch
+        q_elements = {q_num: {'level': level, 'name': '{}: q, {}'.format(q_num, level)} for q_num, level in LEVELS.items()}
+        q_elements.update(changes)
+        question_nodes = QuestionNodes(q_elements, 177)
+        for q_num in q_elements:
+            self.question_nodes.select_question_by_number(q_num)
+            question_nodes.select_question_by_number(q_num)
+            for level in (None, 'easy', 'medium', 'hard'):
+                self.assertEqual(self.next_nums(10, level), [q.number for q in question_nodes.get_next_n_nodes(10, level)])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+'''
+Unit tests for the per host token bucket rate limiter, run against a fake clock.
+'''
+import os
+import unittest
+from threading import Event
+
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sister_dir = os.path.join(parent_dir, 'leetcode_sql_unlocked/')
+os.sys.path.insert(0, sister_dir)
+from src.rate_limiter import TokenBucket, RateLimiter
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+class TestRateLimiter(unittest.TestCase):
+
+    def test_token_bucket(self):
+        clock = FakeClock()
+        bucket = TokenBucket(rate=0.5, burst=3, clock=clock)
+        #the burst is free
+        self.assertEqual([bucket.reserve() for _ in range(3)], [0, 0, 0])
+        #after that, each request waits for the next token in line
+        self.assertEqual(bucket.reserve(), 2)
+        self.assertEqual(bucket.reserve(), 4)
+        #idle time refills the bucket, but never past the burst
+        clock.now = 100
+        self.assertEqual([bucket.reserve() for _ in range(4)], [0, 0, 0, 2])
+
+    def test_hosts(self):
+        clock = FakeClock()
+        rate_limiter = RateLimiter({'db-fiddle.com': (60, 1), 'leetcode.jp': (30, 1)}, clock=clock)
+        self.assertIs(rate_limiter.get_bucket('https://www.db-fiddle.com/f/abc/1'), rate_limiter.buckets['db-fiddle.com'])
+        self.assertIs(rate_limiter.get_bucket('https://leetcode.jp/problemdetail.php?id=176'), rate_limiter.buckets['leetcode.jp'])
+        self.assertIsNone(rate_limiter.get_bucket('https://notdb-fiddle.com/'))
+        self.assertIsNone(rate_limiter.get_bucket('https://www.google.com/search?q=sql'))
+        #each host has its own bucket, unlimited hosts never wait
+        self.assertEqual(rate_limiter.get_bucket('https://www.db-fiddle.com/').reserve(), 0)
+        self.assertEqual(rate_limiter.get_bucket('https://leetcode.jp/').reserve(), 0)
+        self.assertEqual(rate_limiter.get_bucket('https://www.db-fiddle.com/').reserve(), 1)
+        self.assertEqual(rate_limiter.get_bucket('https://leetcode.jp/').reserve(), 2)
+        self.assertEqual(rate_limiter.wait('https://www.google.com/'), 0)
+
+    def test_try_request(self):
+        clock = FakeClock()
+        rate_limiter = RateLimiter({'db-fiddle.com': (60, 2)}, clock=clock)
+        self.assertEqual([rate_limiter.try_request('https://www.db-fiddle.com/') for _ in range(3)], [True, True, False])
+        #a skipped request doesn't reserve a token, so the next request in line doesn't wait for it
+        self.assertEqual(rate_limiter.get_bucket('https://www.db-fiddle.com/').reserve(), 1)
+        clock.now = 10
+        self.assertTrue(rate_limiter.try_request('https://www.db-fiddle.com/'))
+        self.assertTrue(rate_limiter.try_request('https://www.google.com/'))
+
+    def test_try_requests(self):
+        clock = FakeClock()
+        rate_limiter = RateLimiter({'db-fiddle.com': (60, 1), 'leetcode.jp': (60, 2)}, clock=clock)
+        urls = ['https://leetcode.jp/problemdetail.php?id=177', 'https://www.db-fiddle.com/f/b/0', 'https://www.google.com/']
+        self.assertTrue(rate_limiter.try_requests(urls))
+        #db-fiddle is out of tokens, so leetcode.jp's is given back
+        self.assertFalse(rate_limiter.try_requests(urls))
+        self.assertEqual([rate_limiter.try_request(urls[0]) for _ in range(2)], [True, False])
+        clock.now = 1
+        self.assertTrue(rate_limiter.try_requests(urls[1:]))
+
+    def test_cancelled_wait_refunded(self):
+        clock = FakeClock()
+        rate_limiter = RateLimiter({'db-fiddle.com': (60, 1)}, clock=clock)
+        self.assertEqual(rate_limiter.wait('https://www.db-fiddle.com/'), 0)
+        #preload requests in line behind the burst, cancelled before their turn
+        stop_event = Event()
+        stop_event.set()
+        for _ in range(5):
+            rate_limiter.wait('https://www.db-fiddle.com/', stop_event)
+        #the user's request only waits for the next token, not for the cancelled ones
+        self.assertEqual(rate_limiter.get_bucket('https://www.db-fiddle.com/').reserve(), 1)
+
+if __name__ == '__main__':
+    unittest.main()
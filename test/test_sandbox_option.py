@@ -0,0 +1,81 @@
+'''
+Unit tests for the 'c' option, the current question's tables are loaded into a local sqlite console over http or from the page cache, without starting or waiting on the browser.
+Assumes setup.py has already been run. leetcode.jp is stood in for by a saved page, no browser or network needed.
+'''
+import os
+import pprint
+import tempfile
+import threading
+import unittest
+from unittest.mock import patch
+
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sister_dir = os.path.join(parent_dir, 'leetcode_sql_unlocked/')
+os.sys.path.insert(0, sister_dir)
+from src.leetcode import Leetcode
+from src.exc_thread import ExcThread
+from src.sandbox import SqliteSandbox
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+CFG = dict(db_engine=0, is_save_before_closing=False, is_check_new_save_versions=False, is_fork_public_url=True, is_preload=False, n_standby_questions=0, is_browserless_parse=True)
+
+def read_fixture(q_num):
+    with open(os.path.join(FIXTURE_DIR, 'leetcode_jp_{}.html'.format(q_num)), encoding='utf-8') as f:
+        return f.read()
+
+def get_leetcode(test_case, **kwargs):
+    '''
+    A Leetcode on a saved question list of 175 and 176, current on 176, whose logs are removed after the test
+    '''
+    tmp_dir = tempfile.TemporaryDirectory()
+    test_case.addCleanup(tmp_dir.cleanup)
+    paths = [os.path.join(tmp_dir.name, name) for name in ('q_elements.log', 'q_state.log', 'q_public_urls.log')]
+    for path, log in zip(paths, ({175: {'level': 'easy', 'name': '175: Combine Two Tables, easy'}, 176: {'level': 'easy', 'name': '176: Second Highest Salary, easy'}}, {'current': 176, 'url': {}}, {})):
+        with open(path, 'w') as f:
+            pprint.pprint(log, f)
+    #the background refresh of the question list finds nothing new
+    with patch('src.leetcode.cfg', CFG), patch('src.leetcode.fetch_question_elements', return_value={}):
+        lc = Leetcode('chromedriver', *paths, headless=True, page_cache_dir=os.path.join(tmp_dir.name, 'pages'), **kwargs)
+        if lc.catalog_thread is not None:
+            lc.catalog_thread.join()
+    lc.is_pause = False
+    test_case.addCleanup(lc.question_log.close)
+    return lc
+
+class TestSandboxOption(unittest.TestCase):
+
+    def setUp(self):
+        self.lc = get_leetcode(self)
+        self.consoles = []
+        patcher = patch.object(SqliteSandbox, 'run_console', autospec=True, side_effect=lambda sandbox, q_name: self.consoles.append((q_name, sandbox.get_table_names())))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    @patch('src.web_handler.Driver.get_driver', side_effect=AssertionError('browser started'))
+    @patch('src.leetcode_page.fetch_html', return_value=read_fixture(176))
+    def test_no_browser(self, fetch_html, get_driver):
+        #the speculative start up still loading the browser
+        is_started = threading.Event()
+        self.lc.startup_thread = ExcThread(target=is_started.wait, daemon=True)
+        self.lc.startup_thread.start()
+        self.assertTrue(self.lc.options('c'))
+        self.assertEqual(self.consoles, [('176: Second Highest Salary, easy', ['Employee', 'Result'])])
+        #neither waited on nor started
+        self.assertFalse(self.lc.is_started())
+        self.assertIsNone(self.lc._Leetcode__web_handler)
+        get_driver.assert_not_called()
+        is_started.set()
+
+        #the second time is from the page cache
+        self.lc.sandbox_option()
+        self.assertEqual(fetch_html.call_count, 1)
+        self.assertEqual(len(self.consoles), 2)
+
+    @patch('src.leetcode_page.fetch_html', side_effect=OSError)
+    def test_fetch_failed(self, fetch_html):
+        self.lc.sandbox_option()
+        self.assertEqual(self.consoles, [])
+        self.assertIsNone(self.lc._Leetcode__web_handler)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,132 @@
+'''
+Unit tests for generating sql from parsed leetcode tables, and the local sqlite sandbox built from it.
+'''
+import io
+import os
+import unittest
+from contextlib import redirect_stdout
+
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sister_dir = os.path.join(parent_dir, 'leetcode_sql_unlocked/')
+os.sys.path.insert(0, sister_dir)
+from src.leetcode_page import HTMLPage
+from src.table_parser import TableParser
+from src.schema import TableSchema, parse_ascii_table, get_table_schemas, get_schema_script, MYSQL, POSTGRES
+from src.sandbox import SqliteSandbox
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+def parse_fixture(q_num):
+    with open(os.path.join(FIXTURE_DIR, 'leetcode_jp_{}.html'.format(q_num)), encoding='utf-8') as f:
+        return TableParser(HTMLPage(f.read())).parse_leetcode_tables()
+
+class TestSchema(unittest.TestCase):
+
+    def test_type_inference(self):
+        table_text = '\n'.join([
+            '+----+-------+--------+------------+---------------------+-------+',
+            '| id | name  | amount | day        | at                  | empty |',
+            '+----+-------+--------+------------+---------------------+-------+',
+            '| 1  | Joe   | 1.5    | 2019-1-2   | 2019-01-02 3:04:05  |       |',
+            '| 2  | null  | 20     | 2020-12-31 | 2020-12-31 23:59:00 | null  |',
+            '+----+-------+--------+------------+---------------------+-------+'])
+        schema = TableSchema.from_table_text('Orders', table_text)
+        self.assertEqual(schema.columns, ['id', 'name', 'amount', 'day', 'at', 'empty'])
+        self.assertEqual(schema.col_types, ['INTEGER', 'VARCHAR', 'DECIMAL', 'DATE', 'DATETIME', 'VARCHAR'])
+        self.assertEqual(schema.rows, [
+            (1, 'Joe', 1.5, '2019-01-02', '2019-01-02 03:04:05', None),
+            (2, None, 20.0, '2020-12-31', '2020-12-31 23:59:00', None)])
+        self.assertEqual(schema.create_table_sql(), '\n'.join([
+            'CREATE TABLE "Orders" (',
+            '    "id" INTEGER,',
+            '    "name" VARCHAR(3),',
+            '    "amount" REAL,',
+            '    "day" DATE,',
+            '    "at" DATETIME,',
+            '    "empty" VARCHAR(1)',
+            ');']))
+        self.assertEqual(schema.insert_sql(), '\n'.join([
+            'INSERT INTO "Orders" ("id", "name", "amount", "day", "at", "empty") VALUES',
+            "    (1, 'Joe', 1.5, '2019-01-02', '2019-01-02 03:04:05', NULL),",
+            "    (2, NULL, 20.0, '2020-12-31', '2020-12-31 23:59:00', NULL);"]))
+
+    def test_filler_column_dropped(self):
+        table_names, tables_text = parse_fixture(176)
+        self.assertEqual(parse_ascii_table(tables_text[1]), (['SecondHighestSalary'], [['200']]))
+
+    def test_pipe_table_and_duplicate_names(self):
+        schemas = get_table_schemas(['t', 'T'], ['| a | b |\n|---|---|\n| x | 07-2017 |', '| a |\n|---|\n| 1 |'])
+        self.assertEqual([schema.name for schema in schemas], ['t', 'T1'])
+        #%m-%Y is not a date
+        self.assertEqual(schemas[0].col_types, ['VARCHAR', 'VARCHAR'])
+
+    def test_dialects(self):
+        schema = TableSchema.from_table_text('Order', '| id | user | amount | at |\n|---|---|---|---|\n| 1 | a\'b | 12.25 | 2020-01-02 03:04 |\n| 2 | c | 3 | null |')
+        self.assertEqual(schema.create_table_sql(MYSQL), '\n'.join([
+            'CREATE TABLE `Order` (',
+            '    `id` INT,',
+            '    `user` VARCHAR(3),',
+            '    `amount` DECIMAL(4,2),',
+            '    `at` DATETIME',
+            ');']))
+        #plain names are left unquoted, so unquoted queries find them
+        self.assertEqual(schema.create_table_sql(POSTGRES), '\n'.join([
+            'CREATE TABLE "Order" (',
+            '    id INTEGER,',
+            '    "user" VARCHAR(3),',
+            '    amount NUMERIC,',
+            '    at TIMESTAMP',
+            ');']))
+        self.assertEqual(schema.insert_sql(MYSQL), '\n'.join([
+            'INSERT INTO `Order` (`id`, `user`, `amount`, `at`) VALUES',
+            "    (1, 'a''b', 12.25, '2020-01-02 03:04:00'),",
+            '    (2, \'c\', 3.0, NULL);']))
+
+    def test_schema_script(self):
+        table_names, tables_text = parse_fixture(1050)
+        script = get_schema_script(get_table_schemas(table_names, tables_text), POSTGRES)
+        self.assertEqual(script.count('CREATE TABLE'), 2)
+        self.assertEqual(script.count('INSERT INTO'), 2)
+        self.assertTrue(script.startswith('CREATE TABLE ActorDirector (\n'))
+
+    def test_numbers_and_dates_kept_as_written(self):
+        table_text = '\n'.join([
+            '| id          | zip   | day        | at                  | n  |',
+            '|-------------|-------|------------|---------------------|----|',
+            '| 3000000000  | 00501 | 2020-13-45 | 2020-02-30 10:00:00 | 01 |',
+            '| 1           | 12345 | 2020-01-02 | 2020-01-02 10:00:00 | 2  |'])
+        schema = TableSchema.from_table_text('t', table_text)
+        self.assertEqual(schema.col_types, ['BIGINT', 'VARCHAR', 'VARCHAR', 'VARCHAR', 'VARCHAR'])
+        self.assertEqual(schema.rows[0], (3000000000, '00501', '2020-13-45', '2020-02-30 10:00:00', '01'))
+        self.assertIn('`id` BIGINT', schema.create_table_sql(MYSQL))
+        self.assertIn('id BIGINT', schema.create_table_sql(POSTGRES))
+        self.assertIn('"id" INTEGER', schema.create_table_sql())
+
+class TestSqliteSandbox(unittest.TestCase):
+
+    def setUp(self):
+        self.sandbox = SqliteSandbox(*parse_fixture(1050))
+
+    def tearDown(self):
+        self.sandbox.close()
+
+    def test_query(self):
+        self.assertEqual(self.sandbox.get_table_names(), ['ActorDirector', 'Result'])
+        columns, rows = self.sandbox.execute('SELECT actor_id, director_id FROM ActorDirector GROUP BY actor_id, director_id HAVING COUNT(*) >= 3')
+        self.assertEqual(columns, ['actor_id', 'director_id'])
+        self.assertEqual(rows, [(1, 1)])
+        self.assertEqual(self.sandbox.execute('SELECT * FROM Result')[1], [(1, 1)])
+
+    def test_console(self):
+        inputs = iter(['.tables', 'SELECT COUNT(*) AS n', 'FROM ActorDirector;', 'SELECT * FROM nope;', '.exit', 'never read'])
+        out = io.StringIO()
+        with redirect_stdout(out):
+            self.sandbox.run_console('1050: Actors and Directors', input_func=lambda prompt: next(inputs))
+        out = out.getvalue()
+        self.assertIn('ActorDirector Result', out)
+        self.assertIn('| n |\n+---+\n| 7 |', out)
+        self.assertIn('Error: no such table: nope', out)
+        self.assertEqual(next(inputs), 'never read')
+
+if __name__ == '__main__':
+    unittest.main()
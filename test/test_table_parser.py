@@ -0,0 +1,227 @@
+'''
+Unit tests for parsing leetcode.jp tables without a browser.
+Saved leetcode.jp pages in test/fixtures are served from a local http server that stands in for leetcode.jp.
+'''
+import os
+import tempfile
+import unittest
+import threading
+from unittest.mock import patch
+from http.server import HTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
+
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sister_dir = os.path.join(parent_dir, 'leetcode_sql_unlocked/')
+os.sys.path.insert(0, sister_dir)
+from src.leetcode_page import HTMLPage, DriverPage, get_leetcode_url
+from src.table_parser import TableParser
+from src.page_cache import PageCache
+from src.parse_cache import ParseCache
+from src.web_handler import WebHandler
+from test import test_web_handler_tabs
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+class LeetcodeStandIn(BaseHTTPRequestHandler):
+    '''
+    Serves test/fixtures/leetcode_jp_<id>.html for /problemdetail.php?id=<id>
+    '''
+    def do_GET(self):
+        q_num = parse_qs(urlparse(self.path).query).get('id', [''])[0]
+        path = os.path.join(FIXTURE_DIR, 'leetcode_jp_{}.html'.format(q_num))
+        if not os.path.exists(path):
+            self.send_error(404)
+            return
+        with open(path, 'rb') as f:
+            body = f.read()
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+class FakeDriver:
+    '''
+    Stands in for a selenium driver on a leetcode.jp tab, answering the DriverPage extraction script from a saved page
+    Every WebDriver command is counted, like CountingChrome does
+    '''
+    def __init__(self, html):
+        self.command_count = 0
+        page = HTMLPage(html)
+        self.extracted = {'html': html, 'pre': page.get_pre_texts(), 'code': page.get_code_texts(), 'paragraphs': [list(p) for p in page.get_paragraphs()]}
+
+    def execute_script(self, script, *args):
+        self.command_count += 1
+        return self.extracted
+
+    def __getattr__(self, name):
+        raise AssertionError('DriverPage should only use execute_script, not {}'.format(name))
+
+class LeetcodeTabDriver(test_web_handler_tabs.FakeDriver):
+    '''
+    A browser whose leetcode tab has already loaded the saved page
+    '''
+    def __init__(self, html):
+        super().__init__()
+        self.page_driver = FakeDriver(html)
+
+    def execute_script(self, script, *args):
+        if script == DriverPage.EXTRACT_SCRIPT:
+            self.command_count += 1
+            return self.page_driver.extracted
+        elif 'readyState' in script:
+            self.command_count += 1
+            return True
+        return super().execute_script(script, *args)
+
+class TestTableParser(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(self):
+        self.server = HTTPServer(('127.0.0.1', 0), LeetcodeStandIn)
+        self.base_url = 'http://127.0.0.1:{}'.format(self.server.server_port)
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+
+    @classmethod
+    def tearDownClass(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def parse(self, q_num):
+        page = HTMLPage.fetch(get_leetcode_url(q_num, self.base_url))
+        return TableParser(page).parse_leetcode_tables()
+
+    def test_names_by_code_tag(self):
+        table_names, tables_text = self.parse(176)
+        self.assertEqual(table_names, ['Employee', 'Result'])
+        self.assertEqual(tables_text[0], '\n'.join([
+            '+----+--------+',
+            '| Id | Salary |',
+            '+----+--------+',
+            '| 1  | 100    |',
+            '| 2  | 200    |',
+            '| 3  | 300    |',
+            '+----+--------+']))
+        #single column tables get a filler column for db-fiddle
+        self.assertEqual(tables_text[1], '\n'.join([
+            '+---------------------+---------+',
+            '| SecondHighestSalary | ignore  |',
+            '+---------------------+---------+',
+            '| 200                 |  _      |',
+            '+---------------------+---------+']))
+
+    def test_names_by_bold(self):
+        table_names, tables_text = self.parse(580)
+        self.assertEqual(table_names, ['student', 'department', 'Result'])
+        self.assertEqual(len(tables_text), 3)
+        self.assertTrue(tables_text[0].startswith('| student_id | student_name | gender | dept_id |\n|------------|'))
+        self.assertTrue(tables_text[2].endswith('| Law         | 0              |'))
+
+    def test_names_by_kword(self):
+        table_names, tables_text = self.parse(1050)
+        self.assertEqual(table_names, ['ActorDirector', 'Result'])
+        self.assertEqual(len(tables_text), 2)
+        self.assertEqual(len(tables_text[0].split('\n')), 11)
+        self.assertNotIn('cooperated', tables_text[1])
+
+    def test_iter_tables(self):
+        table_parser = TableParser(None)
+        tables_pre = [
+            #like #619, +--- tables without a bottom border end with their <pre>
+            '+---+\n|num|\n+---+\n| 8 |\n| 3 |',
+            '+-----+\n| d.t |\n+-----+\n| 1/2/2019 |\n+-----+\nT2 table:\n+---+---+\n| a | b |\n+---+---+\n| 1 | 2 |\n+---+---+',
+            '| id | b |\n|----|---|\n| 1  | 12/31/2020 |',
+        ]
+        tables = table_parser.iter_tables(tables_pre)
+        #tables are yielded one at a time, as soon as each one ends
+        self.assertEqual(next(tables), '\n'.join([
+            '+---+---------+',
+            '|num| ignore  |',
+            '+---+---------+',
+            '| 8 |  _      |',
+            '| 3 |  _      |']))
+        self.assertEqual(table_parser.table_types, ['plus'])
+        self.assertEqual(next(tables), '\n'.join([
+            '+-----+---------+',
+            '| d_t | ignore  |',
+            '+-----+---------+',
+            '| 2019-1-2 |  _      |',
+            '+-----+---------+']))
+        self.assertEqual(list(tables), [
+            '+---+---+\n| a | b |\n+---+---+\n| 1 | 2 |\n+---+---+',
+            '| id | b |\n|----|---|\n| 1  | 2020-12-31 |'])
+        self.assertEqual(table_parser.table_types, ['plus', 'plus', 'plus', 'pipe'])
+
+    def test_iter_tables_end_with_pre(self):
+        table_parser = TableParser(None)
+        #the first table has no bottom border, the 3 borders of the page's 2nd table used to be counted towards it, joining the two tables
+        tables_pre = [
+            '+---+---+\n| a | b |\n+---+---+\n| 1 | 2 |',
+            '+---+---+\n| c | d |\n+---+---+\n| 3 | 4 |\n+---+---+',
+            '+---+---+\n| e | f |\n+---+---+\n| 5 | 6 |',
+        ]
+        self.assertEqual(list(table_parser.iter_tables(tables_pre)), [
+            '+---+---+\n| a | b |\n+---+---+\n| 1 | 2 |',
+            '+---+---+\n| c | d |\n+---+---+\n| 3 | 4 |\n+---+---+',
+            '+---+---+\n| e | f |\n+---+---+\n| 5 | 6 |'])
+
+    def test_iter_tables_style_per_table(self):
+        table_parser = TableParser(None)
+        #the border style used to be picked once, from the page's first table
+        tables_pre = [
+            '+---+---+\n| a | b |\n+---+---+\n| 1 | 2 |\n+---+---+',
+            '| c |\n|---|\n| 3 |',
+        ]
+        self.assertEqual(list(table_parser.iter_tables(tables_pre)), [
+            '+---+---+\n| a | b |\n+---+---+\n| 1 | 2 |\n+---+---+',
+            '| c | ignore|\n|---|-------|\n| 3 |   _   |'])
+        self.assertEqual(table_parser.table_types, ['plus', 'pipe'])
+
+    def test_no_tables(self):
+        #like #175, only table schemas, no table data
+        page = HTMLPage('<pre>\n+-------------+---------+\n| Column Name | Type    |\n+-------------+---------+\n</pre>')
+        with self.assertRaises(IndexError):
+            TableParser(page).parse_leetcode_tables()
+
+    def test_driver_page_single_command(self):
+        for q_num in (176, 580, 1050):
+            with open(os.path.join(FIXTURE_DIR, 'leetcode_jp_{}.html'.format(q_num)), encoding='utf-8') as f:
+                html = f.read()
+            driver = FakeDriver(html)
+            driver_page = DriverPage(driver)
+            self.assertEqual(TableParser(driver_page).parse_leetcode_tables(), TableParser(HTMLPage(html)).parse_leetcode_tables())
+            self.assertEqual(driver_page.get_html(), html)
+            #one round trip per page, no matter how many elements it has
+            self.assertEqual(driver.command_count, 1)
+
+    def test_web_handler_parse_command_count(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            for caches in ({}, {'page_cache': PageCache(tmp_dir), 'parse_cache': ParseCache(os.path.join(tmp_dir, 'q_parse.log'))}):
+                for q_num in (176, 580, 1050):
+                    with open(os.path.join(FIXTURE_DIR, 'leetcode_jp_{}.html'.format(q_num)), encoding='utf-8') as f:
+                        driver = LeetcodeTabDriver(f.read())
+                    with patch('src.web_handler.Driver.get_driver', return_value=driver):
+                        web_handler = WebHandler('chromedriver', headless=False, **caches)
+                    web_handler.open_leetcode_win(q_num)
+                    table_names, tables_text = web_handler.parse_leetcode_tables(q_num)
+                    self.assertGreater(len(tables_text), 0)
+                    #opening the tab and waiting for it aren't part of the parse
+                    self.assertGreater(driver.command_count, 1)
+                    self.assertEqual(web_handler.parse_command_count, 1)
+
+    def test_html_text_matches_selenium(self):
+        page = HTMLPage('<p>Here is an example <b>input</b>:<br />\n<b>student</b>   table:</p><p>a&nbsp;b\n c</p>')
+        self.assertEqual(page.get_paragraphs(), [('Here is an example input:\nstudent table:', ['input', 'student']), ('a b c', [])])
+        page = HTMLPage('<script>var s = "<pre>x</pre>";</script><pre>\n| a |\n|---|\n</pre>')
+        self.assertEqual(page.get_pre_texts(), ['| a |\n|---|'])
+
+    def test_missing_page(self):
+        with self.assertRaises(OSError):
+            HTMLPage.fetch(get_leetcode_url(999999, self.base_url))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,109 @@
+'''
+Unit tests for entering text into db-fiddle, the schema of every table is pasted at once, the tables and query are set in one script each, and typed with send_keys only if the script doesn't take.
+A stand-in for the chrome webdriver plays db-fiddle's Text to DDL modal, schema and query editors, no browser needed.
+'''
+import os
+import unittest
+from unittest.mock import patch
+
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sister_dir = os.path.join(parent_dir, 'leetcode_sql_unlocked/')
+os.sys.path.insert(0, sister_dir)
+from src.web_handler import WebHandler
+from test.test_web_handler_tabs import FakeDriver
+
+TABLE_TEXT = '\n'.join(['| Id | Salary |', '|----|--------|'] + ['| {} | {} |'.format(i, i * 100) for i in range(1, 500)])
+
+class FakeElement:
+    def __init__(self, driver):
+        self.driver = driver
+        self.value = ''
+
+    def is_displayed(self):
+        return True
+
+    def is_enabled(self):
+        return True
+
+    def click(self):
+        self.driver.command_count += 1
+
+    def send_keys(self, text):
+        #selenium sends the keys one at a time
+        self.driver.command_count += 1
+        self.driver.keystrokes += len(text)
+        self.value += text
+
+class DbFiddleDriver(FakeDriver):
+    '''
+    Every element lookup finds an element, textareas are kept by xpath
+    '''
+    def __init__(self, is_injectable=True):
+        super().__init__()
+        self.is_injectable = is_injectable
+        self.keystrokes = 0
+        #css selector: CodeMirror editor text
+        self.editors = {}
+        self.elements = {}
+
+    def find_element(self, by, value):
+        self.command_count += 1
+        return self.elements.setdefault(value, FakeElement(self))
+
+    def execute_script(self, script, *args):
+        if 'getOwnPropertyDescriptor' in script:
+            self.command_count += 1
+            if self.is_injectable:
+                args[0].value = args[1]
+            return self.is_injectable
+        elif 'CodeMirror' in script:
+            self.command_count += 1
+            if self.is_injectable:
+                self.editors[args[0]] = self.editors.get(args[0], '') + args[1]
+            return self.is_injectable
+        return super().execute_script(script, *args)
+
+class TestInjectText(unittest.TestCase):
+
+    def get_web_handler(self, driver):
+        with patch('src.web_handler.Driver.get_driver', return_value=driver):
+            web_handler = WebHandler('chromedriver', headless=True)
+        web_handler.db_win = driver.current_window_handle
+        web_handler.click_query_table = lambda: None
+        return web_handler
+
+    def get_table_input(self, driver):
+        return next(element for xpath, element in driver.elements.items() if xpath.endswith('/textarea') and 'textToDDLModal' in xpath)
+
+    def test_injected(self):
+        driver = DbFiddleDriver()
+        web_handler = self.get_web_handler(driver)
+        web_handler.db_fiddle_table_input('Employee', TABLE_TEXT)
+        web_handler.db_fiddle_query_input('Employee')
+        self.assertEqual(self.get_table_input(driver).value, TABLE_TEXT)
+        self.assertEqual(driver.editors['#query'], 'SELECT * FROM Employee')
+        #only the short table name is typed
+        self.assertEqual(driver.keystrokes, len('Employee'))
+
+    def test_send_keys_fallback(self):
+        driver = DbFiddleDriver(is_injectable=False)
+        web_handler = self.get_web_handler(driver)
+        web_handler.db_fiddle_table_input('Employee', TABLE_TEXT)
+        web_handler.db_fiddle_query_input('Employee')
+        self.assertEqual(self.get_table_input(driver).value, TABLE_TEXT)
+        self.assertEqual(driver.keystrokes, len('Employee') + len(TABLE_TEXT) + len('SELECT * FROM Employee'))
+
+    def test_schema_pasted_once(self):
+        driver = DbFiddleDriver()
+        web_handler = self.get_web_handler(driver)
+        self.assertEqual(web_handler.db_fiddle_schema_input(['Employee', 'Bonus'], [TABLE_TEXT, '| id | bonus |\n|---|---|\n| 1 | 0.5 |'], 0), '`Employee`')
+        self.assertEqual(list(driver.editors), ['#schema'])
+        self.assertIn('CREATE TABLE `Employee`', driver.editors['#schema'])
+        self.assertIn('CREATE TABLE `Bonus`', driver.editors['#schema'])
+        #no modal opened
+        self.assertEqual(driver.elements, {})
+        #other engines are left to db-fiddle's Text to DDL
+        self.assertIsNone(web_handler.db_fiddle_schema_input(['Employee'], [TABLE_TEXT], 3))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,111 @@
+'''
+Unit tests for WebHandler.create_fiddle(), the leetcode.jp tables are parsed while db-fiddle boots instead of after it.
+Page loads are stood in for by sleeps, no browser or network needed.
+'''
+import os
+import time
+import unittest
+from unittest.mock import patch
+
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sister_dir = os.path.join(parent_dir, 'leetcode_sql_unlocked/')
+os.sys.path.insert(0, sister_dir)
+from src.web_handler import WebHandler
+from src.leetcode_page import HTMLPage
+from src.parse_cache import parse_tables
+from src.schema import MYSQL, get_schema_script, get_table_schemas
+from test.test_web_handler_tabs import FakeDriver
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+LOAD_SECONDS = 0.3
+
+def slow_fetch_html(url, timeout=10):
+    time.sleep(LOAD_SECONDS)
+    with open(os.path.join(FIXTURE_DIR, 'leetcode_jp_176.html'), encoding='utf-8') as f:
+        return f.read()
+
+class TestCreateFiddle(unittest.TestCase):
+
+    def setUp(self):
+        self.driver = FakeDriver()
+        with patch('src.web_handler.Driver.get_driver', return_value=self.driver):
+            self.web_handler = WebHandler('chromedriver', headless=True, is_browserless_parse=True)
+        self.tables = []
+        self.queries = []
+        #db-fiddle's scripts booting
+        self.web_handler.db_fiddle_select_engine = lambda db_engine: time.sleep(LOAD_SECONDS)
+        self.web_handler.db_fiddle_table_input = lambda table_name, table_text: self.tables.append(table_name)
+        self.web_handler.db_fiddle_query_input = lambda table_name: self.queries.append(table_name)
+        self.web_handler.db_fiddle_save = lambda: 'https://www.db-fiddle.com/f/a/0'
+
+    @patch('src.leetcode_page.fetch_html', side_effect=slow_fetch_html)
+    def test_parse_overlaps_fiddle_boot(self, fetch_html):
+        start = time.perf_counter()
+        self.assertEqual(self.web_handler.create_fiddle(176, 0), 'https://www.db-fiddle.com/f/a/0')
+        #about the slower of the two, not their sum
+        self.assertLess(time.perf_counter() - start, LOAD_SECONDS * 1.8)
+        self.assertEqual(self.tables[0], 'Employee')
+        self.assertEqual(list(self.web_handler.phase_times), ['navigate', 'fiddle_ready', 'parse', 'tables', 'save'])
+
+    @patch('src.leetcode_page.fetch_html', side_effect=slow_fetch_html)
+    def test_parse_command_count(self, fetch_html):
+        def select_engine(db_engine):
+            #db-fiddle's tab polled on the driver while the tables are parsed
+            end = time.perf_counter() + LOAD_SECONDS * 2
+            while time.perf_counter() < end:
+                self.driver.window_handles
+                time.sleep(0.005)
+        def slow_parse_tables(*args):
+            time.sleep(LOAD_SECONDS / 2)
+            return parse_tables(*args)
+        self.web_handler.db_fiddle_select_engine = select_engine
+        self.web_handler.parse_command_count = None
+        with patch('src.web_handler.parse_tables', side_effect=slow_parse_tables):
+            self.assertEqual(self.web_handler.create_fiddle(176, 0), 'https://www.db-fiddle.com/f/a/0')
+        self.assertGreater(self.driver.command_count, 0)
+        #none of them the parse's
+        self.assertEqual(self.web_handler.parse_command_count, 0)
+
+    @patch('src.leetcode_page.fetch_html', return_value='<html><body><p>No tables</p></body></html>')
+    def test_no_tables(self, fetch_html):
+        self.assertIsNone(self.web_handler.create_fiddle(176, 0))
+        self.assertEqual(self.tables, [])
+
+    @patch('src.leetcode_page.fetch_html', side_effect=OSError)
+    def test_fetch_failed(self, fetch_html):
+        #the leetcode tab, which this headless handler hadn't opened
+        tab_page = HTMLPage(slow_fetch_html(None))
+        with patch.object(self.web_handler, 'get_tab_page', return_value=tab_page) as get_tab_page:
+            self.assertEqual(self.web_handler.create_fiddle(176, 0), 'https://www.db-fiddle.com/f/a/0')
+        #not fetched a second time
+        self.assertEqual(fetch_html.call_count, 1)
+        get_tab_page.assert_called_once_with(176)
+        self.assertEqual(self.tables[0], 'Employee')
+
+    @patch('src.leetcode_page.fetch_html', side_effect=slow_fetch_html)
+    def test_schema_pasted(self, fetch_html):
+        pasted = {}
+        def inject_code_mirror(selector, text):
+            pasted[selector] = text
+            return True
+        self.web_handler.inject_code_mirror = inject_code_mirror
+        self.assertEqual(self.web_handler.create_fiddle(176, 0), 'https://www.db-fiddle.com/f/a/0')
+        #no Text to DDL modal
+        self.assertEqual(self.tables, [])
+        table_names, tables_text = self.web_handler.parse_leetcode_tables(176)
+        self.assertEqual(pasted, {'#schema': get_schema_script(get_table_schemas(table_names, tables_text), MYSQL)})
+        self.assertEqual(self.queries, ['`Employee`'])
+
+    def test_query_names_renamed_table(self):
+        self.web_handler.inject_code_mirror = lambda selector, text: True
+        self.web_handler.parse_leetcode_tables = lambda q_num: (['t', 'T'], ['| a |\n|---|\n| 1 |', '| a |\n|---|\n| 2 |'])
+        self.web_handler.is_browserless_parse = False
+        self.web_handler.create_fiddle(176, 5)
+        self.assertEqual(self.queries, ['t'])
+        #quoted the way the pasted schema names it
+        self.web_handler.parse_leetcode_tables = lambda q_num: (['order', 'Order'], ['| a |\n|---|\n| 1 |', '| a |\n|---|\n| 2 |'])
+        self.web_handler.create_fiddle(176, 5)
+        self.assertEqual(self.queries[-1], '"order"')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,153 @@
+'''
+Unit tests for WebHandler's long-lived tabs, switching questions navigates the problem and fiddle tabs in place instead of opening and closing windows, or brings a standby question's background tabs to the front.
+A stand-in for the chrome webdriver keeps track of windows and urls, no browser needed.
+'''
+import os
+import unittest
+from unittest.mock import patch
+
+from selenium.common.exceptions import NoSuchWindowException
+
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sister_dir = os.path.join(parent_dir, 'leetcode_sql_unlocked/')
+os.sys.path.insert(0, sister_dir)
+from src.web_handler import WebHandler
+
+class FakeSwitchTo:
+    def __init__(self, driver):
+        self.driver = driver
+
+    def window(self, win):
+        self.driver.command_count += 1
+        if win not in self.driver.urls:
+            raise NoSuchWindowException()
+        self.driver.current_window_handle = win
+
+class FakeDriver:
+    '''
+    Counts commands like CountingChrome, every window is a handle with a url
+    '''
+    def __init__(self):
+        self.command_count = 0
+        self.n_opened = 0
+        self.urls = {'win-0': 'data:,'}
+        self.current_window_handle = 'win-0'
+        self.switch_to = FakeSwitchTo(self)
+
+    @property
+    def window_handles(self):
+        self.command_count += 1
+        return list(self.urls)
+
+    @property
+    def current_url(self):
+        self.command_count += 1
+        return self.urls[self.current_window_handle]
+
+    def execute_script(self, script, *args):
+        self.command_count += 1
+        if script.startswith('window.open('):
+            self.n_opened += 1
+            self.urls['win-{}'.format(self.n_opened)] = script[len("window.open('"):-len("')")]
+        elif 'location.href' in script:
+            self.urls[self.current_window_handle] = args[0]
+
+    def execute_cdp_cmd(self, cmd, params):
+        self.command_count += 1
+        if cmd == 'Target.createTarget':
+            self.n_opened += 1
+            win = 'win-{}'.format(self.n_opened)
+            self.urls[win] = params['url']
+            return {'targetId': win}
+        elif cmd == 'Target.closeTarget':
+            del self.urls[params['targetId']]
+        return {}
+
+    def close(self):
+        self.command_count += 1
+        del self.urls[self.current_window_handle]
+
+    def quit(self):
+        self.urls = {}
+
+class TestWebHandlerTabs(unittest.TestCase):
+
+    def setUp(self):
+        self.driver = FakeDriver()
+        with patch('src.web_handler.Driver.get_driver', return_value=self.driver):
+            self.web_handler = WebHandler('chromedriver', headless=False)
+        #waits for db-fiddle's editor
+        self.web_handler.click_query_table = lambda: None
+
+    def switch(self, q_num, fiddle_url):
+        commands_start = self.driver.command_count
+        self.web_handler.close_question(is_save_before_closing=False)
+        self.web_handler.open_question(q_num, 0, False, fiddle_url)
+        return self.driver.command_count - commands_start
+
+    def test_navigated_in_place(self):
+        self.web_handler.open_question(176, 0, False, 'https://www.db-fiddle.com/f/a/0')
+        #the window chrome started with is the problem tab
+        self.assertEqual(self.web_handler.tabs, {'problem': 'win-0', 'fiddle': 'win-1'})
+        counts = [self.switch(q_num, 'https://www.db-fiddle.com/f/{}/0'.format(q_num)) for q_num in (177, 178, 180)]
+        self.assertEqual(self.driver.n_opened, 1)
+        self.assertEqual(self.driver.urls, {'win-0': 'https://leetcode.jp/problemdetail.php?id=180', 'win-1': 'https://www.db-fiddle.com/f/180/0'})
+        #same few commands every switch
+        self.assertEqual(len(set(counts)), 1)
+        self.assertLessEqual(counts[0], 8)
+
+    def test_solution_tab_closed(self):
+        self.web_handler.open_question(176, 0, False, 'https://www.db-fiddle.com/f/a/0')
+        self.web_handler.solution_win = self.web_handler.open_tab(WebHandler.SOLUTION_TAB, 'https://github.com/')
+        self.assertEqual(len(self.driver.urls), 3)
+        self.switch(177, 'https://www.db-fiddle.com/f/b/0')
+        self.assertEqual(len(self.driver.urls), 2)
+        self.assertNotIn(WebHandler.SOLUTION_TAB, self.web_handler.tabs)
+
+    def test_tab_closed_by_user(self):
+        self.web_handler.open_question(176, 0, False, 'https://www.db-fiddle.com/f/a/0')
+        del self.driver.urls['win-1']
+        self.switch(177, 'https://www.db-fiddle.com/f/b/0')
+        self.assertEqual(self.web_handler.tabs['fiddle'], 'win-2')
+        self.assertEqual(self.driver.urls['win-2'], 'https://www.db-fiddle.com/f/b/0')
+
+    def test_standby_opened_in_background(self):
+        self.web_handler.open_question(176, 0, False, 'https://www.db-fiddle.com/f/a/0')
+        current_win = self.driver.current_window_handle
+        self.assertTrue(self.web_handler.open_standby(177, 'https://www.db-fiddle.com/f/b/0'))
+        self.assertEqual(self.driver.current_window_handle, current_win)
+        self.assertEqual(self.web_handler.standby[177], ('win-2', 'win-3', 'https://www.db-fiddle.com/f/b/0'))
+        #already open
+        self.assertTrue(self.web_handler.open_standby(177, 'https://www.db-fiddle.com/f/b/0'))
+        self.assertEqual(self.driver.n_opened, 3)
+
+    def test_switch_to_standby(self):
+        self.web_handler.open_question(176, 0, False, 'https://www.db-fiddle.com/f/a/0')
+        self.web_handler.open_standby(177, 'https://www.db-fiddle.com/f/b/0')
+        self.web_handler.close_question(is_save_before_closing=False)
+        self.assertEqual(self.web_handler.switch_to_standby(177, 176, 'https://www.db-fiddle.com/f/a/0'), 'https://www.db-fiddle.com/f/b/0')
+        self.assertEqual(self.web_handler.tabs, {'problem': 'win-2', 'fiddle': 'win-3'})
+        self.assertEqual(self.driver.current_window_handle, 'win-2')
+        #the tabs left behind are 176's standby now
+        self.assertTrue(self.web_handler.has_standby(176, 'https://www.db-fiddle.com/f/a/0'))
+        self.assertEqual(len(self.driver.urls), 4)
+
+    def test_evict_standby(self):
+        self.web_handler.open_question(176, 0, False, 'https://www.db-fiddle.com/f/a/0')
+        for q_num in (177, 178, 180):
+            self.web_handler.open_standby(q_num, 'https://www.db-fiddle.com/f/{}/0'.format(q_num))
+        #177 is the least recently used, but it's kept
+        self.web_handler.evict_standby(1, keep=(177,))
+        self.assertEqual(list(self.web_handler.standby), [177])
+        self.assertEqual(len(self.driver.urls), 4)
+
+    def test_standby_closed_by_user(self):
+        self.web_handler.open_question(176, 0, False, 'https://www.db-fiddle.com/f/a/0')
+        self.web_handler.open_standby(177, 'https://www.db-fiddle.com/f/b/0')
+        del self.driver.urls['win-3']
+        self.assertIsNone(self.web_handler.switch_to_standby(177, 176, 'https://www.db-fiddle.com/f/a/0'))
+        self.assertNotIn('win-2', self.driver.urls)
+        self.assertEqual(self.web_handler.standby, {})
+
+if __name__ == '__main__':
+    unittest.main()